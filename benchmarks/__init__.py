@@ -0,0 +1,4 @@
+"""
+WhiskerNotes - Benchmarks Package
+Headless performance measurements for the data and service layers
+"""
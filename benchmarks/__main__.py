@@ -0,0 +1,9 @@
+"""
+WhiskerNotes - Benchmarks Entry Point
+Runs the full benchmark suite: python -m benchmarks
+"""
+
+from benchmarks.suite import main
+
+
+main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Auto-Save Harness
+Replays typing sessions against the auto-save scheduler on a simulated clock
+
+Each session is a list of (time, edit) keystrokes; an edit of None is a
+key that changes nothing (arrows, shift). The old editor behaviour, which
+cancelled and restarted a fixed timer on every keystroke, is replayed
+alongside. Reported per session: saves issued and skipped, timer
+operations, and the longest time an edit stayed unsaved.
+
+Usage:
+    python -m benchmarks.bench_autosave [--delay MS] [--max-latency MS]
+"""
+
+import argparse
+import heapq
+import itertools
+import sys
+
+from ui.autosave import AutoSaveScheduler
+
+
+class FakeTimers:
+    """A simulated clock with after()/after_cancel() semantics"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.operations = 0
+        self._queue = []
+        self._cancelled = set()
+        self._ids = itertools.count()
+
+    def after(self, delay_ms, callback):
+        self.operations += 1
+        handle = next(self._ids)
+        heapq.heappush(self._queue, (self.now + delay_ms / 1000, handle, callback))
+        return handle
+
+    def after_cancel(self, handle):
+        self.operations += 1
+        self._cancelled.add(handle)
+
+    def advance(self, until: float):
+        """Run every timer due up to `until`"""
+        while self._queue and self._queue[0][0] <= until:
+            due, handle, callback = heapq.heappop(self._queue)
+            if handle in self._cancelled:
+                continue
+            self.now = due
+            callback()
+        self.now = until
+
+
+def sessions():
+    """Typing sessions: name -> [(seconds, character or None)]"""
+    steady = [(i / 6, "a") for i in range(6 * 60)]                       # 60 s at 6 keys/s
+    bursts = [(burst * 8 + i / 8, "b") for burst in range(8) for i in range(16)]
+    browsing = [(i / 4, None) for i in range(4 * 30)]                    # arrow keys only
+    undo = [(0.0, "x"), (0.2, "\b")]                                     # type, then delete it
+    return {"steady typing 60s": steady, "bursts with pauses": bursts,
+            "cursor keys only": browsing, "type then undo": undo}
+
+
+def replay(keystrokes, delay_ms: int, max_latency_ms: int, legacy: bool) -> dict:
+    """Replay one session and return its counters"""
+    timers = FakeTimers()
+    text = []
+    unsaved_since = [None]
+    worst = [0.0]
+    saves = []
+
+    def save(payload):
+        saves.append(payload)
+        if unsaved_since[0] is not None:
+            worst[0] = max(worst[0], timers.now - unsaved_since[0])
+        unsaved_since[0] = None
+
+    collect = lambda: ("Note", "".join(text), "", "Personal")
+    scheduler = AutoSaveScheduler(timers.after, timers.after_cancel, collect, save,
+                                  delay_ms=delay_ms, max_latency_ms=max_latency_ms,
+                                  clock=lambda: timers.now)
+    scheduler.reset(collect())
+    job = [None]
+
+    def legacy_touch():
+        # The old editor: cancel and restart a fixed timer per keystroke
+        if job[0] is not None:
+            timers.after_cancel(job[0])
+        job[0] = timers.after(delay_ms, lambda: save(collect()))
+
+    for at, edit in keystrokes:
+        timers.advance(at)
+        if edit == "\b":
+            text.pop()
+        elif edit is not None:
+            text.append(edit)
+        if edit is not None and unsaved_since[0] is None:
+            unsaved_since[0] = timers.now
+        if legacy:
+            legacy_touch()
+        else:
+            scheduler.touch()
+    timers.advance(keystrokes[-1][0] + 60)
+
+    stats = scheduler.stats()
+    return {
+        "saves": len(saves),
+        "skipped": 0 if legacy else stats["saves_skipped"],
+        "timer ops": timers.operations,
+        "worst unsaved s": round(worst[0], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay typing sessions against the auto-save scheduler")
+    parser.add_argument("--delay", type=int, default=2000, help="Idle delay in milliseconds")
+    parser.add_argument("--max-latency", type=int, default=10000, help="Save ceiling in milliseconds")
+    args = parser.parse_args()
+
+    print(f"Auto-save per typing session (delay {args.delay} ms, ceiling {args.max_latency} ms):")
+    print(f"   {'session':<22}{'':>10}{'saves':>8}{'skipped':>9}{'timer ops':>11}{'worst unsaved':>15}")
+    too_late = []
+    for name, keystrokes in sessions().items():
+        for label, legacy in (("restart", True), ("scheduler", False)):
+            result = replay(keystrokes, args.delay, args.max_latency, legacy)
+            print(f"   {name:<22}{label:>10}{result['saves']:>8}{result['skipped']:>9}"
+                  f"{result['timer ops']:>11}{result['worst unsaved s']:>13.1f} s")
+            if not legacy and result["worst unsaved s"] > args.max_latency / 1000 + 0.01:
+                too_late.append(name)
+    if too_late:
+        print(f"   😿 edits stayed unsaved past the ceiling in: {', '.join(too_late)}")
+        sys.exit(1)
+    print("   no edit stayed unsaved past the ceiling 🐾")
+
+
+if __name__ == "__main__":
+    main()
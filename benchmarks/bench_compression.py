@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Content Compression Benchmark
+Measures space saved and read/write overhead of compressed note bodies
+
+For each corpus size the synthetic corpus is loaded once per codec
+(plain, zlib, lzma). Reported per codec: database file size and bytes
+held in notes.content, the share of notes stored compressed, load time,
+single-note read latency (Database.get_note, bypassing the repository
+cache), full-text search latency, and auto-save update latency of the
+longest notes. Every note read back must equal the text that was
+written, and every codec must return the same search results.
+
+Usage:
+    python -m benchmarks.bench_compression [--sizes 1000,10000] [--threshold CHARS]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from benchmarks.corpus import generate_notes
+from benchmarks.suite import percentile
+
+CODECS = ("none", "zlib", "lzma")
+SEARCHES = ("purr", "meeting deadline", "sqlite index", "kitten nap", "budget")
+
+
+def _timed(func, repeat):
+    """Run func for each item of `repeat`, returning sorted latencies in milliseconds"""
+    latencies = []
+    for item in repeat:
+        start = time.perf_counter()
+        func(item)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def run_codec(path: str, notes, codec: str, threshold: int, reads: int) -> dict:
+    """Load the corpus with one codec and measure it"""
+    db = Database(path, content_compression=codec, compression_threshold=threshold, keep_revisions=False)
+    service = NoteService(NoteRepository(db))
+
+    start = time.perf_counter()
+    service.import_notes(iter(notes), batch_size=1000)
+    load_seconds = time.perf_counter() - start
+    db.checkpoint("TRUNCATE")
+
+    conn = db._get_connection()
+    stored, compressed = conn.execute(
+        "SELECT SUM(length(CAST(content AS BLOB))), SUM(typeof(content) = 'blob') FROM notes"
+    ).fetchone()
+
+    rng = random.Random(1)
+    ids = [rng.randint(1, len(notes)) for _ in range(reads)]
+    read_ms = _timed(db.get_note, ids)
+    wrong = sum(db.get_note(i + 1)["content"] != note["content"] for i, note in enumerate(notes))
+
+    search_ms = _timed(db.search_notes, SEARCHES * 5)
+    matches = [sorted(note["id"] for note in db.search_notes(query)) for query in SEARCHES]
+
+    longest = sorted(range(len(notes)), key=lambda i: len(notes[i]["content"]), reverse=True)[:50]
+    update_ms = _timed(lambda i: db.update_note(i + 1, notes[i]["title"], notes[i]["content"] + " meow"),
+                       longest)
+
+    db.close()
+    return {
+        "file_bytes": os.path.getsize(path),
+        "stored_bytes": stored or 0,
+        "compressed": compressed or 0,
+        "load_s": load_seconds,
+        "read_ms": read_ms,
+        "search_ms": search_ms,
+        "update_ms": update_ms,
+        "wrong": wrong,
+        "matches": matches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compressed note storage")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated corpus sizes")
+    parser.add_argument("--threshold", type=int, default=4096, help="Shortest body compressed, in characters")
+    parser.add_argument("--reads", type=int, default=2000, help="Single-note reads per codec")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus seed")
+    args = parser.parse_args()
+
+    failures = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        notes = list(generate_notes(size, seed=args.seed))
+        raw = sum(len(note["content"].encode("utf-8")) for note in notes)
+        print(f"\n{size} notes, {raw / 1024 / 1024:.1f} MiB of content, threshold {args.threshold} characters:")
+        print(f"   {'codec':<6}{'file':>10}{'content':>10}{'compressed':>12}{'load':>9}"
+              f"{'get_note p50/p95':>20}{'search p50':>12}{'update p50':>12}")
+
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for codec in CODECS:
+                results[codec] = run_codec(os.path.join(tmp_dir, f"{codec}.db"), notes, codec,
+                                           args.threshold, args.reads)
+
+        for codec, result in results.items():
+            read = result["read_ms"]
+            print(f"   {codec:<6}{result['file_bytes'] / 1024 / 1024:>8.2f}MB{result['stored_bytes'] / 1024 / 1024:>8.2f}MB"
+                  f"{result['compressed'] / size:>11.1%}{result['load_s']:>8.2f}s"
+                  f"{percentile(read, 50):>10.3f}/{percentile(read, 95):.3f} ms"
+                  f"{percentile(result['search_ms'], 50):>9.2f} ms{percentile(result['update_ms'], 50):>9.2f} ms")
+            if result["wrong"] or result["matches"] != results["none"]["matches"]:
+                failures.append(f"{codec} at {size}")
+
+        plain = results["none"]["file_bytes"]
+        for codec in CODECS[1:]:
+            saved = plain - results[codec]["file_bytes"]
+            print(f"   {codec}: {saved / 1024 / 1024:.2f} MB smaller file ({saved / plain:.1%})")
+
+    if failures:
+        print(f"\n   😿 content or search results differ for: {', '.join(failures)}")
+        raise SystemExit(1)
+    print("\n   every codec returned identical notes and search results 🐾")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Connection Benchmark
+Compares per-call latency of connect-per-call against the managed connection
+
+Usage:
+    python -m benchmarks.bench_connection [--notes N] [--calls N]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from database import Database
+
+
+def _connect_per_call_get(db_path: str, note_id: int):
+    """Baseline: the original get_note shape, opening a connection per call"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
+    row = cursor.fetchone()
+    note = dict(row) if row else None
+    conn.close()
+    return note
+
+
+def _time_calls(func, note_ids):
+    """Time each call and return the latencies in microseconds"""
+    latencies = []
+    for note_id in note_ids:
+        start = time.perf_counter()
+        func(note_id)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return latencies
+
+
+def _report(label: str, latencies):
+    """Print a one-line latency summary"""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"   {label:<22} mean {statistics.mean(ordered):8.1f} us   "
+          f"p50 {statistics.median(ordered):8.1f} us   p95 {p95:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Database connection handling")
+    parser.add_argument("--notes", type=int, default=1000, help="Number of notes to seed")
+    parser.add_argument("--calls", type=int, default=2000, help="Number of get_note calls to time")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench_connection.db")
+        db = Database(db_path)
+        
+        with db._transaction() as cursor:
+            cursor.executemany(
+                "INSERT INTO notes (title, content, word_count) VALUES (?, ?, ?)",
+                [(f"Note {i}", "purr " * 200, 200) for i in range(args.notes)]
+            )
+        
+        note_ids = [(i % args.notes) + 1 for i in range(args.calls)]
+        
+        print(f"get_note latency over {args.calls} calls ({args.notes} notes):")
+        before = _time_calls(lambda note_id: _connect_per_call_get(db_path, note_id), note_ids)
+        after = _time_calls(db.get_note, note_ids)
+        _report("connect-per-call", before)
+        _report("managed connection", after)
+        print(f"   speedup: {statistics.mean(before) / statistics.mean(after):.1f}x")
+        
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
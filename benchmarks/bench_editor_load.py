@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Editor Load Benchmark
+Measures time-to-first-interaction when opening a long note in the editor
+
+A note of --chars characters is opened in an EditorScreen, once inserted
+in one call and once progressively (first screenful, then idle-time
+chunks). Right after load_note returns, a virtual event is queued from
+an idle callback, behind the redraw of the note, the way a key press
+would be; the time until its handler runs is the time-to-first-interaction. The time until the whole text is in the
+content box, and its correctness, are reported too.
+
+Needs a display and the GUI dependencies; without them it prints a
+notice and exits successfully.
+
+Usage:
+    python -m benchmarks.bench_editor_load [--chars N] [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from benchmarks.bench_save_queue import _content
+
+
+def measure(editor, root, note: dict, progressive: bool) -> dict:
+    """Open the note once and return its timings in milliseconds"""
+    editor.PROGRESSIVE_LOAD_CHARS = type(editor).PROGRESSIVE_LOAD_CHARS if progressive else sys.maxsize
+    editor.load_note(None)
+    root.update()
+
+    handled = []
+    root.bind("<<BenchProbe>>", lambda event: handled.append(time.perf_counter()))
+    start = time.perf_counter()
+    editor.load_note(note)
+    returned = time.perf_counter()
+    # Queued once the pending redraw has run, like input arriving while the note paints
+    root.after_idle(lambda: root.event_generate("<<BenchProbe>>", when="tail"))
+    while editor.is_loading or not handled:
+        root.update()
+    root.update_idletasks()
+    loaded = time.perf_counter()
+
+    content = editor.content_text.get("1.0", "end-1c")
+    return {
+        "load_note": (returned - start) * 1000,
+        "first_interaction": (handled[0] - start) * 1000,
+        "fully_loaded": (loaded - start) * 1000,
+        "chunks": editor.get_load_stats()["chunks"],
+        "correct": content == note["content"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark opening long notes in the editor")
+    parser.add_argument("--chars", type=int, default=100000, help="Note length in characters")
+    parser.add_argument("--runs", type=int, default=5, help="Loads per mode")
+    args = parser.parse_args()
+
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        print("Editor load benchmark skipped: no display 😿")
+        return
+    try:
+        import customtkinter as ctk
+        from ui.editor import EditorScreen
+    except ImportError as e:
+        print(f"Editor load benchmark skipped: {e} 😿")
+        return
+
+    root = ctk.CTk()
+    root.geometry("900x700")
+    editor = EditorScreen(root, on_save=lambda *args, **kwargs: None, on_back=lambda: None)
+    editor.pack(fill="both", expand=True)
+    root.update()
+
+    # Paragraph-shaped text, so chunks can be cut at line ends
+    words = _content(args.chars, 0).split(" ")
+    body = "\n".join(" ".join(words[i:i + 60]) for i in range(0, len(words), 60))
+    note = {"id": 1, "title": "Long note", "content": body, "tags": "", "category": "Personal",
+            "created_at": None, "updated_at": None}
+
+    print(f"Opening a {len(body)}-character note in the editor ({args.runs} runs, median):")
+    print(f"   {'mode':<14}{'load_note':>12}{'first input':>14}{'fully loaded':>15}{'chunks':>8}")
+    wrong = []
+    for label, progressive in (("single insert", False), ("progressive", True)):
+        runs = [measure(editor, root, note, progressive) for _ in range(args.runs)]
+        median = lambda key: statistics.median(run[key] for run in runs)
+        print(f"   {label:<14}{median('load_note'):>9.1f} ms{median('first_interaction'):>11.1f} ms"
+              f"{median('fully_loaded'):>12.1f} ms{runs[-1]['chunks']:>8}")
+        if not all(run["correct"] for run in runs):
+            wrong.append(label)
+    root.destroy()
+
+    if wrong:
+        print(f"   😿 loaded text differs from the note in: {', '.join(wrong)}")
+        raise SystemExit(1)
+    print("   loaded text identical in both modes 🐾")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Note List Harness
+Counts card widget work per home screen operation, without a display
+
+Drives the same CardRecycler that VirtualNoteList uses, with stand-in
+cards that only count what would be done to real widgets. After each
+operation the list is refreshed from NoteService the way the home screen
+does, so the keyed diff sees realistic reorderings. A single pin,
+delete, save or create must create no cards and touch at most the rows
+in view, however many notes there are.
+
+Usage:
+    python -m benchmarks.bench_note_list [--sizes 100,1000,10000] [--viewport PX]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from ui.recycler import CardRecycler
+from benchmarks.corpus import generate_notes
+
+
+# Matches NoteCard.HEIGHT + VirtualNoteList.ROW_SPACING
+ROW_HEIGHT = 210 + 16
+
+
+class ListHarness:
+    """A CardRecycler wired to counting stand-in cards"""
+
+    def __init__(self, viewport_height: int):
+        self.viewport_height = viewport_height
+        self.top = 0
+        self.recycler = CardRecycler(
+            create_card=dict,
+            bind_card=lambda card, note, index: card.update(note_id=note.id, row=index),
+            hide_card=lambda card: card.update(row=None),
+            row_height=ROW_HEIGHT,
+            key=lambda note: note.id,
+            move_card=lambda card, index: card.update(row=index)
+        )
+
+    def show(self, notes, keep_scroll: bool = True):
+        """Display a note list and return the widget work it caused"""
+        before = self.recycler.stats()
+        self.recycler.set_items(notes)
+        if not keep_scroll:
+            self.top = 0
+        self.top = min(self.top, max(self.recycler.content_height - self.viewport_height, 0))
+        self.recycler.layout(self.top, self.viewport_height)
+        after = self.recycler.stats()
+        return {name: after[name] - before[name] for name in after}
+
+    def scroll_to(self, top: int):
+        """Scroll the viewport and return the widget work it caused"""
+        before = self.recycler.stats()
+        self.top = top
+        self.recycler.layout(self.top, self.viewport_height)
+        after = self.recycler.stats()
+        return {name: after[name] - before[name] for name in after}
+
+
+def run(size: int, viewport_height: int) -> dict:
+    """
+    Run every operation against a corpus of the given size
+
+    Returns:
+        Operation name -> widget work counters
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "bench_list.db"))
+        service = NoteService(NoteRepository(db))
+        service.import_notes(generate_notes(size))
+        harness = ListHarness(viewport_height)
+        listing = lambda: service.get_note_summaries(sort_by="updated")
+
+        results = {"initial display": harness.show(listing(), keep_scroll=False)}
+
+        harness.scroll_to(ROW_HEIGHT * 2)
+        target = harness.recycler.items[3].id
+
+        service.toggle_pin(target)
+        results["toggle pin"] = harness.show(listing())
+
+        service.toggle_pin(target)
+        results["toggle pin back"] = harness.show(listing())
+
+        service.delete_note(harness.recycler.items[3].id)
+        results["delete note"] = harness.show(listing())
+
+        note = service.get_note(harness.recycler.items[4].id)
+        service.update_note(note["id"], note["title"] + " (edited)", note["content"], note["tags"], note["category"])
+        results["save note"] = harness.show(listing())
+
+        service.create_note("New note", "Fresh note")
+        results["create note"] = harness.show(listing())
+
+        results["refresh, no changes"] = harness.show(listing())
+        results["scroll one row"] = harness.scroll_to(harness.top + ROW_HEIGHT)
+        results["search results"] = harness.show(service.search_note_summaries("project"),
+                                                 keep_scroll=False)
+        db.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count card widget work per home screen operation")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated corpus sizes")
+    parser.add_argument("--viewport", type=int, default=800, help="Viewport height in pixels")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    all_results = {size: run(size, args.viewport) for size in sizes}
+
+    operations = list(all_results[sizes[0]])
+    print(f"Card widget work per operation (viewport {args.viewport} px; created/binds/moves/hides):")
+    print(f"   {'operation':<22}" + "".join(f"{size:>18}" for size in sizes))
+    for operation in operations:
+        cells = []
+        for size in sizes:
+            counts = all_results[size][operation]
+            cells.append(f"{counts['cards_created']}/{counts['binds']}/{counts['moves']}/{counts['hides']}")
+        print(f"   {operation:<22}" + "".join(f"{cell:>18}" for cell in cells))
+
+    # Single-note edits may only touch the rows that are bound to cards
+    window = args.viewport // ROW_HEIGHT + 2 + 2 * ListHarness(args.viewport).recycler.buffer_rows
+    too_costly = [
+        f"{operation} ({size} notes)"
+        for size in sizes
+        for operation in ("toggle pin", "delete note", "save note", "create note")
+        if all_results[size][operation]["cards_created"]
+        or sum(all_results[size][operation].values()) > window
+    ]
+    if too_costly:
+        print(f"   😿 more widget work than the {window} bound rows for: {', '.join(too_costly)}")
+        sys.exit(1)
+    print(f"   single-note edits stay within the {window} bound rows at every size 🐾")
+
+
+if __name__ == "__main__":
+    main()
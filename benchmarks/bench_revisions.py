@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Revision History Benchmark
+Measures storage growth, save latency and restore latency of note revisions
+
+A long editing session is replayed against one note: every save edits a
+paragraph or appends one, the way auto-save fires while writing. The
+session runs with revisions off, with delta-encoded revisions, and with
+delta-encoded revisions compressed with zlib. Storage is compared with
+keeping a full copy of every version; every revision is then restored
+and checked against the version it recorded, before and after
+compaction. A save made with revisions off between two recorded saves
+must leave the earlier revisions intact.
+
+Usage:
+    python -m benchmarks.bench_revisions [--saves N] [--chars N] [--profile NAME]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from benchmarks.corpus import VOCABULARY
+from benchmarks.suite import percentile
+
+
+def _sentence(rng: random.Random) -> str:
+    words = rng.sample(VOCABULARY, rng.randint(5, 14))
+    return " ".join(words).capitalize() + "."
+
+
+def editing_session(saves: int, chars: int, seed: int = 11):
+    """The successive versions of a note, starting at about `chars` characters"""
+    rng = random.Random(seed)
+    paragraphs = []
+    while sum(len(p) for p in paragraphs) < chars:
+        paragraphs.append(" ".join(_sentence(rng) for _ in range(rng.randint(2, 6))) + "\n")
+
+    versions = ["\n".join(paragraphs)]
+    for _ in range(saves):
+        if rng.random() < 0.2:
+            paragraphs.append(_sentence(rng) + "\n")
+        else:
+            index = rng.randrange(len(paragraphs))
+            paragraphs[index] = paragraphs[index][:-1] + " " + _sentence(rng) + "\n"
+        versions.append("\n".join(paragraphs))
+    return versions
+
+
+def run_session(path: str, versions, profile: str, keep_revisions: bool, compression: bool) -> dict:
+    """Save every version and measure the revisions they leave behind"""
+    db = Database(path, storage_profile=profile, keep_revisions=keep_revisions,
+                  revision_compression=compression)
+    service = NoteService(NoteRepository(db))
+    note_id = service.create_note("Long note", versions[0])
+
+    save_ms = []
+    for content in versions[1:]:
+        start = time.perf_counter()
+        service.update_note(note_id, "Long note", content)
+        save_ms.append((time.perf_counter() - start) * 1000)
+
+    result = {"save_ms": sorted(save_ms), "stored": 0, "snapshots": 0, "restore_ms": [], "wrong": 0}
+    if keep_revisions:
+        history = service.get_history(note_id)
+        result["stored"] = sum(revision["stored_size"] for revision in history)
+        result["snapshots"] = sum(revision["is_snapshot"] for revision in history)
+        # Revision ids follow the save order, so the n-th revision holds versions[n - 1]
+        first_id = min(revision["id"] for revision in history)
+        result["restore_ms"], result["wrong"] = _restore_all(service, note_id, history, versions, first_id)
+
+        # Space the saves 7 minutes apart so compaction has old revisions to thin out
+        db._get_connection().execute(
+            "UPDATE note_revisions SET saved_at = datetime('now', '-' || ((? - id) * 7) || ' minutes') "
+            "WHERE note_id = ?", (len(versions), note_id))
+        db._get_connection().commit()
+        result["compaction"] = service.compact_history(note_id, keep_recent=50, max_age_days=90)
+        _, result["wrong_after_compaction"] = _restore_all(service, note_id, service.get_history(note_id),
+                                                           versions, first_id)
+    db.close()
+    return result
+
+
+def check_history_gap(path: str) -> bool:
+    """Record a revision, save once with revisions off, save again; True if the first revision survives"""
+    original = "".join(f"line {i} of the original note\n" for i in range(200))
+    versions = [original, "totally\ndifferent\n" * 100, original + "one more line\n"]
+
+    db = Database(path, keep_revisions=True)
+    service = NoteService(NoteRepository(db))
+    note_id = service.create_note("Gap", original)
+    service.update_note(note_id, "Gap", original + "edited\n")
+    db.keep_revisions = False
+    service.update_note(note_id, "Gap", versions[1])
+    db.keep_revisions = True
+    service.update_note(note_id, "Gap", versions[2])
+
+    contents = [service.get_revision(note_id, revision["id"])["content"]
+                for revision in reversed(service.get_history(note_id))]
+    db.close()
+    return contents == [original, versions[1]]
+
+
+def _restore_all(service: NoteService, note_id: int, history, versions, first_id: int):
+    """Rebuild every revision, returning sorted latencies and the number of wrong contents"""
+    latencies = []
+    wrong = 0
+    for revision in history:
+        start = time.perf_counter()
+        content = service.get_revision(note_id, revision["id"])["content"]
+        latencies.append((time.perf_counter() - start) * 1000)
+        if content != versions[revision["id"] - first_id]:
+            wrong += 1
+    return sorted(latencies), wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark note revision storage and restores")
+    parser.add_argument("--saves", type=int, default=500, help="Saves in the editing session")
+    parser.add_argument("--chars", type=int, default=20000, help="Initial note length in characters")
+    parser.add_argument("--profile", default="default", choices=list(Database.STORAGE_PROFILES),
+                        help="Storage profile")
+    args = parser.parse_args()
+
+    versions = editing_session(args.saves, args.chars)
+    full_copies = sum(len(content.encode("utf-8")) for content in versions[:-1])
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        gap_intact = check_history_gap(os.path.join(tmp_dir, "bench_revisions_gap.db"))
+        for label, keep, compression in (("no history", False, False), ("deltas", True, False),
+                                         ("deltas + zlib", True, True)):
+            path = os.path.join(tmp_dir, f"bench_revisions_{len(results)}.db")
+            results[label] = run_session(path, versions, args.profile, keep, compression)
+
+    print(f"Revision history, {args.saves} saves of a {len(versions[0])}-to-{len(versions[-1])}-character "
+          f"note ({args.profile}):")
+    print(f"   full copy of every version: {full_copies / 1024:10.1f} KiB")
+    failures = []
+    for label, result in results.items():
+        save = result["save_ms"]
+        print(f"   {label:<15} save p50 {percentile(save, 50):7.3f} ms   p95 {percentile(save, 95):7.3f} ms")
+        if result["restore_ms"]:
+            restore = result["restore_ms"]
+            compaction = result["compaction"]
+            print(f"   {'':<15} stored {result['stored'] / 1024:8.1f} KiB "
+                  f"({full_copies / max(result['stored'], 1):.1f}x smaller, {result['snapshots']} snapshots)   "
+                  f"restore p50 {percentile(restore, 50):6.3f} ms   p95 {percentile(restore, 95):6.3f} ms")
+            print(f"   {'':<15} compacted: {compaction['kept']} revisions kept, {compaction['removed']} removed, "
+                  f"{compaction['bytes_after'] / 1024:.1f} KiB")
+            if result["wrong"] or result["wrong_after_compaction"]:
+                failures.append(label)
+
+    if not gap_intact:
+        failures.append("a save with revisions off")
+    if failures:
+        print(f"   😿 restored content differs from the saved version in: {', '.join(failures)}")
+        raise SystemExit(1)
+    print("   every revision restored exactly 🐾")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Save Queue Benchmark
+Measures how long an editor save blocks the UI thread, inline vs queued
+
+A long note is saved repeatedly, the way auto-save fires while typing.
+The inline path calls NoteService.update_note directly, as the editor
+used to; the queued path submits the same saves to the SaveQueue and
+only waits for them at the end. Both must leave the same final content.
+
+Usage:
+    python -m benchmarks.bench_save_queue [--saves N] [--chars N] [--profile NAME]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from ui.save_queue import SaveQueue
+from benchmarks.corpus import VOCABULARY
+from benchmarks.suite import percentile
+
+
+def _content(chars: int, version: int) -> str:
+    """A note body of about `chars` characters, distinct per version"""
+    words = []
+    length = 0
+    while length < chars:
+        word = VOCABULARY[(len(words) * 7 + version) % len(VOCABULARY)]
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UI-thread blocking of editor saves")
+    parser.add_argument("--saves", type=int, default=50, help="Saves per path")
+    parser.add_argument("--chars", type=int, default=90000, help="Note length in characters")
+    parser.add_argument("--profile", default="default", choices=list(Database.STORAGE_PROFILES),
+                        help="Storage profile")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "bench_saves.db"), storage_profile=args.profile)
+        service = NoteService(NoteRepository(db))
+        note_id = service.create_note("Long note", _content(args.chars, 0))
+        versions = [_content(args.chars, version) for version in range(1, args.saves + 1)]
+
+        inline = []
+        for content in versions:
+            start = time.perf_counter()
+            service.update_note(note_id, "Long note", content)
+            inline.append((time.perf_counter() - start) * 1000)
+        inline_final = service.get_note(note_id)["content"]
+
+        service.update_note(note_id, "Long note", _content(args.chars, 0))
+        queue = SaveQueue()
+        queued = []
+        for content in versions:
+            start = time.perf_counter()
+            queue.submit(note_id, lambda c=content: service.update_note(note_id, "Long note", c))
+            queued.append((time.perf_counter() - start) * 1000)
+        queue.close()
+        queued_final = service.get_note(note_id)["content"]
+        errors = [result.error for result in queue.poll() if result.error]
+        db.close()
+
+    print(f"UI-thread time per save, {args.saves} saves of a {args.chars}-character note ({args.profile}):")
+    for label, latencies in (("inline update", inline), ("save queue", queued)):
+        ordered = sorted(latencies)
+        print(f"   {label:<16} p50 {percentile(ordered, 50):8.3f} ms   p95 {percentile(ordered, 95):8.3f} ms   "
+              f"max {ordered[-1]:8.3f} ms")
+    stats = queue.stats()
+    print(f"   writes: {stats['completed']}   coalesced: {stats['coalesced']}   failed: {stats['failed']}")
+    if errors or inline_final != queued_final:
+        print(f"   😿 queued saves did not end with the latest version ({errors or 'content differs'})")
+        raise SystemExit(1)
+    print("   final content identical 🐾")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Search Session Benchmark
+Measures per-keystroke search latency with and without incremental narrowing
+
+Each phrase is "typed" one character at a time. The baseline runs the
+ranked database search on every keystroke; the session path goes through
+NoteService.search_note_summaries, which narrows the previous results in
+memory while the query only grows. Both paths must return the same notes.
+
+Usage:
+    python -m benchmarks.bench_search_session [--notes N] [--like]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from benchmarks.corpus import generate_notes
+from benchmarks.suite import percentile
+
+
+PHRASES = ("project deadline", "whiskers nap", "sqlite index", "garden recipe")
+
+
+def _typed_prefixes(phrase: str):
+    """Every query seen while typing a phrase, skipping trailing-space states"""
+    return [phrase[:i] for i in range(1, len(phrase) + 1) if not phrase[:i].endswith(" ")]
+
+
+def measure(search, reset, phrases) -> list:
+    """
+    Time each keystroke of each phrase
+
+    Returns:
+        (query, milliseconds, result IDs) for every keystroke
+    """
+    timings = []
+    for phrase in phrases:
+        reset()
+        for query in _typed_prefixes(phrase):
+            start = time.perf_counter()
+            results = search(query)
+            timings.append((query, (time.perf_counter() - start) * 1000, {note.id for note in results}))
+    return timings
+
+
+def _report(label: str, timings: list):
+    """Print latency percentiles for a list of keystroke timings"""
+    latencies = sorted(ms for _, ms, _ in timings)
+    print(f"   {label:<18} p50 {percentile(latencies, 50):8.1f} ms   p95 {percentile(latencies, 95):8.1f} ms   "
+          f"max {latencies[-1]:8.1f} ms   total {sum(latencies):8.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark incremental search narrowing")
+    parser.add_argument("--notes", type=int, default=50000, help="Number of notes to seed")
+    parser.add_argument("--like", action="store_true", help="Benchmark the LIKE fallback instead of FTS5")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "bench_search.db"), storage_profile="balanced")
+        service = NoteService(NoteRepository(db))
+        service.import_notes(generate_notes(args.notes), batch_size=1000)
+        if args.like:
+            db.fts_enabled = False
+
+        baseline = measure(service.repository.search_summaries, lambda: None, PHRASES)
+        session = measure(service.search_note_summaries, service.search_session.reset, PHRASES)
+        db.close()
+
+    mismatches = [query for (query, _, expected), (_, _, actual) in zip(baseline, session) if expected != actual]
+
+    print(f"Per-keystroke search latency, {args.notes} notes ({'LIKE' if args.like else 'FTS5'}, "
+          f"{len(baseline)} keystrokes):")
+    _report("full search", baseline)
+    _report("search session", session)
+    print(f"   narrowed in memory: {service.search_session.narrowed_searches}   "
+          f"database searches: {service.search_session.full_searches}")
+    if mismatches:
+        print(f"   😿 result mismatch for: {', '.join(mismatches)}")
+        raise SystemExit(1)
+    print("   results identical 🐾")
+
+
+if __name__ == "__main__":
+    main()
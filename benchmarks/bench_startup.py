@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Startup Benchmark
+Measures import cost and time-to-first-card against regression thresholds
+
+Two measurements, each in a fresh interpreter:
+
+- Import time: `python -X importtime -c "import <module>"` for the modules
+  on the startup path, best of several runs. The app modules must also
+  stay lazy: importing them must not pull in the editor screen.
+- Time to first card: `main.py --startup-probe` against a seeded database,
+  which reports when the window was built, first painted and showed its
+  first note list. Needs a display; skipped when there is none.
+
+Modules whose third-party dependencies are not installed are skipped.
+
+Usage:
+    python -m benchmarks.bench_startup [--notes N] [--runs N]
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from benchmarks.corpus import generate_notes
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Module -> cumulative import time budget in milliseconds
+IMPORT_BUDGETS = {
+    "database": 60,
+    "services.note_service": 80,
+    "services.config_service": 80,
+    "ui.home": 600,
+    "main": 700,
+}
+
+# Modules that must only be imported on first use. Pillow is not listed:
+# customtkinter imports it for CTkImage regardless
+LAZY_MODULES = ("ui.editor",)
+
+# Startup mark -> budget in milliseconds since process start
+STARTUP_BUDGETS = {
+    "window_built": 1500,
+    "first_paint": 2000,
+    "first_card": 2500,
+}
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+
+
+def measure_import(module: str, runs: int = 3) -> Optional[Dict]:
+    """
+    Time a module import in fresh interpreters
+
+    Args:
+        module: Dotted module name, importable from the repository root
+        runs: Number of interpreters to start; the fastest run is kept
+
+    Returns:
+        Dictionary with cumulative milliseconds and imported module names,
+        or None if the module cannot be imported here
+    """
+    best = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            return None
+
+        imported: List[str] = []
+        total_us = 0
+        for line in completed.stderr.splitlines():
+            match = _IMPORTTIME_LINE.match(line)
+            if match:
+                imported.append(match.group(3))
+                if match.group(3) == module:
+                    total_us = int(match.group(2))
+        if best is None or total_us < best["ms"] * 1000:
+            best = {"ms": round(total_us / 1000, 1), "imported": imported}
+    return best
+
+
+def measure_first_card(notes: int, timeout: float = 30.0) -> Optional[Dict[str, float]]:
+    """
+    Start the app against a seeded database and collect its startup marks
+
+    Args:
+        notes: Number of notes to seed
+        timeout: Seconds to wait for the app to exit
+
+    Returns:
+        Startup marks in milliseconds, or None without a display or
+        GUI dependencies
+    """
+    if sys.platform.startswith("linux") and not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+        return None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # The app opens whiskernotes.db in its working directory
+        db = Database(os.path.join(tmp_dir, "whiskernotes.db"))
+        NoteService(NoteRepository(db)).import_notes(generate_notes(notes), batch_size=1000)
+        db.close()
+
+        completed = subprocess.run(
+            [sys.executable, os.path.join(ROOT, "main.py"), "--startup-probe"],
+            cwd=tmp_dir, capture_output=True, text=True, timeout=timeout
+        )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        if "ModuleNotFoundError" in completed.stderr:
+            return None
+        raise RuntimeError(f"startup probe failed:\n{completed.stderr}")
+    return json.loads(lines[-1])
+
+
+def run(notes: int = 1000, runs: int = 3) -> Dict:
+    """
+    Run both startup measurements and check them against their budgets
+
+    Args:
+        notes: Number of notes seeded for the time-to-first-card run
+        runs: Interpreters started per import measurement
+
+    Returns:
+        Dictionary with "imports", "first_card" and a list of "regressions"
+    """
+    results = {"imports": {}, "first_card": None, "regressions": []}
+
+    for module, budget in IMPORT_BUDGETS.items():
+        measured = measure_import(module, runs)
+        if measured is None:
+            results["imports"][module] = None
+            continue
+        results["imports"][module] = measured["ms"]
+        if measured["ms"] > budget:
+            results["regressions"].append(f"import {module}: {measured['ms']} ms > {budget} ms")
+        eager = [name for name in LAZY_MODULES if name in measured["imported"]]
+        if eager:
+            results["regressions"].append(f"import {module} loads {', '.join(eager)} eagerly")
+
+    marks = measure_first_card(notes)
+    results["first_card"] = marks
+    for name, budget in STARTUP_BUDGETS.items():
+        if marks is not None and marks.get(name, float("inf")) > budget:
+            results["regressions"].append(f"{name}: {marks.get(name)} ms > {budget} ms")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WhiskerNotes startup time")
+    parser.add_argument("--notes", type=int, default=1000, help="Notes seeded for the time-to-first-card run")
+    parser.add_argument("--runs", type=int, default=3, help="Interpreters started per import measurement")
+    args = parser.parse_args()
+
+    results = run(args.notes, args.runs)
+
+    print("Import time (cumulative, best of runs):")
+    for module, ms in results["imports"].items():
+        shown = "skipped (dependencies not installed)" if ms is None else f"{ms:8.1f} ms"
+        print(f"   {module:<26} {shown:>12}   budget {IMPORT_BUDGETS[module]} ms")
+
+    print(f"Time to first card ({args.notes} notes):")
+    if results["first_card"] is None:
+        print("   skipped (no display or GUI dependencies)")
+    else:
+        for name, ms in results["first_card"].items():
+            print(f"   {name:<26} {ms:8.1f} ms   budget {STARTUP_BUDGETS.get(name, '-')} ms")
+
+    if results["regressions"]:
+        print(f"   😿 startup regressions: {'; '.join(results['regressions'])}")
+        sys.exit(1)
+    print("   startup within budget 🐾")
+
+
+if __name__ == "__main__":
+    main()
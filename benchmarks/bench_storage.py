@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Storage Profile Benchmark
+Measures commit latency and concurrent read throughput for each storage profile
+
+Usage:
+    python -m benchmarks.bench_storage [--notes N] [--commits N] [--readers N] [--seconds S]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from database import Database
+
+
+def _seed(db: Database, count: int):
+    """Fill the database with notes of a realistic size"""
+    for i in range(count):
+        db.create_note(f"Note {i}", "Meow purr whiskers. " * 100, "cats, bench", "Personal")
+
+
+def measure_commit_latency(db: Database, commits: int) -> list:
+    """
+    Time auto-save style single-note updates
+    
+    Returns:
+        Commit latencies in milliseconds
+    """
+    latencies = []
+    for i in range(commits):
+        start = time.perf_counter()
+        db.update_note((i % 50) + 1, f"Note {i}", f"Edited content {i} " * 100, "cats", "Personal")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def measure_concurrent_reads(db: Database, readers: int, seconds: float) -> dict:
+    """
+    Run reader threads against a continuously writing thread
+    
+    Returns:
+        Dictionary with reads/sec, writes/sec and failed (locked) reads
+    """
+    stop = threading.Event()
+    counts = {"reads": 0, "writes": 0, "failed_reads": 0}
+    lock = threading.Lock()
+    
+    def reader():
+        reads = failed = 0
+        while not stop.is_set():
+            try:
+                db.get_note_summaries_page(limit=20)
+                db.get_note((reads % 50) + 1)
+                reads += 1
+            except sqlite3.OperationalError:
+                failed += 1
+        with lock:
+            counts["reads"] += reads
+            counts["failed_reads"] += failed
+    
+    def writer():
+        writes = 0
+        while not stop.is_set():
+            try:
+                db.update_note((writes % 50) + 1, "Busy note", f"Writer pass {writes}", "cats", "Personal")
+                writes += 1
+            except sqlite3.OperationalError:
+                pass
+        with lock:
+            counts["writes"] += writes
+    
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    
+    return {
+        "reads_per_sec": counts["reads"] / seconds,
+        "writes_per_sec": counts["writes"] / seconds,
+        "failed_reads": counts["failed_reads"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite storage profiles")
+    parser.add_argument("--notes", type=int, default=500, help="Number of notes to seed")
+    parser.add_argument("--commits", type=int, default=200, help="Number of timed commits")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of the concurrency test")
+    args = parser.parse_args()
+    
+    for profile in Database.STORAGE_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db = Database(os.path.join(tmp_dir, "bench_storage.db"), storage_profile=profile)
+            _seed(db, args.notes)
+            
+            latencies = sorted(measure_commit_latency(db, args.commits))
+            concurrency = measure_concurrent_reads(db, args.readers, args.seconds)
+            db.close()
+        
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{profile} (journal={Database.STORAGE_PROFILES[profile].get('journal_mode', 'DELETE')}):")
+        print(f"   commit latency   p50 {statistics.median(latencies):7.2f} ms   p95 {p95:7.2f} ms")
+        print(f"   concurrent I/O   {concurrency['reads_per_sec']:9.0f} reads/s   "
+              f"{concurrency['writes_per_sec']:7.0f} writes/s   "
+              f"{concurrency['failed_reads']} locked reads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Live Word Count Benchmark
+Measures keeping a live word count while typing into a long note
+
+A typing session is replayed against the text of a long note: letters,
+spaces, newlines, pasted paragraphs and deleted lines, each applied as
+the editor's text widget hook sees it (the line range an edit touched
+and those lines afterwards). The incremental TextStats update is timed
+against recounting the whole text per keystroke, and its counts are
+checked against the full recount as the session goes.
+
+Usage:
+    python -m benchmarks.bench_text_stats [--chars N] [--keys N]
+"""
+
+import argparse
+import random
+import time
+
+from utils.text_stats import TextStats, count_words
+from benchmarks.corpus import VOCABULARY
+from benchmarks.suite import percentile
+
+
+class LineBuffer:
+    """The text as a list of lines, edited the way a Tk text widget is"""
+
+    def __init__(self, text: str):
+        self.lines = text.split("\n")
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def insert(self, line: int, column: int, chars: str):
+        """Insert at (line, column); returns (first, last, new lines) for TextStats"""
+        current = self.lines[line]
+        new_lines = (current[:column] + chars + current[column:]).split("\n")
+        self.lines[line:line + 1] = new_lines
+        return line, line, new_lines
+
+    def delete_lines(self, first: int, last: int):
+        """Delete from the start of `first` to the start of `last`"""
+        del self.lines[first:last]
+        return first, last, [self.lines[first]]
+
+
+def typing_session(buffer: LineBuffer, keys: int, seed: int = 5):
+    """Yield the edits of a typing session, applying them to `buffer`"""
+    rng = random.Random(seed)
+    line = rng.randrange(len(buffer.lines))
+    for _ in range(keys):
+        roll = rng.random()
+        column = len(buffer.lines[line])
+        if roll < 0.002 and len(buffer.lines) > 4:
+            first = rng.randrange(len(buffer.lines) - 3)
+            line = first
+            yield buffer.delete_lines(first, first + 3)
+        elif roll < 0.004:
+            paragraph = " ".join(rng.sample(VOCABULARY, 30)) + "\n\n"
+            yield buffer.insert(line, column, paragraph)
+            line += 2
+        elif roll < 0.02:
+            yield buffer.insert(line, column, "\n")
+            line += 1
+        elif roll < 0.2:
+            yield buffer.insert(line, column, " ")
+        else:
+            yield buffer.insert(line, column, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the live word count of the editor")
+    parser.add_argument("--chars", type=int, default=100000, help="Note length in characters")
+    parser.add_argument("--keys", type=int, default=5000, help="Keystrokes in the session")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    paragraphs = []
+    while sum(len(p) + 2 for p in paragraphs) < args.chars:
+        paragraphs.append(" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(20, 80))))
+    text = "\n\n".join(paragraphs)[:args.chars]
+
+    buffer = LineBuffer(text)
+    stats = TextStats(text)
+    incremental = []
+    recount = []
+    mismatches = 0
+    for step, (first, last, new_lines) in enumerate(typing_session(buffer, args.keys)):
+        start = time.perf_counter()
+        stats.replace_lines(first, last, new_lines)
+        incremental.append((time.perf_counter() - start) * 1000)
+
+        current = buffer.text()
+        start = time.perf_counter()
+        words = count_words(current)
+        recount.append((time.perf_counter() - start) * 1000)
+        if step % 100 == 0 and (words, len(current)) != (stats.words, stats.chars):
+            mismatches += 1
+
+    final = buffer.text()
+    if (count_words(final), len(final)) != (stats.words, stats.chars):
+        mismatches += 1
+
+    print(f"Word count per keystroke, {args.keys} keys into a {args.chars}-character note "
+          f"({len(buffer.lines)} lines):")
+    for label, latencies in (("full recount", recount), ("incremental", incremental)):
+        ordered = sorted(latencies)
+        print(f"   {label:<14} p50 {percentile(ordered, 50):8.4f} ms   p95 {percentile(ordered, 95):8.4f} ms   "
+              f"max {ordered[-1]:8.4f} ms")
+    print(f"   final count: {stats.words} words, {stats.chars} characters")
+    if mismatches:
+        print(f"   😿 incremental counts drifted from the full recount {mismatches} times")
+        raise SystemExit(1)
+    print("   incremental counts match the full recount 🐾")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Query Plan Check
+Runs every Database query shape and fails if any falls back to a table scan
+
+Each statement issued by the Database methods is captured with SQLite's
+trace hook and re-run under EXPLAIN QUERY PLAN. A plan step of the form
+"SCAN <table>" without an index is reported as a failure, except for
+rowid-ordered walks (ORDER BY id without a temp B-tree), which read the
+table in its own storage order and stop at the LIMIT.
+
+Usage:
+    python -m benchmarks.check_query_plans
+"""
+
+import os
+import sys
+import tempfile
+
+from database import Database
+
+
+# Statements that are not query plans worth checking
+_SKIPPED_PREFIXES = ("--", "PRAGMA", "BEGIN", "COMMIT", "ROLLBACK", "INSERT", "CREATE", "DROP")
+
+
+def _seed(db: Database):
+    """Create a small corpus covering pins, categories and tags"""
+    categories = ["Personal", "Study", "Ideas", "Work", "Other"]
+    for i in range(50):
+        note_id = db.create_note(
+            f"Note {i}",
+            f"Project meeting notes number {i} about cats",
+            "todo, study" if i % 2 else "cats",
+            categories[i % len(categories)]
+        )
+        if i % 7 == 0:
+            db.toggle_pin(note_id)
+
+
+def _exercise(db: Database):
+    """Call every query method the application ships"""
+    for sort_by in Database.SORT_KEYS:
+        db.get_all_notes(sort_by)
+        db.get_note_summaries(sort_by)
+        db.get_note_summaries(sort_by, category="Work")
+        db.get_note_summaries(sort_by, tag="todo")
+        for fetch_page in (db.get_notes_page, db.get_note_summaries_page):
+            page = fetch_page(sort_by, limit=5)
+            fetch_page(sort_by, limit=5, cursor=page.next_cursor)
+            page = fetch_page(sort_by, limit=5, category="Work")
+            fetch_page(sort_by, limit=5, cursor=page.next_cursor, category="Work")
+    
+    db.get_note(1)
+    db.get_notes_by_category("Study")
+    db.get_notes_by_tag("todo")
+    db.get_tag_counts()
+    db.search_notes("proj")
+    db.search_note_summaries("proj")
+    db.match_note_ids("proj")
+    page = db.search_notes_page("proj", limit=5)
+    db.search_notes_page("proj", limit=5, cursor=page.next_cursor)
+    db.update_note(2, "Updated", "Updated content", "todo", "Work")
+    db.update_note(2, "Updated again", "Updated content", "todo", "Work")
+    revisions = db.get_revisions(2)
+    db.get_revision(2, revisions[-1]["id"])
+    db.compact_revisions(keep_recent=1, max_age_days=0)
+    db.toggle_pin(3)
+    db.delete_note(4)
+
+
+def _scan_steps(conn, statement: str):
+    """Return the plan steps of a statement that scan a table without an index"""
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+    rowid_order = " ORDER BY id " in f"{statement} " and not any("TEMP B-TREE" in row[3] for row in plan)
+    bad_steps = []
+    for row in plan:
+        detail = row[3]
+        if not detail.startswith("SCAN "):
+            continue
+        if " USING " in detail or "VIRTUAL TABLE" in detail or "CONSTANT ROW" in detail:
+            continue
+        if rowid_order and detail == "SCAN notes":
+            continue
+        bad_steps.append(detail)
+    return bad_steps
+
+
+def check_query_plans(db: Database) -> list:
+    """
+    Capture and check every statement issued by the Database query methods
+    
+    Args:
+        db: Database to exercise
+        
+    Returns:
+        List of (statement, bad plan steps) failures
+    """
+    statements = []
+    conn = db._get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        _exercise(db)
+    finally:
+        conn.set_trace_callback(None)
+    
+    failures = []
+    seen = set()
+    for statement in statements:
+        normalized = " ".join(statement.split())
+        if normalized.upper().startswith(_SKIPPED_PREFIXES) or normalized in seen:
+            continue
+        seen.add(normalized)
+        bad_steps = _scan_steps(conn, statement)
+        if bad_steps:
+            failures.append((normalized, bad_steps))
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "query_plans.db"))
+        _seed(db)
+        failures = check_query_plans(db)
+        db.close()
+    
+    if failures:
+        print(f"{len(failures)} quer{'y' if len(failures) == 1 else 'ies'} fall back to a table scan:")
+        for statement, steps in failures:
+            print(f"\n   {statement}")
+            for step in steps:
+                print(f"      -> {step}")
+        sys.exit(1)
+    
+    print("All query plans use an index 🐾")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+WhiskerNotes - Synthetic Corpus
+Deterministic note generator for benchmarks
+
+Content lengths follow a log-normal distribution (median around 800
+characters, a long tail up to MAX_CONTENT_CHARS), which is closer to a
+real notebook than fixed-size filler. Words are drawn from a small
+vocabulary so full-text search terms have realistic hit rates.
+"""
+
+import random
+from typing import Dict, Iterator
+
+from utils.validators import NoteValidator
+
+
+VOCABULARY = (
+    "meow purr whiskers kitten paw tail nap sunbeam yarn mouse catnip "
+    "project meeting deadline review draft budget roadmap release sprint "
+    "lecture exam chapter summary formula essay research reading notes "
+    "idea sketch plan recipe garden travel journal grocery workout book "
+    "python sqlite index query cache thread widget canvas scroll render"
+).split()
+
+TAGS = ("cats", "work", "study", "ideas", "todo", "urgent", "reading", "travel",
+        "recipes", "python", "meeting", "journal", "garden", "fitness", "music")
+
+MAX_CONTENT_CHARS = 20000
+
+
+def _paragraphs(rng: random.Random, length: int) -> str:
+    """Build roughly `length` characters of sentence-shaped text"""
+    words = []
+    size = 0
+    while size < length:
+        sentence = rng.sample(VOCABULARY, rng.randint(5, 14))
+        sentence[0] = sentence[0].capitalize()
+        text = " ".join(sentence) + ("." if rng.random() < 0.85 else ".\n\n")
+        words.append(text)
+        size += len(text) + 1
+    return " ".join(words)[:length]
+
+
+def generate_notes(count: int, seed: int = 42) -> Iterator[Dict]:
+    """
+    Generate synthetic notes
+
+    Args:
+        count: Number of notes to generate
+        seed: Random seed, so every run builds the same corpus
+
+    Yields:
+        Note dictionaries accepted by NoteService.import_notes
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        length = min(int(rng.lognormvariate(6.7, 1.0)), MAX_CONTENT_CHARS)
+        tags = rng.sample(TAGS, rng.choice((0, 1, 1, 2, 2, 3, 4)))
+        yield {
+            "title": f"{rng.choice(VOCABULARY).capitalize()} {rng.choice(VOCABULARY)} #{i}",
+            "content": _paragraphs(rng, max(length, 20)),
+            "tags": ", ".join(tags),
+            "category": rng.choice(NoteValidator.VALID_CATEGORIES),
+            "is_pinned": rng.random() < 0.02,
+        }
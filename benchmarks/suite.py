@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Benchmark Suite
+Times every Database and NoteService operation against synthetic corpora
+
+For each corpus size a fresh database is bulk-loaded with generated notes
+and every operation is run repeatedly until a time budget is spent.
+Latencies are reported as p50/p95/p99 and ops/sec and written to a JSON
+file tagged with the git commit, so runs can be compared across commits.
+No Tk modules are imported.
+
+Usage:
+    python -m benchmarks [--sizes 1000,10000,100000] [--min-time S] [--output FILE]
+                         [--only SUBSTRING] [--baseline OLD.json]
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from services.config_service import ConfigService
+from benchmarks.corpus import TAGS, VOCABULARY, generate_notes
+
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Queries for the search operations: a common word, a prefix, two words, a rare pair
+SEARCH_QUERIES = ("meow", "whisk", "project deadline", "sqlite sunbeam")
+
+
+class Operation(NamedTuple):
+    """A named benchmark operation"""
+    name: str
+    func: Callable[[], Any]
+    budget: Optional[Callable[[], int]] = None  # remaining calls, for operations that consume state
+
+
+class OperationResult(NamedTuple):
+    """Latency statistics for one operation"""
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    ops_per_sec: float
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def time_operation(func: Callable[[], Any], min_time: float, min_iterations: int = 5,
+                   max_iterations: int = 10000) -> OperationResult:
+    """
+    Call an operation until the time budget and minimum call count are met
+
+    Args:
+        func: Operation to time
+        min_time: Seconds to keep calling it
+        min_iterations: Calls to make even when the budget is exhausted
+        max_iterations: Upper bound on calls
+
+    Returns:
+        Latency statistics
+    """
+    latencies = []
+    deadline = time.perf_counter() + min_time
+    while len(latencies) < max_iterations:
+        start = time.perf_counter()
+        func()
+        end = time.perf_counter()
+        latencies.append((end - start) * 1000)
+        if end >= deadline and len(latencies) >= min_iterations:
+            break
+
+    ordered = sorted(latencies)
+    total_seconds = sum(ordered) / 1000
+    return OperationResult(
+        iterations=len(ordered),
+        p50_ms=percentile(ordered, 50),
+        p95_ms=percentile(ordered, 95),
+        p99_ms=percentile(ordered, 99),
+        mean_ms=total_seconds * 1000 / len(ordered),
+        ops_per_sec=len(ordered) / total_seconds if total_seconds else float("inf"),
+    )
+
+
+def build_operations(db: Database, service: NoteService, size: int, seed: int = 7) -> List[Operation]:
+    """
+    Build the operation list for a loaded corpus
+
+    Read operations come first so they see the corpus as generated. Write
+    operations follow; notes created by the create operations are the ones
+    removed by the delete operations, keeping the corpus size stable.
+
+    Args:
+        db: Loaded database
+        service: NoteService over the same database
+        size: Number of notes in the corpus
+        seed: Random seed for the id and query choices
+
+    Returns:
+        Operations in run order
+    """
+    rng = random.Random(seed)
+    random_id = lambda: rng.randint(1, size)
+    queries = itertools.cycle(SEARCH_QUERIES)
+    tags = itertools.cycle(TAGS)
+    db_created = []
+    service_created = []
+
+    def content():
+        return " ".join(rng.choices(VOCABULARY, k=150))
+
+    def save_unchanged(note_id):
+        # An auto-save with nothing edited; skipped by the content hash
+        note = service.get_note(note_id)
+        service.update_note(note_id, note["title"], note["content"], note["tags"], note["category"])
+
+    operations = [
+        Operation("db.get_note", lambda: db.get_note(random_id())),
+        Operation("service.get_note", lambda: service.get_note(random_id())),
+    ]
+
+    for sort_by in Database.SORT_KEYS:
+        operations += [
+            Operation(f"db.get_all_notes[{sort_by}]", lambda s=sort_by: db.get_all_notes(s)),
+            Operation(f"service.get_all_notes[{sort_by}]", lambda s=sort_by: service.get_all_notes(s)),
+            Operation(f"db.get_note_summaries[{sort_by}]", lambda s=sort_by: db.get_note_summaries(s)),
+            Operation(f"service.get_note_summaries[{sort_by}]", lambda s=sort_by: service.get_note_summaries(s)),
+            Operation(f"db.get_note_summaries_page[{sort_by}]",
+                      lambda s=sort_by: db.get_note_summaries_page(s, limit=20)),
+            Operation(f"service.get_note_summaries_page[{sort_by}]",
+                      lambda s=sort_by: service.get_note_summaries_page(s, limit=20)),
+        ]
+
+    operations += [
+        Operation("db.get_notes_by_category", lambda: db.get_notes_by_category("Work")),
+        Operation("service.get_notes_by_category", lambda: service.get_notes_by_category("Work")),
+        Operation("service.get_note_summaries[category]",
+                  lambda: service.get_note_summaries(category="Work")),
+        Operation("db.get_notes_by_tag", lambda: db.get_notes_by_tag(next(tags))),
+        Operation("service.get_notes_by_tag", lambda: service.get_notes_by_tag(next(tags))),
+        Operation("service.get_note_summaries[tag]", lambda: service.get_note_summaries(tag=next(tags))),
+        Operation("service.get_tag_counts", service.get_tag_counts),
+        Operation("config.get_setting", lambda: ConfigService.get_setting("auto_save_delay")),
+        Operation("db.search_notes", lambda: db.search_notes(next(queries))),
+        Operation("service.search_notes", lambda: service.search_notes(next(queries))),
+        Operation("service.search_notes[#tag]", lambda: service.search_notes(f"#{next(tags)}")),
+        Operation("db.search_note_summaries", lambda: db.search_note_summaries(next(queries))),
+        Operation("service.search_note_summaries", lambda: service.search_note_summaries(next(queries))),
+        Operation("db.search_notes_page", lambda: db.search_notes_page(next(queries), limit=20)),
+        Operation("service.search_notes_page", lambda: service.search_notes_page(next(queries), limit=20)),
+
+        Operation("db.create_note",
+                  lambda: db_created.append(db.create_note("Bench note", content(), "cats, bench", "Work"))),
+        Operation("service.create_note",
+                  lambda: service_created.append(service.create_note("Bench note", content(), "cats, bench", "Work"))),
+        Operation("db.update_note",
+                  lambda: db.update_note(random_id(), "Edited note", content(), "cats", "Personal")),
+        Operation("service.update_note",
+                  lambda: service.update_note(random_id(), "Edited note", content(), "cats", "Personal")),
+        Operation("service.update_note[unchanged]", lambda: save_unchanged(random_id())),
+        Operation("db.toggle_pin", lambda: db.toggle_pin(random_id())),
+        Operation("service.toggle_pin", lambda: service.toggle_pin(random_id())),
+    ]
+
+    # Each layer's delete removes the notes its create operation added
+    operations += [
+        Operation("db.delete_note", lambda: db.delete_note(db_created.pop()), budget=lambda: len(db_created)),
+        Operation("service.delete_note", lambda: service.delete_note(service_created.pop()),
+                  budget=lambda: len(service_created)),
+    ]
+    return operations
+
+
+def run_size(size: int, args) -> Dict:
+    """
+    Load a corpus of the given size and time every operation against it
+
+    Returns:
+        Dictionary with seed timing and per-operation results
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, f"bench_{size}.db"), storage_profile=args.profile)
+        service = NoteService(NoteRepository(db))
+
+        start = time.perf_counter()
+        service.import_notes(generate_notes(size, seed=args.seed), batch_size=1000)
+        seed_seconds = time.perf_counter() - start
+        print(f"\n{size} notes (loaded in {seed_seconds:.1f} s, fts={'on' if db.fts_enabled else 'off'}):")
+
+        operations = build_operations(db, service, size)
+        results = {}
+        for op in operations:
+            if args.only and args.only not in op.name:
+                continue
+            max_iterations = args.max_iterations
+            if op.budget:
+                max_iterations = min(max_iterations, op.budget())
+                if not max_iterations:
+                    continue
+            result = time_operation(op.func, args.min_time, min(args.min_iterations, max_iterations),
+                                    max_iterations)
+            results[op.name] = result._asdict()
+            print(f"   {op.name:<46} p50 {result.p50_ms:9.3f} ms   p95 {result.p95_ms:9.3f} ms   "
+                  f"p99 {result.p99_ms:9.3f} ms   {result.ops_per_sec:10.1f} ops/s")
+
+        db.close()
+
+    return {
+        "seed": {"seconds": seed_seconds, "notes_per_sec": size / seed_seconds},
+        "fts_enabled": db.fts_enabled,
+        "repository_cache": service.get_cache_stats(),
+        "operations": results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Get the current commit hash, if the benchmark runs from a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            check=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: Dict, current: Dict):
+    """Print the p50 change of every operation present in both result files"""
+    print(f"\nComparison against {baseline['meta'].get('commit') or 'baseline'} (p50, lower is better):")
+    for size, data in current["sizes"].items():
+        old_ops = baseline.get("sizes", {}).get(size, {}).get("operations", {})
+        for name, result in data["operations"].items():
+            if name not in old_ops or not old_ops[name]["p50_ms"]:
+                continue
+            ratio = result["p50_ms"] / old_ops[name]["p50_ms"]
+            marker = "  🐢" if ratio > 1.2 else "  🐾" if ratio < 0.8 else ""
+            print(f"   {size:>7} {name:<46} {old_ops[name]['p50_ms']:9.3f} -> {result['p50_ms']:9.3f} ms"
+                  f"   x{ratio:.2f}{marker}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the WhiskerNotes data and service layers")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="Comma-separated corpus sizes")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds spent per operation")
+    parser.add_argument("--min-iterations", type=int, default=5, help="Minimum calls per operation")
+    parser.add_argument("--max-iterations", type=int, default=5000, help="Maximum calls per operation")
+    parser.add_argument("--profile", default="balanced", choices=list(Database.STORAGE_PROFILES),
+                        help="Storage profile to benchmark")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus random seed")
+    parser.add_argument("--only", help="Only run operations whose name contains this text")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--startup", action="store_true",
+                        help="Also measure import time and time-to-first-card (see bench_startup)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "storage_profile": args.profile,
+            "min_time": args.min_time,
+            "corpus_seed": args.seed,
+        },
+        "sizes": {},
+    }
+
+    for size in sizes:
+        report["sizes"][str(size)] = run_size(size, args)
+
+    if args.startup:
+        # Runs in fresh interpreters, so the GUI never loads into this process
+        from benchmarks import bench_startup
+        report["startup"] = bench_startup.run()
+        for regression in report["startup"]["regressions"]:
+            print(f"   😿 startup regression: {regression}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output} 🐾")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+    if "tkinter" in sys.modules:
+        print("Warning: a Tk module was imported during the benchmark run", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+WhiskerNotes - Command Line Tools
+Bulk import and export of notes, and history maintenance, without the GUI
+
+Usage:
+    python cli.py export notes.jsonl
+    python cli.py export exported_notes/ --format markdown
+    python cli.py import notes.jsonl
+    python cli.py import exported_notes/
+    python cli.py compact-history --keep-recent 20
+"""
+
+import argparse
+import os
+import sys
+
+from database import Database
+from repository.note_repository import NoteRepository
+from services.note_service import NoteService
+from services.config_service import ConfigService
+from utils import note_io
+from utils.exceptions import WhiskerNotesError
+
+
+def _detect_format(path: str, requested: str) -> str:
+    """Pick the format from the flag, or from whether the path is a folder"""
+    if requested:
+        return requested
+    return "markdown" if os.path.isdir(path) or not os.path.splitext(path)[1] else "jsonl"
+
+
+def import_command(service: NoteService, args) -> int:
+    """Import notes from a JSONL file or Markdown folder"""
+    fmt = _detect_format(args.path, args.format)
+    if fmt == "markdown":
+        return service.import_notes(note_io.read_markdown_folder(args.path), args.batch_size)
+    with open(args.path, "r", encoding="utf-8") as f:
+        return service.import_notes(note_io.read_jsonl(f), args.batch_size)
+
+
+def export_command(service: NoteService, args) -> int:
+    """Export notes to a JSONL file or Markdown folder"""
+    fmt = _detect_format(args.path, args.format)
+    if fmt == "markdown":
+        return service.export_notes(args.path, "markdown", args.batch_size)
+    with open(args.path, "w", encoding="utf-8") as f:
+        return service.export_notes(f, "jsonl", args.batch_size)
+
+
+def compact_history_command(service: NoteService, args) -> dict:
+    """Thin out old note revisions"""
+    return service.compact_history(keep_recent=args.keep_recent, max_age_days=args.max_age_days)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WhiskerNotes bulk import/export 🐱")
+    parser.add_argument("--db", default="whiskernotes.db", help="Database file (default: whiskernotes.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    for name, help_text in (("import", "Import notes"), ("export", "Export notes")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("path", help="JSONL file or Markdown folder")
+        sub.add_argument("--format", choices=["jsonl", "markdown"], help="Defaults to markdown for folders")
+        sub.add_argument("--batch-size", type=int, default=500, help="Notes per transaction/query")
+    
+    sub = subparsers.add_parser("compact-history", help="Thin out old note revisions")
+    sub.add_argument("--keep-recent", type=int, default=ConfigService.get_int("revision_keep_recent", 50),
+                     help="Revisions per note that are always kept")
+    sub.add_argument("--max-age-days", type=int, default=ConfigService.get_int("revision_max_age_days", 90),
+                     help="Drop older revisions saved before this many days ago (0 keeps all)")
+    
+    args = parser.parse_args()
+    
+    db = Database(args.db, **ConfigService.get_storage_settings())
+    service = NoteService(NoteRepository(db))
+    try:
+        if args.command == "import":
+            count = import_command(service, args)
+            print(f"Purr! Imported {count} notes 🐾")
+        elif args.command == "compact-history":
+            stats = compact_history_command(service, args)
+            print(f"Purr! Removed {stats['removed']} revisions, kept {stats['kept']} "
+                  f"({stats['bytes_before'] // 1024} KiB -> {stats['bytes_after'] // 1024} KiB) 🐾")
+        else:
+            count = export_command(service, args)
+            print(f"Meow! Exported {count} notes to {args.path} 🐾")
+    except (WhiskerNotesError, OSError) as e:
+        print(f"😿 {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
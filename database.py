@@ -5,42 +5,364 @@ Handles SQLite database operations for note persistence
 
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Iterator, NamedTuple, Callable, Any, Union
+from utils import delta
+from utils.content_codec import MARKERS, compress_content, decompress_content, register_sqlite_functions
+from utils.content_hash import content_digest, note_hash
+from utils.text_stats import count_words
+from utils.exceptions import DatabaseError
+
+
+class NotePage(NamedTuple):
+    """One page of notes and the cursor for fetching the next page"""
+    notes: List
+    next_cursor: Optional[tuple]
+
+
+class NoteSummary(NamedTuple):
+    """Compact note record for list views - no content body"""
+    id: int
+    title: str
+    preview: str
+    tags: str
+    category: str
+    updated_at: str
+    is_pinned: int
+    snippet: Optional[str] = None
 
 
 class Database:
     """SQLite database manager for WhiskerNotes"""
     
-    def __init__(self, db_path: str = "whiskernotes.db"):
-        """Initialize database connection"""
+    # bm25() column weights for the full-text index: title, content, tags
+    FTS_WEIGHTS = (10.0, 1.0, 5.0)
+    
+    # Markers wrapped around matched terms in search snippets (markdown bold)
+    SNIPPET_MARKERS = ("**", "**")
+    
+    # LIKE is case-insensitive for ASCII letters only
+    ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+    
+    # UPDATE/DELETE ... RETURNING needs SQLite 3.35+; older versions re-read in the same transaction
+    SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+    
+    # Bound parameters per statement when passing ID lists (SQLite's old default limit is 999)
+    MAX_SQL_PARAMS = 900
+    
+    # Characters of content kept in the stored preview column
+    PREVIEW_LENGTH = 150
+    
+    # notes.content holds plain TEXT, or a BLOB written by compress_content;
+    # SQL that needs the text wraps the column in this expression
+    PLAIN_CONTENT = "CASE WHEN typeof({0}) = 'blob' THEN wn_decompress({0}) ELSE {0} END"
+    
+    # Values accepted for content_compression
+    CONTENT_CODECS = ("none",) + tuple(MARKERS)
+    
+    # Substring match used when FTS5 is unavailable
+    LIKE_CONDITION = f"(title LIKE ? OR {PLAIN_CONTENT.format('content')} LIKE ? OR tags LIKE ?)"
+    
+    # Columns read for NoteSummary, in field order
+    SUMMARY_COLUMNS = ("id", "title", "preview", "tags", "category", "updated_at", "is_pinned")
+    
+    # Named storage profiles: PRAGMAs applied to every connection as it opens
+    STORAGE_PROFILES = {
+        # SQLite defaults: rollback journal, full fsync on every commit
+        "default": {},
+        # WAL lets readers run alongside the auto-save writer; NORMAL only
+        # fsyncs at checkpoints, which is still crash-safe in WAL mode
+        "balanced": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -16000,      # KiB (negative) -> 16 MB page cache
+            "mmap_size": 67108864,     # 64 MB memory-mapped reads
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+        "performance": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "cache_size": -65536,      # 64 MB page cache
+            "mmap_size": 268435456,    # 256 MB memory-mapped reads
+            "temp_store": "MEMORY",
+            "busy_timeout": 5000,
+        },
+    }
+    
+    # PRAGMAs that may be set through a profile or config overrides
+    ALLOWED_PRAGMAS = ("journal_mode", "synchronous", "cache_size", "mmap_size",
+                       "temp_store", "busy_timeout", "wal_autocheckpoint")
+    
+    # Versioned schema migrations, applied in order and tracked in PRAGMA user_version
+    SCHEMA_MIGRATIONS = (
+        (1, "_migration_001_list_indexes"),
+        (2, "_migration_002_note_tags"),
+        (3, "_migration_003_content_hash"),
+        (4, "_migration_004_note_revisions"),
+        (5, "_migration_005_fts_plain_content"),
+        (6, "_migration_006_revision_base_hash"),
+    )
+    
+    # A revision is stored in full at least every this many revisions, which
+    # bounds the deltas applied to rebuild one
+    REVISION_SNAPSHOT_INTERVAL = 20
+    
+    # Keyset definition per sort: ORDER BY clause, cursor columns, and the
+    # row-value comparison that selects rows after the cursor
+    SORT_KEYS = {
+        "updated": ("is_pinned DESC, updated_at DESC, id DESC", ("is_pinned", "updated_at", "id"), "<"),
+        "pinned": ("is_pinned DESC, updated_at DESC, id DESC", ("is_pinned", "updated_at", "id"), "<"),
+        "alphabetical": ("title ASC, id ASC", ("title", "id"), ">"),
+        "created": ("id ASC", ("id",), ">"),
+    }
+    
+    def __init__(self, db_path: str = "whiskernotes.db", storage_profile: str = "default",
+                 pragmas: Optional[Dict[str, Any]] = None, checkpoint_interval: int = 1000,
+                 keep_revisions: bool = True, revision_compression: bool = True,
+                 content_compression: Optional[str] = None, compression_threshold: int = 4096):
+        """
+        Initialize database connection
+        
+        Args:
+            db_path: Path to the SQLite database file
+            storage_profile: Name of an entry in STORAGE_PROFILES
+            pragmas: PRAGMA overrides applied on top of the profile
+            checkpoint_interval: Commits between passive WAL checkpoints (0 disables)
+            keep_revisions: Record the previous version of a note on every update;
+                updates without it still keep earlier revisions readable
+            revision_compression: zlib-compress stored revisions when it saves space
+            content_compression: Store note bodies of compression_threshold
+                characters or more compressed with "zlib" or "lzma"; None or
+                "none" stores plain text. Reads handle either format.
+            compression_threshold: Shortest body, in characters, worth compressing
+            
+        Raises:
+            DatabaseError: If the storage profile, a pragma or the compression is invalid
+        """
         self.db_path = db_path
+        self.pragmas = self._resolve_pragmas(storage_profile, pragmas or {})
+        self.checkpoint_interval = checkpoint_interval
+        self.keep_revisions = keep_revisions
+        self.revision_compression = revision_compression
+        if content_compression is not None and content_compression not in self.CONTENT_CODECS:
+            raise DatabaseError(f"Unknown content compression: {content_compression}")
+        self.content_compression = None if content_compression == "none" else content_compression
+        self.compression_threshold = compression_threshold
+        self._commits_since_checkpoint = 0
+        # Bumped after every committed write, so callers can tell cached reads are stale
+        self.write_version = 0
+        # Set by the full-text migration; False means search falls back to LIKE
+        self.fts_enabled = False
+        # One long-lived connection per thread, tracked so close() can release them all
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
         self.init_database()
     
-    def init_database(self):
-        """Create notes table if it doesn't exist"""
-        conn = sqlite3.connect(self.db_path)
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it on first use
+        
+        Returns:
+            SQLite connection owned by the current thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread is disabled only so close() can run from the
+            # shutdown thread; each connection is otherwise used by one thread
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            # Decodes compressed note bodies for search and the full-text index
+            register_sqlite_functions(conn)
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    @contextmanager
+    def _transaction(self, immediate: bool = False):
+        """
+        Run a block of statements in a single transaction
+        
+        Commits on success and rolls back if the block raises.
+        
+        Args:
+            immediate: Take the write lock up front (BEGIN IMMEDIATE) so
+                reads inside the block cannot be invalidated by other writers
+        
+        Yields:
+            Cursor on the current thread's connection
+        """
+        conn = self._get_connection()
         cursor = conn.cursor()
+        try:
+            with conn:
+                if immediate:
+                    cursor.execute("BEGIN IMMEDIATE")
+                yield cursor
+        finally:
+            cursor.close()
         
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS notes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_pinned INTEGER DEFAULT 0,
-                tags TEXT DEFAULT '',
-                category TEXT DEFAULT 'Personal',
-                word_count INTEGER DEFAULT 0
-            )
-        """)
+        self.write_version += 1
+        self._commits_since_checkpoint += 1
+        if self.checkpoint_interval and self._commits_since_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+    
+    @contextmanager
+    def _read_snapshot(self):
+        """
+        Run several SELECTs against one consistent state of the database
         
-        # Migrate existing tables to add new columns
-        self._migrate_database(cursor)
+        Yields:
+            Cursor inside a read transaction, rolled back afterwards
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            yield cursor
+        finally:
+            conn.rollback()
+            cursor.close()
+    
+    @contextmanager
+    def interruptible(self, should_stop: Callable[[], bool], check_every: int = 1000):
+        """
+        Abort queries on this thread's connection once should_stop() is true
         
-        conn.commit()
-        conn.close()
+        A progress handler polls should_stop every check_every SQLite VM
+        instructions; when it returns true the running statement fails with
+        sqlite3.OperationalError("interrupted"). Used to cancel searches
+        that have been superseded by newer input.
+        
+        Args:
+            should_stop: Polled while queries run
+            check_every: VM instructions between polls
+        """
+        conn = self._get_connection()
+        conn.set_progress_handler(lambda: 1 if should_stop() else 0, check_every)
+        try:
+            yield
+        finally:
+            conn.set_progress_handler(None, 0)
+    
+    @classmethod
+    def _resolve_pragmas(cls, storage_profile: str, overrides: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Merge a storage profile with PRAGMA overrides and validate the result
+        
+        Args:
+            storage_profile: Name of an entry in STORAGE_PROFILES
+            overrides: PRAGMA values that replace the profile's
+            
+        Returns:
+            PRAGMA name to value mapping
+            
+        Raises:
+            DatabaseError: If the profile, a PRAGMA name or a value is invalid
+        """
+        if storage_profile not in cls.STORAGE_PROFILES:
+            raise DatabaseError(f"Unknown storage profile: {storage_profile}")
+        
+        pragmas = dict(cls.STORAGE_PROFILES[storage_profile])
+        pragmas.update(overrides)
+        for name, value in pragmas.items():
+            if name not in cls.ALLOWED_PRAGMAS:
+                raise DatabaseError(f"Unsupported storage pragma: {name}")
+            if not cls.is_valid_pragma(name, value):
+                raise DatabaseError(f"Invalid value for pragma {name}: {value!r}")
+        return pragmas
+    
+    @classmethod
+    def is_valid_pragma(cls, name: str, value: Any) -> bool:
+        """
+        Check a PRAGMA override before it is applied to a connection
+        
+        Args:
+            name: PRAGMA name
+            value: PRAGMA value
+            
+        Returns:
+            True if the name is in ALLOWED_PRAGMAS and the value is safe to use
+        """
+        if name not in cls.ALLOWED_PRAGMAS or isinstance(value, bool):
+            return False
+        # Values are interpolated into PRAGMA statements, so only plain
+        # integers and keywords are accepted
+        return isinstance(value, int) or re.fullmatch(r"[A-Za-z_]+", str(value)) is not None
+    
+    @property
+    def journal_mode(self) -> str:
+        """Journal mode in effect for this database"""
+        return self._get_connection().execute("PRAGMA journal_mode").fetchone()[0]
+    
+    def checkpoint(self, mode: str = "PASSIVE"):
+        """
+        Copy WAL content back into the database file
+        
+        PASSIVE checkpoints never block readers or writers. A no-op outside WAL mode.
+        
+        Args:
+            mode: PASSIVE, FULL, RESTART or TRUNCATE
+        """
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise DatabaseError(f"Invalid checkpoint mode: {mode}")
+        
+        self._commits_since_checkpoint = 0
+        if str(self.pragmas.get("journal_mode", "")).upper() == "WAL":
+            self._get_connection().execute(f"PRAGMA wal_checkpoint({mode})")
+    
+    def close(self):
+        """Checkpoint the WAL and close every connection opened by this database"""
+        try:
+            self.checkpoint("TRUNCATE")
+        except sqlite3.Error:
+            pass  # another connection is busy; SQLite checkpoints on last close anyway
+        
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = []
+            self._local = threading.local()
+        
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def init_database(self):
+        """Create notes table if it doesn't exist"""
+        with self._transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS notes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    title TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    is_pinned INTEGER DEFAULT 0,
+                    tags TEXT DEFAULT '',
+                    category TEXT DEFAULT 'Personal',
+                    word_count INTEGER DEFAULT 0,
+                    preview TEXT DEFAULT '',
+                    content_hash TEXT
+                )
+            """)
+            
+            # Migrate existing tables to add new columns
+            self._migrate_database(cursor)
     
     def _migrate_database(self, cursor):
         """Add new columns to existing database if they don't exist"""
@@ -60,8 +382,256 @@ class Database:
         
         if 'word_count' not in columns:
             cursor.execute("ALTER TABLE notes ADD COLUMN word_count INTEGER DEFAULT 0")
+        
+        if 'preview' not in columns:
+            cursor.execute("ALTER TABLE notes ADD COLUMN preview TEXT DEFAULT ''")
+            # Backfill with the same truncation as _make_preview()
+            cursor.execute(
+                """UPDATE notes SET preview = CASE
+                       WHEN length(content) > ? THEN substr(content, 1, ?) || '...'
+                       ELSE content
+                   END""",
+                (self.PREVIEW_LENGTH, self.PREVIEW_LENGTH)
+            )
+        
+        self._migrate_full_text_search(cursor)
+        self._apply_schema_migrations(cursor)
+    
+    def _apply_schema_migrations(self, cursor):
+        """Run each versioned migration newer than the database's user_version"""
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        
+        for target_version, method_name in self.SCHEMA_MIGRATIONS:
+            if version < target_version:
+                getattr(self, method_name)(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(target_version)}")
+                version = target_version
+    
+    def _migration_001_list_indexes(self, cursor):
+        """Index the home-screen sort and filter paths"""
+        # Default/pinned order; trailing summary columns make list reads index-only
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notes_pinned_updated
+            ON notes(is_pinned, updated_at, id, title, tags, category, preview)
+        """)
+        # Category filter in default order, also covering the summary columns
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_notes_category_pinned_updated
+            ON notes(category, is_pinned, updated_at, id, title, tags, preview)
+        """)
+        # Alphabetical order
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_notes_title ON notes(title, id)")
+    
+    def _migration_002_note_tags(self, cursor):
+        """Move tags into an indexed join table, splitting existing tag strings"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS note_tags (
+                note_id INTEGER NOT NULL,
+                tag TEXT NOT NULL COLLATE NOCASE,
+                PRIMARY KEY (note_id, tag)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags(tag, note_id)")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS note_tags_ad AFTER DELETE ON notes BEGIN
+                DELETE FROM note_tags WHERE note_id = old.id;
+            END
+        """)
+        
+        cursor.execute("SELECT id, tags FROM notes WHERE tags != ''")
+        rows = [(note_id, tag) for note_id, tags in cursor.fetchall() for tag in self._split_tags(tags)]
+        cursor.executemany("INSERT OR IGNORE INTO note_tags (note_id, tag) VALUES (?, ?)", rows)
+    
+    def _migration_003_content_hash(self, cursor):
+        """Add the content_hash column used to skip unchanged saves, hashing existing notes"""
+        cursor.execute("PRAGMA table_info(notes)")
+        if "content_hash" not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE notes ADD COLUMN content_hash TEXT")
+        
+        rows = cursor.execute("SELECT id, title, content, tags, category FROM notes").fetchall()
+        cursor.executemany(
+            "UPDATE notes SET content_hash = ? WHERE id = ?",
+            [(note_hash(title, content, tags, category), note_id) for note_id, title, content, tags, category in rows]
+        )
+    
+    def _migration_004_note_revisions(self, cursor):
+        """Add the note_revisions table for version history"""
+        # data holds the content itself (is_snapshot = 1) or a delta that
+        # rebuilds it from the next newer version of the note
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS note_revisions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                note_id INTEGER NOT NULL,
+                saved_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                title TEXT NOT NULL,
+                tags TEXT DEFAULT '',
+                category TEXT DEFAULT 'Personal',
+                content_hash TEXT,
+                content_length INTEGER NOT NULL,
+                is_snapshot INTEGER NOT NULL,
+                compression TEXT,
+                data BLOB NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_note_revisions_note ON note_revisions(note_id, id)")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS note_revisions_ad AFTER DELETE ON notes BEGIN
+                DELETE FROM note_revisions WHERE note_id = old.id;
+            END
+        """)
+    
+    def _migration_005_fts_plain_content(self, cursor):
+        """Index the decompressed note text: rebuild a full-text index created over the raw notes table"""
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'")
+        row = cursor.fetchone()
+        if row is None or "notes_plain" in row[0]:
+            return
+        for trigger in ("notes_fts_ai", "notes_fts_ad", "notes_fts_au"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute("DROP TABLE notes_fts")
+        self._migrate_full_text_search(cursor)
+    
+    def _migration_006_revision_base_hash(self, cursor):
+        """Record which text each revision delta applies to"""
+        # NULL for snapshots, and for deltas written before this column existed
+        cursor.execute("PRAGMA table_info(note_revisions)")
+        if "base_hash" not in [column[1] for column in cursor.fetchall()]:
+            cursor.execute("ALTER TABLE note_revisions ADD COLUMN base_hash TEXT")
+    
+    @staticmethod
+    def _split_tags(tags: str) -> List[str]:
+        """
+        Split a comma-separated tag string into distinct tags
+        
+        Args:
+            tags: Comma-separated tags
+            
+        Returns:
+            Stripped, non-empty tags, de-duplicated case-insensitively
+        """
+        seen = set()
+        result = []
+        for tag in (tags or "").split(","):
+            tag = tag.strip()
+            if tag and tag.lower() not in seen:
+                seen.add(tag.lower())
+                result.append(tag)
+        return result
+    
+    def _write_tags(self, cursor, note_id: int, tags: str, replace: bool = False):
+        """
+        Store a note's tags in note_tags, inside the caller's transaction
+        
+        Args:
+            cursor: Cursor of the open transaction
+            note_id: ID of the note
+            tags: Comma-separated tags
+            replace: Remove the note's existing tags first
+        """
+        if replace:
+            cursor.execute("DELETE FROM note_tags WHERE note_id = ?", (note_id,))
+        cursor.executemany(
+            "INSERT OR IGNORE INTO note_tags (note_id, tag) VALUES (?, ?)",
+            [(note_id, tag) for tag in self._split_tags(tags)]
+        )
     
-    def create_note(self, title: str, content: str, tags: str = "", category: str = "Personal") -> int:
+    def _migrate_full_text_search(self, cursor):
+        """Create the FTS5 index and its sync triggers, backfilling existing notes"""
+        # The view and triggers only call wn_decompress when bodies may be
+        # compressed, so other SQLite clients can otherwise write to notes
+        decompress = self._needs_decompression(cursor)
+        content_sql = self.PLAIN_CONTENT if decompress else "{0}"
+        for kind, name in (("view", "notes_plain"), ("trigger", "notes_fts_ai"),
+                           ("trigger", "notes_fts_ad"), ("trigger", "notes_fts_au")):
+            cursor.execute("SELECT sql FROM sqlite_master WHERE type = ? AND name = ?", (kind, name))
+            row = cursor.fetchone()
+            if row and ("wn_decompress" in row[0]) != decompress:
+                cursor.execute(f"DROP {kind.upper()} {name}")
+        
+        # The index reads note text through this view, so compressed bodies
+        # are indexed (and snippets built) from their decompressed text
+        cursor.execute(f"""
+            CREATE VIEW IF NOT EXISTS notes_plain AS
+            SELECT id, title, {content_sql.format("content")} AS content, tags FROM notes
+        """)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'")
+        index_exists = cursor.fetchone() is not None
+        
+        if not index_exists:
+            try:
+                cursor.execute("""
+                    CREATE VIRTUAL TABLE notes_fts USING fts5(
+                        title, content, tags,
+                        content='notes_plain', content_rowid='id'
+                    )
+                """)
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5 - search_notes uses LIKE instead
+                self.fts_enabled = False
+                return
+        
+        # Keep the external-content index in sync with the notes table
+        old_content = content_sql.format("old.content")
+        new_content = content_sql.format("new.content")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN
+                INSERT INTO notes_fts(rowid, title, content, tags)
+                VALUES (new.id, new.title, {new_content}, new.tags);
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN
+                INSERT INTO notes_fts(notes_fts, rowid, title, content, tags)
+                VALUES ('delete', old.id, old.title, {old_content}, old.tags);
+            END
+        """)
+        # Only re-index when indexed columns change (not on pin toggles);
+        # replace the broader trigger created by earlier versions
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'notes_fts_au'")
+        row = cursor.fetchone()
+        if row and "UPDATE OF" not in row[0]:
+            cursor.execute("DROP TRIGGER notes_fts_au")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE OF title, content, tags ON notes BEGIN
+                INSERT INTO notes_fts(notes_fts, rowid, title, content, tags)
+                VALUES ('delete', old.id, old.title, {old_content}, old.tags);
+                INSERT INTO notes_fts(rowid, title, content, tags)
+                VALUES (new.id, new.title, {new_content}, new.tags);
+            END
+        """)
+        
+        if not index_exists:
+            # Backfill notes written before the index existed
+            cursor.execute("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')")
+        
+        self.fts_enabled = True
+    
+    def _needs_decompression(self, cursor) -> bool:
+        """
+        Check whether SQL reading note text must decode compressed bodies
+        
+        True while content compression is on, and after it is turned off
+        until no compressed body is left.
+        
+        Args:
+            cursor: Cursor of the open transaction
+            
+        Returns:
+            True if the full-text view and triggers must call wn_decompress
+        """
+        if self.content_compression is not None:
+            return True
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'view' AND name = 'notes_plain'")
+        row = cursor.fetchone()
+        if row is None or "wn_decompress" not in row[0]:
+            return False
+        cursor.execute("SELECT 1 FROM notes WHERE typeof(content) = 'blob' LIMIT 1")
+        return cursor.fetchone() is not None
+    
+    def create_note(self, title: str, content: str, tags: str = "", category: str = "Personal",
+                    word_count: Optional[int] = None) -> int:
         """
         Create a new note
         
@@ -70,25 +640,96 @@ class Database:
             content: Note content
             tags: Comma-separated tags
             category: Note category
+            word_count: Words in content, if already counted
             
         Returns:
             ID of the created note
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if word_count is None:
+            word_count = count_words(content)
         
-        word_count = len(content.split())
+        with self._transaction() as cursor:
+            cursor.execute(
+                """INSERT INTO notes (title, content, tags, category, word_count, preview, content_hash)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (title, self._encode_content(content), tags, category, word_count,
+                 self._make_preview(content), note_hash(title, content, tags, category))
+            )
+            note_id = cursor.lastrowid
+            self._write_tags(cursor, note_id, tags)
+            return note_id
+    
+    def create_notes(self, notes: List[Dict]) -> List[int]:
+        """
+        Create many notes in a single transaction
         
-        cursor.execute(
-            "INSERT INTO notes (title, content, tags, category, word_count) VALUES (?, ?, ?, ?, ?)",
-            (title, content, tags, category, word_count)
-        )
+        IDs are assigned up front under the write lock so that notes and
+        their tags can both be written with executemany.
         
-        note_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        Args:
+            notes: Note dictionaries with title, content and optionally tags,
+                category, is_pinned, created_at and updated_at
+            
+        Returns:
+            IDs of the created notes, in input order
+        """
+        if not notes:
+            return []
         
-        return note_id
+        with self._transaction(immediate=True) as cursor:
+            cursor.execute(
+                """SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'notes'), 0),
+                              COALESCE((SELECT MAX(id) FROM notes), 0))"""
+            )
+            first_id = cursor.fetchone()[0] + 1
+            note_ids = list(range(first_id, first_id + len(notes)))
+            
+            cursor.executemany(
+                """INSERT INTO notes (id, title, content, tags, category, word_count, preview,
+                                      content_hash, is_pinned, created_at, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?,
+                           COALESCE(?, CURRENT_TIMESTAMP), COALESCE(?, CURRENT_TIMESTAMP))""",
+                [
+                    (
+                        note_id, note["title"], self._encode_content(note["content"]), note.get("tags", ""),
+                        note.get("category", "Personal"), count_words(note["content"]),
+                        self._make_preview(note["content"]),
+                        note_hash(note["title"], note["content"], note.get("tags", ""),
+                                  note.get("category", "Personal")),
+                        1 if note.get("is_pinned") else 0,
+                        note.get("created_at"), note.get("updated_at"),
+                    )
+                    for note_id, note in zip(note_ids, notes)
+                ]
+            )
+            cursor.executemany(
+                "INSERT OR IGNORE INTO note_tags (note_id, tag) VALUES (?, ?)",
+                [
+                    (note_id, tag)
+                    for note_id, note in zip(note_ids, notes)
+                    for tag in self._split_tags(note.get("tags", ""))
+                ]
+            )
+        return note_ids
+    
+    @classmethod
+    def _make_preview(cls, content: str) -> str:
+        """Truncate content to the stored list-view preview"""
+        if len(content) > cls.PREVIEW_LENGTH:
+            return content[:cls.PREVIEW_LENGTH] + "..."
+        return content
+    
+    def _encode_content(self, content: str) -> Union[str, bytes]:
+        """Convert note content to its stored form, compressing it if configured"""
+        return compress_content(content, self.content_compression, self.compression_threshold)
+    
+    @staticmethod
+    def _note_row(row: sqlite3.Row) -> Dict:
+        """Convert a notes row to a dictionary, decompressing its content"""
+        note = dict(row)
+        if not isinstance(note.get("content", ""), str):
+            note["content"] = decompress_content(note["content"])
+        return note
     
     def get_all_notes(self, sort_by: str = "updated") -> List[Dict]:
         """
@@ -100,24 +741,165 @@ class Database:
         Returns:
             List of note dictionaries
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        order, _, _ = self._sort_key(sort_by)
+        cursor = self._get_connection().execute(f"SELECT * FROM notes ORDER BY {order}")
+        return [self._note_row(row) for row in cursor.fetchall()]
+    
+    def get_notes_page(self, sort_by: str = "updated", limit: int = 20, cursor: Optional[tuple] = None,
+                       category: Optional[str] = None, tag: Optional[str] = None) -> NotePage:
+        """
+        Get one page of notes using keyset pagination
+        
+        Pages are keyed on (is_pinned, updated_at, id) for the default sorts
+        and on (title, id) for alphabetical, so each page is an index range
+        read rather than an OFFSET scan.
         
-        if sort_by == "alphabetical":
-            order = "title ASC"
-        elif sort_by == "pinned":
-            order = "is_pinned DESC, updated_at DESC"
-        else:  # default to updated
-            order = "is_pinned DESC, updated_at DESC"
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            limit: Maximum number of notes in the page
+            cursor: next_cursor from the previous page, or None for the first page
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            NotePage with the notes and the cursor for the next page (None on the last page)
+        """
+        return self._list_page("*", None, sort_by, limit, cursor, category, tag)
+    
+    def get_note_summaries(self, sort_by: str = "updated", category: Optional[str] = None,
+                           tag: Optional[str] = None) -> List[NoteSummary]:
+        """
+        Get lightweight summaries of notes for list views
         
-        cursor.execute(f"SELECT * FROM notes ORDER BY {order}")
+        Reads only the stored preview, never the content body.
+        
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            List of NoteSummary records
+        """
+        order, _, _ = self._sort_key(sort_by)
+        conditions, params = self._filter_conditions(category, tag)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        cursor = self._summary_cursor()
+        cursor.execute(f"SELECT {', '.join(self.SUMMARY_COLUMNS)} FROM notes {where} ORDER BY {order}", params)
+        return cursor.fetchall()
+    
+    def get_note_summaries_page(self, sort_by: str = "updated", limit: int = 20, cursor: Optional[tuple] = None,
+                                category: Optional[str] = None, tag: Optional[str] = None) -> NotePage:
+        """
+        Get one page of note summaries using keyset pagination
+        
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            limit: Maximum number of notes in the page
+            cursor: next_cursor from the previous page, or None for the first page
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            NotePage of NoteSummary records and the cursor for the next page
+        """
+        columns = ", ".join(self.SUMMARY_COLUMNS)
+        return self._list_page(columns, self._summary_cursor(), sort_by, limit, cursor, category, tag)
+    
+    def _list_page(self, columns: str, db_cursor: Optional[sqlite3.Cursor], sort_by: str, limit: int,
+                   cursor: Optional[tuple], category: Optional[str], tag: Optional[str]) -> NotePage:
+        """Build and run a keyset page query over the notes table"""
+        order, key_columns, comparison = self._sort_key(sort_by)
+        conditions, params = self._filter_conditions(category, tag)
+        
+        if cursor is not None:
+            placeholders = ", ".join("?" for _ in key_columns)
+            conditions.append(f"({', '.join(key_columns)}) {comparison} ({placeholders})")
+            params.extend(cursor)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT {columns} FROM notes {where} ORDER BY {order}"
+        return self._fetch_page(sql, params, limit, key_columns, db_cursor)
+    
+    def _summary_cursor(self) -> sqlite3.Cursor:
+        """Get a cursor that builds NoteSummary records directly from rows"""
+        cursor = self._get_connection().cursor()
+        cursor.row_factory = lambda _cursor, row: NoteSummary(*row)
+        return cursor
+    
+    def iter_notes(self, sort_by: str = "updated", batch_size: int = 200,
+                   category: Optional[str] = None, tag: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Lazily stream notes page by page
+        
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            batch_size: Number of notes fetched per query
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Yields:
+            Note dictionaries in sort order
+        """
+        return self._iter_pages(
+            lambda cursor: self.get_notes_page(sort_by, batch_size, cursor, category, tag)
+        )
+    
+    def _sort_key(self, sort_by: str):
+        """Get the (ORDER BY, cursor columns, comparison) keyset for a sort method"""
+        return self.SORT_KEYS.get(sort_by, self.SORT_KEYS["updated"])
+    
+    def _filter_conditions(self, category: Optional[str], tag: Optional[str]):
+        """Build WHERE conditions and parameters for the optional list filters"""
+        conditions, params = [], []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if tag is not None:
+            conditions.append("id IN (SELECT note_id FROM note_tags WHERE tag = ?)")
+            params.append(tag.strip())
+        return conditions, params
+    
+    def _fetch_page(self, sql: str, params: list, limit: int, key_columns,
+                    db_cursor: Optional[sqlite3.Cursor] = None) -> NotePage:
+        """
+        Run a page query, fetching one extra row to detect whether more pages exist
         
-        rows = cursor.fetchall()
-        notes = [dict(row) for row in rows]
+        Args:
+            sql: Ordered SELECT without a LIMIT clause
+            params: Query parameters
+            limit: Page size
+            key_columns: Columns that make up the cursor
+            db_cursor: Cursor to run on (for NoteSummary rows), or None for dict rows
+            
+        Returns:
+            NotePage for the query
+        """
+        if db_cursor is None:
+            rows = self._get_connection().execute(f"{sql} LIMIT ?", (*params, limit + 1)).fetchall()
+            notes = [self._note_row(row) for row in rows[:limit]]
+            key = lambda note, column: note[column]
+        else:
+            rows = db_cursor.execute(f"{sql} LIMIT ?", (*params, limit + 1)).fetchall()
+            notes = rows[:limit]
+            key = getattr
         
-        conn.close()
-        return notes
+        next_cursor = None
+        if len(rows) > limit and notes:
+            next_cursor = tuple(key(notes[-1], column) for column in key_columns)
+        return NotePage(notes, next_cursor)
+    
+    @staticmethod
+    def _iter_pages(fetch_page: Callable[[Optional[tuple]], NotePage]) -> Iterator[Dict]:
+        """Yield notes from successive pages until the cursor runs out"""
+        cursor = None
+        while True:
+            page = fetch_page(cursor)
+            yield from page.notes
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
     
     def get_note(self, note_id: int) -> Optional[Dict]:
         """
@@ -129,126 +911,703 @@ class Database:
         Returns:
             Note dictionary or None if not found
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,))
+        cursor = self._get_connection().execute("SELECT * FROM notes WHERE id = ?", (note_id,))
         row = cursor.fetchone()
         
-        note = dict(row) if row else None
-        conn.close()
+        return self._note_row(row) if row else None
+    
+    def note_exists(self, note_id: int) -> bool:
+        """
+        Check if a note exists without reading its row
         
-        return note
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            True if the note exists
+        """
+        cursor = self._get_connection().execute("SELECT 1 FROM notes WHERE id = ?", (note_id,))
+        return cursor.fetchone() is not None
+    
+    def get_content_hash(self, note_id: int) -> Optional[str]:
+        """
+        Get the stored hash of a note's title, content, tags and category
+        
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            The hash, or None if the note does not exist
+        """
+        cursor = self._get_connection().execute("SELECT content_hash FROM notes WHERE id = ?", (note_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
     
-    def update_note(self, note_id: int, title: str, content: str, tags: str = "", category: str = "Personal") -> bool:
+    def update_note(self, note_id: int, title: str, content: str, tags: str = "",
+                    category: str = "Personal", content_hash: Optional[str] = None,
+                    word_count: Optional[int] = None) -> Optional[Dict]:
         """
         Update an existing note
         
+        The existence check, the write and reading back the new row are a
+        single UPDATE ... RETURNING statement.
+        
         Args:
             note_id: ID of the note
             title: New title
             content: New content
             tags: Comma-separated tags
             category: Note category
+            content_hash: note_hash() of the new fields, if already computed
+            word_count: Words in content, if already counted
             
         Returns:
-            True if updated successfully
+            The updated note, or None if it does not exist
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if word_count is None:
+            word_count = count_words(content)
+        if content_hash is None:
+            content_hash = note_hash(title, content, tags, category)
+        
+        # Reading the version being replaced and writing must not interleave
+        # with another writer, so take the write lock up front
+        with self._transaction(immediate=True) as cursor:
+            previous = None
+            if self.keep_revisions:
+                previous = cursor.execute(
+                    "SELECT id, title, content, tags, category, content_hash, updated_at FROM notes WHERE id = ?",
+                    (note_id,)
+                ).fetchone()
+            else:
+                # The newest revision may be a delta against the content this
+                # save replaces without recording it
+                self._snapshot_newest_revision(cursor, note_id)
+            
+            note = self._execute_returning(
+                cursor,
+                """UPDATE notes 
+                   SET title = ?, content = ?, tags = ?, category = ?, 
+                       word_count = ?, preview = ?, content_hash = ?, updated_at = CURRENT_TIMESTAMP 
+                   WHERE id = ?""",
+                (title, self._encode_content(content), tags, category, word_count, self._make_preview(content),
+                 content_hash, note_id),
+                note_id
+            )
+            if note is not None:
+                self._write_tags(cursor, note_id, tags, replace=True)
+                if previous is not None and previous["content_hash"] != content_hash:
+                    self._add_revision(cursor, self._note_row(previous), content)
+            return note
+    
+    def _add_revision(self, cursor: sqlite3.Cursor, previous: Dict, newer_content: str):
+        """
+        Store the version of a note that an update is replacing
         
-        word_count = len(content.split())
+        The revision is stored as a delta against the content replacing it,
+        unless it is due for a full snapshot or the delta would not be smaller.
         
+        Args:
+            cursor: Cursor inside the update's transaction
+            previous: The notes row before the update
+            newer_content: Content written by the update
+        """
+        content = previous["content"]
+        recent = cursor.execute(
+            "SELECT is_snapshot FROM note_revisions WHERE note_id = ? ORDER BY id DESC LIMIT ?",
+            (previous["id"], self.REVISION_SNAPSHOT_INTERVAL - 1)
+        ).fetchall()
+        deltas_in_chain = 0
+        for row in recent:
+            if row["is_snapshot"]:
+                break
+            deltas_in_chain += 1
+        
+        header = dict(previous, note_id=previous["id"], saved_at=previous["updated_at"])
+        is_snapshot = deltas_in_chain >= self.REVISION_SNAPSHOT_INTERVAL - 1
+        self._insert_revision(cursor, header, content, newer_content, is_snapshot)
+    
+    def _snapshot_newest_revision(self, cursor: sqlite3.Cursor, note_id: int):
+        """
+        Store a note's newest revision in full if it is a delta
+        
+        Called before an update that records no revision, which would
+        leave that delta without the text it applies to.
+        
+        Args:
+            cursor: Cursor inside the update's transaction
+            note_id: ID of the note
+        """
+        row = cursor.execute(
+            """SELECT id, is_snapshot, compression, data, base_hash
+               FROM note_revisions WHERE note_id = ? ORDER BY id DESC LIMIT 1""",
+            (note_id,)
+        ).fetchone()
+        if row is None or row["is_snapshot"]:
+            return
+        
+        note = cursor.execute("SELECT content FROM notes WHERE id = ?", (note_id,)).fetchone()
+        content = self._apply_revision(row, decompress_content(note["content"]) if note else None)
+        if content is None:
+            return  # already cut off from its base; get_revision reports it
+        data, compression = delta.encode(content, self.revision_compression)
         cursor.execute(
-            """UPDATE notes 
-               SET title = ?, content = ?, tags = ?, category = ?, 
-                   word_count = ?, updated_at = CURRENT_TIMESTAMP 
+            """UPDATE note_revisions SET is_snapshot = 1, compression = ?, data = ?, base_hash = NULL
                WHERE id = ?""",
-            (title, content, tags, category, word_count, note_id)
+            (compression, sqlite3.Binary(data), row["id"])
         )
+    
+    def _insert_revision(self, cursor: sqlite3.Cursor, header: Dict, content: str,
+                         newer_content: Optional[str], is_snapshot: bool):
+        """
+        Encode and insert one note_revisions row
+        
+        Args:
+            cursor: Cursor inside a write transaction
+            header: note_id, saved_at, title, tags, category and content_hash
+                of the revision, and its id if it is being re-inserted
+            content: Content of the revision
+            newer_content: Content of the next newer version, or None to
+                force a snapshot
+            is_snapshot: Store the content in full
+        """
+        payload = content
+        if not is_snapshot and newer_content is not None:
+            payload = delta.make_delta(newer_content, content)
+            if len(payload) >= len(content):
+                payload = content
+        is_snapshot = payload is content
         
-        updated = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        base_hash = None if is_snapshot else content_digest(newer_content)
         
-        return updated
+        data, compression = delta.encode(payload, self.revision_compression)
+        cursor.execute(
+            """INSERT INTO note_revisions (id, note_id, saved_at, title, tags, category, content_hash,
+                                           content_length, is_snapshot, compression, data, base_hash)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (header.get("revision_id"), header["note_id"], header["saved_at"], header["title"],
+             header["tags"], header["category"], header["content_hash"], len(content),
+             1 if is_snapshot else 0, compression, sqlite3.Binary(data), base_hash)
+        )
     
-    def delete_note(self, note_id: int) -> bool:
+    def get_revisions(self, note_id: int) -> List[Dict]:
         """
-        Delete a note
+        List a note's stored revisions, without their content
         
         Args:
             note_id: ID of the note
             
         Returns:
-            True if deleted successfully
+            Revision dictionaries, newest first; stored_size is the size in
+            bytes of the stored snapshot or delta
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._get_connection().execute(
+            """SELECT id, note_id, saved_at, created_at, title, tags, category, content_hash,
+                      content_length, is_snapshot, length(data) AS stored_size
+               FROM note_revisions WHERE note_id = ? ORDER BY id DESC""",
+            (note_id,)
+        )
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def get_revision(self, note_id: int, revision_id: int) -> Optional[Dict]:
+        """
+        Get one revision of a note, with its content rebuilt
+        
+        Deltas are applied from the nearest newer snapshot, or from the
+        note's current content, back to the requested revision; at most
+        REVISION_SNAPSHOT_INTERVAL - 1 of them.
         
-        cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        Args:
+            note_id: ID of the note
+            revision_id: ID of the revision
+            
+        Returns:
+            Revision dictionary including content, or None if not found
+            
+        Raises:
+            DatabaseError: If a delta in the chain no longer matches the text
+                it was made against, so the content cannot be rebuilt
+        """
+        with self._read_snapshot() as cursor:
+            cursor.execute(
+                """SELECT id, note_id, saved_at, created_at, title, tags, category, content_hash,
+                          content_length, is_snapshot, compression, data, base_hash
+                   FROM note_revisions WHERE note_id = ? AND id >= ? ORDER BY id""",
+                (note_id, revision_id)
+            )
+            chain = []
+            for row in cursor:
+                chain.append(row)
+                if row["is_snapshot"]:
+                    break
+            if not chain or chain[0]["id"] != revision_id:
+                return None
+            
+            if chain[-1]["is_snapshot"]:
+                content = None
+            else:
+                row = cursor.execute("SELECT content FROM notes WHERE id = ?", (note_id,)).fetchone()
+                if row is None:
+                    return None
+                content = decompress_content(row["content"])
+        
+        content = self._rebuild_content(chain, content)
+        if content is None:
+            raise DatabaseError(f"Revision {revision_id} of note {note_id} can no longer be rebuilt: "
+                                f"the note was changed without recording its history")
+        revision = dict(chain[0])
+        del revision["compression"], revision["data"], revision["base_hash"]
+        revision["content"] = content
+        return revision
+    
+    @classmethod
+    def _rebuild_content(cls, chain: List[sqlite3.Row], newest_content: Optional[str]) -> Optional[str]:
+        """
+        Apply a chain of revision rows, oldest first, from its newest end
+        
+        Args:
+            chain: Revision rows in ascending id order; the last is a snapshot
+                unless newest_content is given
+            newest_content: Content of the version newer than the chain
+            
+        Returns:
+            Content of the first (oldest) revision in the chain, or None if
+            a delta does not match the text it would be applied to
+        """
+        content = newest_content
+        for row in reversed(chain):
+            content = cls._apply_revision(row, content)
+        return content
+    
+    @staticmethod
+    def _apply_revision(row: sqlite3.Row, newer_content: Optional[str]) -> Optional[str]:
+        """
+        Rebuild the content of one revision row
+        
+        Args:
+            row: note_revisions row with is_snapshot, compression, data and base_hash
+            newer_content: Content of the next newer version, or None if
+                that could not be rebuilt
+            
+        Returns:
+            The revision's content, or None if it is a delta whose base is
+            missing or differs from the text it was made against
+        """
+        payload = delta.decode(row["data"], row["compression"])
+        if row["is_snapshot"]:
+            return payload
+        if newer_content is None:
+            return None
+        # Deltas written before base_hash existed cannot be checked
+        if row["base_hash"] is not None and row["base_hash"] != content_digest(newer_content):
+            return None
+        return delta.apply_delta(newer_content, payload)
+    
+    def compact_revisions(self, note_id: Optional[int] = None, keep_recent: int = 50,
+                          bucket_seconds: int = 3600, max_age_days: int = 90) -> Dict[str, int]:
+        """
+        Thin out old revisions and re-encode the ones kept
+        
+        The newest `keep_recent` revisions of a note are kept as they are.
+        Older ones are reduced to the newest revision per `bucket_seconds`
+        of saved_at, and those saved more than `max_age_days` ago are
+        dropped. Each note is compacted in its own transaction.
+        
+        Args:
+            note_id: Only compact this note, or all notes if None
+            keep_recent: Revisions per note that are never removed
+            bucket_seconds: Width of the time buckets for older revisions
+            max_age_days: Age after which older revisions are dropped (0 keeps all)
+            
+        Returns:
+            Counts: notes, removed, kept, bytes_before, bytes_after
+        """
+        if note_id is None:
+            cursor = self._get_connection().execute("SELECT DISTINCT note_id FROM note_revisions")
+            note_ids = [row["note_id"] for row in cursor.fetchall()]
+        else:
+            note_ids = [note_id]
+        
+        cutoff = None
+        if max_age_days:
+            # saved_at comes from CURRENT_TIMESTAMP, which is UTC
+            cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+            cutoff = cutoff.strftime("%Y-%m-%d %H:%M:%S")
+        
+        stats = {"notes": 0, "removed": 0, "kept": 0, "bytes_before": 0, "bytes_after": 0}
+        for current_id in note_ids:
+            with self._transaction(immediate=True) as cursor:
+                self._compact_note_revisions(cursor, current_id, keep_recent, bucket_seconds,
+                                             cutoff, stats)
+        return stats
+    
+    def _compact_note_revisions(self, cursor: sqlite3.Cursor, note_id: int, keep_recent: int,
+                                bucket_seconds: int, cutoff: Optional[str], stats: Dict[str, int]):
+        """Compact the revisions of one note inside a write transaction (see compact_revisions)"""
+        rows = cursor.execute(
+            """SELECT id, note_id, saved_at, title, tags, category, content_hash, is_snapshot,
+                      compression, data, base_hash
+               FROM note_revisions WHERE note_id = ? ORDER BY id DESC""",
+            (note_id,)
+        ).fetchall()
+        note = cursor.execute("SELECT content FROM notes WHERE id = ?", (note_id,)).fetchone()
+        if not rows or note is None:
+            return
+        
+        # Rebuild every version, newest first; revisions cut off from their
+        # base (content None) cannot be re-encoded and are dropped
+        versions = []
+        current_content = content = decompress_content(note["content"])
+        for row in rows:
+            content = self._apply_revision(row, content)
+            versions.append((row, content))
+        
+        kept = [(row, content) for row, content in versions[:keep_recent] if content is not None]
+        seen_buckets = set()
+        for row, content in versions[keep_recent:]:
+            if content is None:
+                continue
+            saved_at = row["saved_at"] or ""
+            if cutoff is not None and saved_at < cutoff:
+                continue
+            bucket = self._time_bucket(saved_at, bucket_seconds)
+            if bucket in seen_buckets:
+                continue
+            seen_buckets.add(bucket)
+            kept.append((row, content))
+        
+        stats["notes"] += 1
+        stats["bytes_before"] += sum(len(row["data"]) for row in rows)
+        if len(kept) == len(versions):
+            stats["kept"] += len(kept)
+            stats["bytes_after"] += sum(len(row["data"]) for row in rows)
+            return
+        
+        cursor.execute("DELETE FROM note_revisions WHERE note_id = ?", (note_id,))
+        newer_content = current_content
+        for position, (row, content) in enumerate(kept):
+            header = dict(row, revision_id=row["id"])
+            is_snapshot = (position + 1) % self.REVISION_SNAPSHOT_INTERVAL == 0
+            self._insert_revision(cursor, header, content, newer_content, is_snapshot)
+            newer_content = content
+        
+        stats["removed"] += len(versions) - len(kept)
+        stats["kept"] += len(kept)
+        stats["bytes_after"] += cursor.execute(
+            "SELECT COALESCE(SUM(length(data)), 0) FROM note_revisions WHERE note_id = ?", (note_id,)
+        ).fetchone()[0]
+    
+    @staticmethod
+    def _time_bucket(saved_at: str, bucket_seconds: int) -> int:
+        """Index of the time bucket a saved_at timestamp falls into"""
+        try:
+            moment = datetime.strptime(saved_at[:19], "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return -1
+        return int(moment.timestamp()) // max(bucket_seconds, 1)
+    
+    def delete_note(self, note_id: int) -> Optional[Dict]:
+        """
+        Delete a note
+        
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            The note as it was before deletion, or None if it did not exist
+        """
+        with self._transaction() as cursor:
+            return self._execute_returning(
+                cursor, "DELETE FROM notes WHERE id = ?", (note_id,), note_id, read_before=True
+            )
+    
+    def _execute_returning(self, cursor: sqlite3.Cursor, sql: str, params: tuple, note_id: int,
+                           read_before: bool = False) -> Optional[Dict]:
+        """
+        Run a single-note UPDATE or DELETE and return the affected row
         
-        deleted = cursor.rowcount > 0
-        conn.commit()
-        conn.close()
+        Args:
+            cursor: Cursor inside the caller's transaction
+            sql: Statement without a RETURNING clause
+            params: Statement parameters
+            note_id: ID of the affected note (used by the pre-3.35 fallback)
+            read_before: Fallback reads the row before the statement (for DELETE)
+            
+        Returns:
+            The row as a dictionary, or None if no note matched
+        """
+        if self.SUPPORTS_RETURNING:
+            cursor.execute(f"{sql} RETURNING *", params)
+            # Fetch everything so the statement is finished before the commit
+            rows = cursor.fetchall()
+            return self._note_row(rows[0]) if rows else None
         
-        return deleted
+        # Older SQLite: same result with a second statement in the same transaction
+        if read_before:
+            row = cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,)).fetchone()
+            cursor.execute(sql, params)
+            return self._note_row(row) if row else None
+        cursor.execute(sql, params)
+        if cursor.rowcount == 0:
+            return None
+        return self._note_row(cursor.execute("SELECT * FROM notes WHERE id = ?", (note_id,)).fetchone())
     
     def search_notes(self, query: str) -> List[Dict]:
         """
         Search notes by title, content, or tags
         
+        Uses the FTS5 index when available: every word in the query is
+        matched as a prefix, pinned notes come first, then results are
+        ranked by BM25. Each result carries a highlighted 'snippet'.
+        
         Args:
             query: Search query
             
         Returns:
             List of matching notes
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        match_query = self._build_match_query(query) if self.fts_enabled else None
+        if match_query is None:
+            return self._search_notes_like(query)
+        
+        sql, params = self._full_text_search_sql(match_query)
+        cursor = self._get_connection().execute(sql, params)
+        return [self._strip_rank(self._note_row(row)) for row in cursor.fetchall()]
+    
+    def search_note_summaries(self, query: str) -> List[NoteSummary]:
+        """
+        Search notes and return lightweight summaries
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            List of NoteSummary records; full-text results include a snippet
+        """
+        columns = ", ".join(f"notes.{column}" for column in self.SUMMARY_COLUMNS)
+        match_query = self._build_match_query(query) if self.fts_enabled else None
+        cursor = self._summary_cursor()
+        
+        if match_query is None:
+            search_pattern = f"%{query}%"
+            cursor.execute(
+                f"""SELECT {columns} FROM notes
+                    WHERE {self.LIKE_CONDITION}
+                    ORDER BY is_pinned DESC, updated_at DESC, id DESC""",
+                (search_pattern, search_pattern, search_pattern)
+            )
+            return cursor.fetchall()
+        
+        sql, params = self._full_text_search_sql(match_query, columns=columns)
+        # Drop the trailing rank column so rows line up with NoteSummary fields
+        cursor.row_factory = lambda _cursor, row: NoteSummary(*row[:-1])
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    
+    def search_notes_page(self, query: str, limit: int = 20, cursor: Optional[tuple] = None) -> NotePage:
+        """
+        Get one page of search results using keyset pagination
+        
+        Full-text results are keyed on (is_pinned, BM25 rank, id); the LIKE
+        fallback uses the default (is_pinned, updated_at, id) keyset.
+        
+        Args:
+            query: Search query
+            limit: Maximum number of notes in the page
+            cursor: next_cursor from the previous page, or None for the first page
+            
+        Returns:
+            NotePage with the matching notes and the cursor for the next page
+        """
+        match_query = self._build_match_query(query) if self.fts_enabled else None
+        if match_query is None:
+            order, key_columns, comparison = self._sort_key("updated")
+            search_pattern = f"%{query}%"
+            conditions = [self.LIKE_CONDITION]
+            params = [search_pattern, search_pattern, search_pattern]
+            if cursor is not None:
+                conditions.append(f"({', '.join(key_columns)}) {comparison} (?, ?, ?)")
+                params.extend(cursor)
+            sql = f"SELECT * FROM notes WHERE {' AND '.join(conditions)} ORDER BY {order}"
+            return self._fetch_page(sql, params, limit, key_columns)
+        
+        sql, params = self._full_text_search_sql(match_query, cursor)
+        page = self._fetch_page(sql, params, limit, ("is_pinned", "rank", "id"))
+        return NotePage([self._strip_rank(note) for note in page.notes], page.next_cursor)
+    
+    def iter_search_results(self, query: str, batch_size: int = 200) -> Iterator[Dict]:
+        """
+        Lazily stream search results page by page
+        
+        Args:
+            query: Search query
+            batch_size: Number of notes fetched per query
+            
+        Yields:
+            Matching note dictionaries in ranked order
+        """
+        return self._iter_pages(lambda cursor: self.search_notes_page(query, batch_size, cursor))
+    
+    def _full_text_search_sql(self, match_query: str, cursor: Optional[tuple] = None,
+                              columns: str = "notes.*"):
+        """
+        Build the ranked FTS5 search query
+        
+        Args:
+            match_query: FTS5 MATCH expression
+            cursor: Optional (is_pinned, rank, id) keyset cursor
+            columns: Note columns to select
+            
+        Returns:
+            (sql, params) tuple; rows end with a 'snippet' and a 'rank' column
+        """
+        open_marker, close_marker = self.SNIPPET_MARKERS
+        weights = ", ".join(str(weight) for weight in self.FTS_WEIGHTS)
+        rank = f"bm25(notes_fts, {weights})"
+        
+        conditions = ["notes_fts MATCH ?"]
+        params = [open_marker, close_marker, match_query]
+        if cursor is not None:
+            # Mixed sort directions, so the keyset is spelled out instead of a row value
+            conditions.append(
+                f"(notes.is_pinned < ? OR (notes.is_pinned = ? AND "
+                f"({rank} > ? OR ({rank} = ? AND notes.id > ?))))"
+            )
+            is_pinned, last_rank, last_id = cursor
+            params.extend([is_pinned, is_pinned, last_rank, last_rank, last_id])
+        
+        sql = f"""SELECT {columns}, snippet(notes_fts, -1, ?, ?, '...', 12) AS snippet, {rank} AS rank
+                  FROM notes_fts JOIN notes ON notes.id = notes_fts.rowid
+                  WHERE {' AND '.join(conditions)}
+                  ORDER BY notes.is_pinned DESC, rank ASC, notes.id ASC"""
+        return sql, params
+    
+    @staticmethod
+    def _strip_rank(note: Dict) -> Dict:
+        """Drop the internal ranking column from a search result"""
+        note.pop("rank", None)
+        return note
+    
+    def _search_notes_like(self, query: str) -> List[Dict]:
+        """
+        Substring search used when FTS5 is unavailable
         
+        Args:
+            query: Search query
+            
+        Returns:
+            List of matching notes
+        """
         search_pattern = f"%{query}%"
-        cursor.execute(
-            """SELECT * FROM notes 
-               WHERE title LIKE ? OR content LIKE ? OR tags LIKE ?
-               ORDER BY is_pinned DESC, updated_at DESC""",
+        cursor = self._get_connection().execute(
+            f"""SELECT * FROM notes 
+               WHERE {self.LIKE_CONDITION}
+               ORDER BY is_pinned DESC, updated_at DESC, id DESC""",
             (search_pattern, search_pattern, search_pattern)
         )
+        return [self._note_row(row) for row in cursor.fetchall()]
+    
+    def search_narrows(self, previous: str, query: str) -> bool:
+        """
+        Check whether every search match of `query` also matches `previous`
         
-        rows = cursor.fetchall()
-        notes = [dict(row) for row in rows]
+        True when the new query only extends the previous one: with
+        full-text search each earlier word is a prefix of the word in the
+        same position (more words only narrow further); with the LIKE
+        fallback the previous text is a substring of the new text.
         
-        conn.close()
-        return notes
+        Args:
+            previous: Earlier search query
+            query: New search query
+            
+        Returns:
+            True if the results of `query` are a subset of those of `previous`
+        """
+        if self.fts_enabled:
+            previous_words = re.findall(r"\w+", previous.lower())
+            words = re.findall(r"\w+", query.lower())
+            if previous_words and words:
+                return len(words) >= len(previous_words) and all(
+                    word.startswith(previous_word) for previous_word, word in zip(previous_words, words)
+                )
+            if previous_words or words:
+                return False
+        # LIKE only folds ASCII case
+        return previous.translate(self.ASCII_LOWER) in query.translate(self.ASCII_LOWER)
     
-    def toggle_pin(self, note_id: int) -> bool:
+    def match_note_ids(self, query: str, candidate_ids: Optional[List[int]] = None) -> set:
         """
-        Toggle pin status of a note
+        Get the IDs of notes matching a search query, without ranking or snippets
         
         Args:
-            note_id: ID of the note
+            query: Search query
+            candidate_ids: Only check these notes (used by the LIKE fallback;
+                the full-text index answers for all notes at the same cost)
             
         Returns:
-            True if toggled successfully
+            Set of matching note IDs
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        conn = self._get_connection()
+        match_query = self._build_match_query(query) if self.fts_enabled else None
+        if match_query is not None:
+            rows = conn.execute("SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?", (match_query,))
+            return {row[0] for row in rows}
         
-        # Get current pin status
-        cursor.execute("SELECT is_pinned FROM notes WHERE id = ?", (note_id,))
-        row = cursor.fetchone()
+        search_pattern = f"%{query}%"
+        condition = self.LIKE_CONDITION
+        if candidate_ids is None:
+            rows = conn.execute(f"SELECT id FROM notes WHERE {condition}", (search_pattern,) * 3)
+            return {row[0] for row in rows}
         
-        if row:
-            new_status = 0 if row[0] else 1
-            cursor.execute("UPDATE notes SET is_pinned = ? WHERE id = ?", (new_status, note_id))
-            conn.commit()
-            conn.close()
-            return True
+        matching = set()
+        for start in range(0, len(candidate_ids), self.MAX_SQL_PARAMS):
+            chunk = candidate_ids[start:start + self.MAX_SQL_PARAMS]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = conn.execute(
+                f"SELECT id FROM notes WHERE id IN ({placeholders}) AND {condition}",
+                (*chunk, search_pattern, search_pattern, search_pattern)
+            )
+            matching.update(row[0] for row in rows)
+        return matching
+    
+    @staticmethod
+    def _build_match_query(query: str) -> Optional[str]:
+        """
+        Turn free text into an FTS5 MATCH expression
+        
+        Each word becomes a quoted prefix term, so user input can never be
+        parsed as FTS5 syntax and "proj" matches "project".
         
-        conn.close()
-        return False
+        Args:
+            query: Free-text search query
+            
+        Returns:
+            MATCH expression, or None if the query has no searchable words
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return None
+        return " ".join(f'"{word}"*' for word in words)
+    
+    def toggle_pin(self, note_id: int) -> Optional[Dict]:
+        """
+        Toggle pin status of a note
+        
+        Flips the flag in one UPDATE ... RETURNING statement instead of
+        reading it first.
+        
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            The note with its new pin status, or None if it does not exist
+        """
+        with self._transaction() as cursor:
+            return self._execute_returning(
+                cursor,
+                "UPDATE notes SET is_pinned = CASE WHEN is_pinned THEN 0 ELSE 1 END WHERE id = ?",
+                (note_id,),
+                note_id
+            )
     
     def get_notes_by_category(self, category: str) -> List[Dict]:
         """
@@ -260,43 +1619,45 @@ class Database:
         Returns:
             List of notes in the category
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            "SELECT * FROM notes WHERE category = ? ORDER BY is_pinned DESC, updated_at DESC",
+        cursor = self._get_connection().execute(
+            "SELECT * FROM notes WHERE category = ? ORDER BY is_pinned DESC, updated_at DESC, id DESC",
             (category,)
         )
-        
-        rows = cursor.fetchall()
-        notes = [dict(row) for row in rows]
-        
-        conn.close()
-        return notes
+        return [self._note_row(row) for row in cursor.fetchall()]
     
     def get_notes_by_tag(self, tag: str) -> List[Dict]:
         """
         Get notes filtered by tag
         
+        Matches whole tags (case-insensitive) through the note_tags index,
+        so 'cat' does not match 'concatenate'.
+        
         Args:
             tag: Tag to filter by
             
         Returns:
             List of notes with the tag
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        search_pattern = f"%{tag}%"
-        cursor.execute(
-            "SELECT * FROM notes WHERE tags LIKE ? ORDER BY is_pinned DESC, updated_at DESC",
-            (search_pattern,)
+        cursor = self._get_connection().execute(
+            """SELECT notes.* FROM note_tags JOIN notes ON notes.id = note_tags.note_id
+               WHERE note_tags.tag = ?
+               ORDER BY notes.is_pinned DESC, notes.updated_at DESC, notes.id DESC""",
+            (tag.strip(),)
         )
+        return [self._note_row(row) for row in cursor.fetchall()]
+    
+    def get_tag_counts(self) -> Dict[str, int]:
+        """
+        Count notes per tag
         
-        rows = cursor.fetchall()
-        notes = [dict(row) for row in rows]
+        Aggregates over the note_tags index only; note rows are never read.
         
-        conn.close()
-        return notes
+        Returns:
+            Mapping of tag to note count, most used first
+        """
+        cursor = self._get_connection().execute(
+            """SELECT tag, COUNT(*) FROM note_tags
+               GROUP BY tag
+               ORDER BY COUNT(*) DESC, tag ASC"""
+        )
+        return {tag: count for tag, count in cursor.fetchall()}
@@ -93,6 +93,7 @@ def main():
     
     # Cleanup demo database
     import os
+    db.close()
     os.remove("demo_whiskernotes.db")
     print("\n🧹 Demo database cleaned up")
 
@@ -4,6 +4,15 @@ A cozy cat-themed notes application with Python backend
 Enhanced architecture with service layer
 """
 
+import time
+
+# Reference point for the startup marks; taken before the heavy imports
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import itertools
+import json
+import sys
 import customtkinter as ctk
 from database import Database
 from repository.note_repository import NoteRepository
@@ -11,18 +20,45 @@ from services.note_service import NoteService
 from services.config_service import ConfigService
 from themes import Theme, CAT_MESSAGES
 from ui.home import HomeScreen
-from ui.editor import EditorScreen
+from ui.assets import AssetCache
+from ui.save_queue import SaveQueue
 from utils.exceptions import ValidationError, NoteNotFoundError
-import os
+
+
+# How long --startup-probe waits for the first note list
+STARTUP_PROBE_TIMEOUT_MS = 15000
+
+# How often finished background saves are collected
+SAVE_POLL_MS = 50
+
+# How long the Tk thread waits for a note's queued save before deferring
+# the action that needs it to _poll_saves
+SAVE_WAIT_SECONDS = 0.1
+
+# Save queue key of the revision history compaction run after startup
+COMPACT_HISTORY_KEY = "compact-history"
 
 
 class WhiskerNotes(ctk.CTk):
     """Main application class for WhiskerNotes"""
     
-    def __init__(self):
-        """Initialize the application"""
+    def __init__(self, on_first_card=None):
+        """
+        Initialize the application
+        
+        Only the window shell is built here. Images are loaded once it has
+        painted, the first note list arrives from a background query after
+        the mainloop starts, and the editor is imported on first use.
+        
+        Args:
+            on_first_card: Called once the first note list is displayed
+        """
         super().__init__()
         
+        # Milliseconds since process start, for the startup benchmark
+        self.startup_marks = {}
+        self.on_first_card = on_first_card
+        
         # Load configuration
         self.config = ConfigService()
         
@@ -33,19 +69,23 @@ class WhiskerNotes(ctk.CTk):
         self.geometry(f"{width}x{height}")
         self.minsize(800, 600)
         
-        # Set window icon
-        icon_path = Theme.get_asset_path("app_icon.png")
-        if icon_path and os.path.exists(icon_path):
-            try:
-                self.iconphoto(True, ctk.CTkImage(light_image=self._load_image(icon_path)))
-            except:
-                pass  # Fallback if icon loading fails
+        # Decode the card and empty-state images while the window is built
+        AssetCache.preload(["app_icon.png", "paw_star_icon.png", "cat_reading.png"])
         
         # Initialize architecture layers
-        self.db = Database()
+        self.db = Database(**self.config.get_storage_settings())
         self.repository = NoteRepository(self.db)
         self.note_service = NoteService(self.repository)
         
+        # Editor saves are written on a worker thread; see save_note
+        self.save_queue = SaveQueue()
+        self._save_poll_id = None
+        self._draft_keys = itertools.count(1)
+        self._draft_key = None    # save queue key of the new note being edited
+        self._draft_ids = {}      # draft key -> note id, once the note is created
+        self._after_save_actions = []   # (note id, action) waiting for a queued save
+        self._closing = False     # set by on_close; stops the history compaction
+        
         # Set to light mode only
         ctk.set_appearance_mode("light")
         colors = Theme.get_colors()
@@ -61,13 +101,78 @@ class WhiskerNotes(ctk.CTk):
         self.home_screen = None
         self.editor_screen = None
         
+        # Release database connections when the window closes
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
         # Show home screen
         self.show_home_screen()
+        
+        self._mark("window_built")
+        self.after_idle(self._on_first_paint)
     
-    def _load_image(self, path):
-        """Load image from path (used only for small icons)"""
-        from PIL import Image
-        return Image.open(path)
+    def _mark(self, name: str):
+        """Record a startup mark, keeping only the first occurrence"""
+        self.startup_marks.setdefault(name, round((time.perf_counter() - _PROCESS_START) * 1000, 1))
+    
+    def _on_first_paint(self):
+        """Finish the deferred startup work once the window shell is on screen"""
+        self._mark("first_paint")
+        
+        # Set window icon (iconphoto needs a Tk PhotoImage, not a CTkImage)
+        icon_image = AssetCache.get_photo_image("app_icon.png")
+        if icon_image is not None:
+            self.iconphoto(True, icon_image)
+        
+        self.compact_history()
+    
+    def compact_history(self):
+        """Thin out old note revisions on the save worker, behind any queued saves"""
+        if self._closing:
+            return
+        keep_recent = self.config.get_int("revision_keep_recent", 50)
+        max_age_days = self.config.get_int("revision_max_age_days", 90)
+        
+        def compact():
+            # Runs on the save worker thread; on_close interrupts it at the
+            # next statement, and each note is compacted in its own transaction
+            with self.db.interruptible(lambda: self._closing):
+                return self.note_service.compact_history(keep_recent=keep_recent, max_age_days=max_age_days)
+        
+        self.save_queue.submit(COMPACT_HISTORY_KEY, compact)
+        self._schedule_save_poll()
+    
+    def _on_first_display(self):
+        """Record when the first note list was shown"""
+        self._mark("first_card")
+        if self.on_first_card:
+            self.on_first_card()
+    
+    def on_close(self):
+        """
+        Shut down cleanly
+        
+        The history compaction is dropped or interrupted and every pending
+        save is written first, then the window is destroyed (stopping
+        background queries) and the database closed. The window is gone by
+        then, so saves that failed are reported on stderr.
+        """
+        self._closing = True
+        if self.editor_screen:
+            self.editor_screen.auto_save()
+        self.save_queue.cancel(COMPACT_HISTORY_KEY)
+        if not self.save_queue.close():
+            # The worker is still writing; closing the database under it would lose the save
+            print("😿 Still saving notes, waiting for the writes to finish...", file=sys.stderr)
+            self.save_queue.close(timeout=None)
+        for result in self.save_queue.poll():
+            if result.error is not None and result.key != COMPACT_HISTORY_KEY:
+                print(f"😿 Error saving note: {result.error}", file=sys.stderr)
+        if self._save_poll_id:
+            self.after_cancel(self._save_poll_id)
+        self.destroy()
+        self.db.close()
+        # Write settings changed within the last debounce interval
+        self.config.flush()
     
     def show_home_screen(self):
         """Display the home screen"""
@@ -83,7 +188,8 @@ class WhiskerNotes(ctk.CTk):
                 on_edit_note=self.edit_note,
                 on_delete_note=self.delete_note,
                 on_toggle_pin=self.toggle_pin,
-                note_service=self.note_service
+                note_service=self.note_service,
+                on_first_display=self._on_first_display
             )
         
         colors = Theme.get_colors()
@@ -108,10 +214,14 @@ class WhiskerNotes(ctk.CTk):
         
         # Create or show editor screen
         if not self.editor_screen:
+            # Imported on first use to keep it off the startup path
+            from ui.editor import EditorScreen
             self.editor_screen = EditorScreen(
                 self,
                 on_save=self.save_note,
-                on_back=self.show_home_screen
+                on_back=self.show_home_screen,
+                auto_save_delay=self.config.get_int("auto_save_delay", 2000),
+                auto_save_max_latency=self.config.get_int("auto_save_max_latency", 10000)
             )
         
         colors = Theme.get_colors()
@@ -119,6 +229,9 @@ class WhiskerNotes(ctk.CTk):
         self.editor_screen.configure(fg_color=colors.get("bg", "#F5F0FF"))
         self.editor_screen.grid(row=0, column=0, sticky="nsew")
         
+        # A new note gets its own save queue key until its id is known
+        self._draft_key = None if note else ("new", next(self._draft_keys))
+        
         # Load note data
         self.editor_screen.load_note(note)
     
@@ -133,6 +246,11 @@ class WhiskerNotes(ctk.CTk):
         Args:
             note_id: ID of the note to edit
         """
+        # Don't load a version older than a save still in the queue
+        self._after_save(note_id, self._open_note)
+    
+    def _open_note(self, note_id: int):
+        """Load a note into the editor once no save of it is queued"""
         try:
             note = self.note_service.get_note(note_id)
             if note:
@@ -142,9 +260,15 @@ class WhiskerNotes(ctk.CTk):
         except Exception as e:
             self._show_error(f"Error loading note: {str(e)}")
     
-    def save_note(self, title: str, content: str, note_id: int = None, tags: str = "", category: str = "Personal"):
+    def save_note(self, title: str, content: str, note_id: int = None, tags: str = "", category: str = "Personal",
+                  word_count: int = None):
         """
-        Save a note (create or update)
+        Save a note (create or update) in the background
+        
+        The write is queued on the save queue, which keeps only the latest
+        pending save per note; _poll_saves reports the outcome. Saves of a
+        new note share one draft key, so whichever runs first creates the
+        note and the rest update it.
         
         Args:
             title: Note title
@@ -152,21 +276,110 @@ class WhiskerNotes(ctk.CTk):
             note_id: ID of existing note, or None for new note
             tags: Comma-separated tags
             category: Note category
+            word_count: Words in content as counted by the editor, or None
         """
-        try:
-            if note_id:
-                # Update existing note
-                self.note_service.update_note(note_id, title, content, tags, category)
+        key = note_id or self._draft_key
+        
+        def write():
+            # Runs on the save worker thread
+            target = note_id or self._draft_ids.get(key)
+            if target:
+                self.note_service.update_note(target, title, content, tags, category, word_count)
+                return target
+            self._draft_ids[key] = self.note_service.create_note(title, content, tags, category, word_count)
+            return self._draft_ids[key]
+        
+        self.save_queue.submit(key, write)
+        self._schedule_save_poll()
+    
+    def _after_save(self, note_id: int, action):
+        """
+        Run action(note_id) once no save of the note is queued
+        
+        Waits at most SAVE_WAIT_SECONDS on the Tk thread; if the save is
+        slower, or queued behind another write such as the history
+        compaction, _poll_saves runs the action once the save is done.
+        
+        Args:
+            note_id: ID of the note
+            action: Called with note_id
+        """
+        deadline = time.monotonic() + SAVE_WAIT_SECONDS
+        if all(self.save_queue.flush(key, timeout=max(deadline - time.monotonic(), 0))
+               for key in self._save_keys(note_id)):
+            action(note_id)
+            return
+        if (note_id, action) not in self._after_save_actions:
+            self._after_save_actions.append((note_id, action))
+        self._schedule_save_poll()
+    
+    def _save_keys(self, note_id: int) -> list:
+        """
+        Get the save queue keys that can hold a save of a note
+        
+        A new note keeps being saved under its draft key until _poll_saves
+        gives the editor its id, so waiting on the id alone would miss those.
+        
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            The note id and every draft key whose note it is
+        """
+        # _draft_ids is filled in on the save worker; copy it before iterating
+        drafts = list(self._draft_ids.items())
+        return [note_id] + [key for key, draft_id in drafts if draft_id == note_id]
+    
+    def _save_pending(self, note_id: int) -> bool:
+        """Check whether a save of a note is waiting or running under any of its keys"""
+        return any(self.save_queue.is_pending(key) for key in self._save_keys(note_id))
+    
+    def _schedule_save_poll(self):
+        """Start polling the save queue unless a poll is already scheduled"""
+        if not self._save_poll_id:
+            self._save_poll_id = self.after(SAVE_POLL_MS, self._poll_saves)
+    
+    def _poll_saves(self):
+        """Report finished background saves; reschedules itself while saves or deferred actions are pending"""
+        self._save_poll_id = None
+        results = self.save_queue.poll()
+        editor = self.editor_screen
+        
+        for result in results:
+            if result.key == COMPACT_HISTORY_KEY:
+                # Housekeeping; the notes themselves are unchanged
+                if result.error is not None:
+                    self._show_error(f"Error compacting note history: {str(result.error)}")
+                continue
+            # Result keys are note ids, or the draft key of a new note
+            is_current = editor is not None and result.key in (editor.current_note_id, self._draft_key)
+            if result.error is None:
+                if is_current and editor.current_note_id is None:
+                    # Update editor with new note ID
+                    editor.current_note_id = result.value
+                continue
+            if is_current:
+                # Keep the unsaved-changes prompt until a save succeeds
+                editor.mark_dirty()
+            if isinstance(result.error, ValidationError):
+                self._show_error(f"Validation error: {str(result.error)}")
             else:
-                # Create new note
-                new_id = self.note_service.create_note(title, content, tags, category)
-                # Update editor with new note ID
-                if self.editor_screen:
-                    self.editor_screen.current_note_id = new_id
-        except ValidationError as e:
-            self._show_error(f"Validation error: {str(e)}")
-        except Exception as e:
-            self._show_error(f"Error saving note: {str(e)}")
+                self._show_error(f"Error saving note: {str(result.error)}")
+        
+        saved = [result for result in results if result.error is None and result.key != COMPACT_HISTORY_KEY]
+        if saved and self.home_screen \
+                and self.home_screen.winfo_ismapped():
+            # The list may have been fetched before the save landed
+            self.refresh_notes()
+        
+        # Run the actions whose note has no save left in the queue
+        ready = [item for item in self._after_save_actions if not self._save_pending(item[0])]
+        self._after_save_actions = [item for item in self._after_save_actions if item not in ready]
+        for note_id, action in ready:
+            action(note_id)
+        
+        if self.save_queue.busy or self._after_save_actions:
+            self._schedule_save_poll()
     
     def delete_note(self, note_id: int):
         """
@@ -175,6 +388,10 @@ class WhiskerNotes(ctk.CTk):
         Args:
             note_id: ID of the note to delete
         """
+        self._after_save(note_id, self._delete_note)
+    
+    def _delete_note(self, note_id: int):
+        """Delete a note once no save of it is queued"""
         try:
             self.note_service.delete_note(note_id)
             self.refresh_notes()
@@ -192,13 +409,16 @@ class WhiskerNotes(ctk.CTk):
         Args:
             note_id: ID of the note to pin/unpin
         """
+        self._after_save(note_id, self._toggle_pin)
+    
+    def _toggle_pin(self, note_id: int):
+        """Toggle the pin of a note once no save of it is queued"""
         try:
-            self.note_service.toggle_pin(note_id)
+            note = self.note_service.toggle_pin(note_id)
             self.refresh_notes()
             if self.home_screen:
-                # Get current pin status to show appropriate message
-                note = self.note_service.get_note(note_id)
-                if note and note.get("is_pinned"):
+                # The toggle returns the new pin status
+                if note.get("is_pinned"):
                     self.home_screen.show_status(CAT_MESSAGES["note_pinned"])
                 else:
                     self.home_screen.show_status(CAT_MESSAGES["note_unpinned"])
@@ -207,19 +427,15 @@ class WhiskerNotes(ctk.CTk):
         except Exception as e:
             self._show_error(f"Error toggling pin: {str(e)}")
     
-    def refresh_notes(self, sort_by: str = "updated"):
+    def refresh_notes(self):
         """
         Refresh the notes display
         
-        Args:
-            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+        The home screen re-runs its current search, sort and category
+        filter in the background and updates only the changed cards.
         """
         if self.home_screen:
-            try:
-                notes = self.note_service.get_all_notes(sort_by=sort_by)
-                self.home_screen.display_notes(notes)
-            except Exception as e:
-                self._show_error(f"Error loading notes: {str(e)}")
+            self.home_screen.refresh_notes()
     
     def _show_error(self, message: str):
         """Show error message"""
@@ -230,10 +446,30 @@ class WhiskerNotes(ctk.CTk):
     
 
 
-def main():
-    """Main entry point"""
-    app = WhiskerNotes()
+def main(argv=None):
+    """
+    Main entry point
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:])
+    """
+    parser = argparse.ArgumentParser(description="WhiskerNotes - a cozy cat-themed notes app")
+    parser.add_argument("--startup-probe", action="store_true",
+                        help="Print startup timings as JSON once the first note list is shown, then exit")
+    args = parser.parse_args(argv)
+    
+    if not args.startup_probe:
+        app = WhiskerNotes()
+        app.mainloop()
+        return
+    
+    # Let the first card draw before reporting, and give up if it never shows
+    app = WhiskerNotes(on_first_card=lambda: app.after_idle(app.on_close))
+    app.after(STARTUP_PROBE_TIMEOUT_MS, app.on_close)
     app.mainloop()
+    print(json.dumps(app.startup_marks))
+    if "first_card" not in app.startup_marks:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
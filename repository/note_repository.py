@@ -3,23 +3,42 @@ WhiskerNotes - Note Repository
 Data access layer for note operations
 """
 
-from typing import List, Dict, Optional
-from database import Database
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Dict, Optional, Iterator
+from database import Database, NotePage, NoteSummary
 
 
 class NoteRepository:
-    """Repository for note data access"""
+    """
+    Repository for note data access
     
-    def __init__(self, database: Database):
+    Full notes read by ID are kept in a bounded LRU identity map, so
+    repeated reads of the same note skip SQLite. The map is maintained
+    write-through: updates and pin toggles cache the row returned by the
+    write and deletes evict it. Writes must go through this repository
+    for the cache to stay correct.
+    """
+    
+    def __init__(self, database: Database, cache_size: int = 256):
         """
         Initialize note repository
         
         Args:
             database: Database instance
+            cache_size: Maximum number of notes kept in the identity map (0 disables it)
         """
         self.db = database
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cache = OrderedDict()  # note id -> note dict, least recently used first
+        self._cache_lock = threading.Lock()
+        # Bumped on every eviction so a read racing a write cannot re-cache a stale row
+        self._cache_generation = 0
     
-    def create(self, title: str, content: str, tags: str = "", category: str = "Personal") -> int:
+    def create(self, title: str, content: str, tags: str = "", category: str = "Personal",
+               word_count: Optional[int] = None) -> int:
         """
         Create a new note
         
@@ -28,11 +47,24 @@ class NoteRepository:
             content: Note content
             tags: Comma-separated tags
             category: Note category
+            word_count: Words in content, if already counted
             
         Returns:
             ID of the created note
         """
-        return self.db.create_note(title, content, tags, category)
+        return self.db.create_note(title, content, tags, category, word_count)
+    
+    def create_many(self, notes: List[Dict]) -> List[int]:
+        """
+        Create many notes in one transaction
+        
+        Args:
+            notes: Note dictionaries
+            
+        Returns:
+            IDs of the created notes
+        """
+        return self.db.create_notes(notes)
     
     def get_by_id(self, note_id: int) -> Optional[Dict]:
         """
@@ -44,7 +76,67 @@ class NoteRepository:
         Returns:
             Note dictionary or None if not found
         """
-        return self.db.get_note(note_id)
+        with self._cache_lock:
+            note = self._cache.get(note_id)
+            if note is not None:
+                self._cache.move_to_end(note_id)
+                self.cache_hits += 1
+                return dict(note)
+            self.cache_misses += 1
+            generation = self._cache_generation
+        
+        note = self.db.get_note(note_id)
+        if note is not None:
+            self._store(note, generation)
+        return note
+    
+    def _store(self, note: Dict, generation: Optional[int] = None):
+        """
+        Put a note into the identity map
+        
+        Args:
+            note: Note row
+            generation: Cache generation observed before the row was read;
+                the row is discarded if a write happened since
+        """
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            if generation is not None and generation != self._cache_generation:
+                return
+            self._cache[note["id"]] = dict(note)
+            self._cache.move_to_end(note["id"])
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def _write_through(self, note_id: int, note: Optional[Dict]):
+        """Record the result of a write: cache the new row, or evict if there is none"""
+        with self._cache_lock:
+            self._cache.pop(note_id, None)
+            self._cache_generation += 1
+        if note is not None:
+            self._store(note)
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Get identity map statistics
+        
+        Returns:
+            Dictionary with hits, misses, size and capacity
+        """
+        with self._cache_lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "capacity": self.cache_size,
+            }
+    
+    def clear_cache(self):
+        """Empty the identity map, e.g. after writing to the database directly"""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_generation += 1
     
     def get_all(self, sort_by: str = "updated") -> List[Dict]:
         """
@@ -58,7 +150,74 @@ class NoteRepository:
         """
         return self.db.get_all_notes(sort_by)
     
-    def update(self, note_id: int, title: str, content: str, tags: str = "", category: str = "Personal") -> bool:
+    def get_page(self, sort_by: str = "updated", limit: int = 20, cursor: Optional[tuple] = None,
+                 category: Optional[str] = None, tag: Optional[str] = None) -> NotePage:
+        """
+        Get one page of notes
+        
+        Args:
+            sort_by: Sort method
+            limit: Maximum number of notes in the page
+            cursor: Cursor from the previous page, or None for the first page
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            NotePage with the notes and the next cursor
+        """
+        return self.db.get_notes_page(sort_by, limit, cursor, category, tag)
+    
+    def iter_all(self, sort_by: str = "updated", batch_size: int = 200,
+                 category: Optional[str] = None, tag: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Lazily stream notes
+        
+        Args:
+            sort_by: Sort method
+            batch_size: Number of notes fetched per query
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            Iterator over note dictionaries
+        """
+        return self.db.iter_notes(sort_by, batch_size, category, tag)
+    
+    def get_summaries(self, sort_by: str = "updated", category: Optional[str] = None,
+                      tag: Optional[str] = None) -> List[NoteSummary]:
+        """
+        Get lightweight note summaries for list views
+        
+        Args:
+            sort_by: Sort method
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            List of NoteSummary records
+        """
+        return self.db.get_note_summaries(sort_by, category, tag)
+    
+    def get_summaries_page(self, sort_by: str = "updated", limit: int = 20, cursor: Optional[tuple] = None,
+                           category: Optional[str] = None, tag: Optional[str] = None) -> NotePage:
+        """
+        Get one page of note summaries
+        
+        Args:
+            sort_by: Sort method
+            limit: Maximum number of notes in the page
+            cursor: Cursor from the previous page, or None for the first page
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            NotePage of NoteSummary records and the next cursor
+        """
+        return self.db.get_note_summaries_page(sort_by, limit, cursor, category, tag)
+    
+    def update(self, note_id: int, title: str, content: str, tags: str = "",
+               category: str = "Personal", content_hash: Optional[str] = None,
+               word_count: Optional[int] = None) -> Optional[Dict]:
         """
         Update a note
         
@@ -68,13 +227,20 @@ class NoteRepository:
             content: New content
             tags: Comma-separated tags
             category: Note category
+            content_hash: note_hash() of the new fields, if already computed
+            word_count: Words in content, if already counted
             
         Returns:
-            True if updated successfully
+            The updated note, or None if it does not exist
         """
-        return self.db.update_note(note_id, title, content, tags, category)
+        note = None
+        try:
+            note = self.db.update_note(note_id, title, content, tags, category, content_hash, word_count)
+            return note
+        finally:
+            self._write_through(note_id, note)
     
-    def delete(self, note_id: int) -> bool:
+    def delete(self, note_id: int) -> Optional[Dict]:
         """
         Delete a note
         
@@ -82,22 +248,93 @@ class NoteRepository:
             note_id: ID of the note
             
         Returns:
-            True if deleted successfully
+            The deleted note, or None if it did not exist
         """
-        return self.db.delete_note(note_id)
+        try:
+            return self.db.delete_note(note_id)
+        finally:
+            self._write_through(note_id, None)
     
     def exists(self, note_id: int) -> bool:
         """
         Check if a note exists
         
+        Answered from the identity map when the note is cached, otherwise
+        by a SELECT 1 probe that does not read the row.
+        
         Args:
             note_id: ID of the note
             
         Returns:
             True if note exists
         """
-        note = self.db.get_note(note_id)
-        return note is not None
+        with self._cache_lock:
+            if note_id in self._cache:
+                self.cache_hits += 1
+                return True
+            self.cache_misses += 1
+        return self.db.note_exists(note_id)
+    
+    def get_content_hash(self, note_id: int) -> Optional[str]:
+        """
+        Get the stored content hash of a note
+        
+        Answered from the identity map when the note is cached.
+        
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            The hash, or None if the note does not exist
+        """
+        with self._cache_lock:
+            note = self._cache.get(note_id)
+            if note is not None:
+                self.cache_hits += 1
+                return note.get("content_hash")
+            self.cache_misses += 1
+        return self.db.get_content_hash(note_id)
+    
+    def get_revisions(self, note_id: int) -> List[Dict]:
+        """
+        List the stored revisions of a note
+        
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            Revision dictionaries without content, newest first
+        """
+        return self.db.get_revisions(note_id)
+    
+    def get_revision(self, note_id: int, revision_id: int) -> Optional[Dict]:
+        """
+        Get one revision of a note, including its content
+        
+        Args:
+            note_id: ID of the note
+            revision_id: ID of the revision
+            
+        Returns:
+            Revision dictionary or None if not found
+        """
+        return self.db.get_revision(note_id, revision_id)
+    
+    def compact_revisions(self, note_id: Optional[int] = None, keep_recent: int = 50,
+                          bucket_seconds: int = 3600, max_age_days: int = 90) -> Dict[str, int]:
+        """
+        Thin out and re-encode old revisions
+        
+        Args:
+            note_id: Only compact this note, or all notes if None
+            keep_recent: Revisions per note that are never removed
+            bucket_seconds: Older revisions keep one per time bucket of this width
+            max_age_days: Age after which older revisions are dropped (0 keeps all)
+            
+        Returns:
+            Compaction counts
+        """
+        return self.db.compact_revisions(note_id, keep_recent, bucket_seconds, max_age_days)
     
     def search(self, query: str) -> List[Dict]:
         """
@@ -111,7 +348,46 @@ class NoteRepository:
         """
         return self.db.search_notes(query)
     
-    def toggle_pin(self, note_id: int) -> bool:
+    def search_summaries(self, query: str) -> List[NoteSummary]:
+        """
+        Search notes, returning lightweight summaries
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            List of matching NoteSummary records
+        """
+        return self.db.search_note_summaries(query)
+    
+    def search_page(self, query: str, limit: int = 20, cursor: Optional[tuple] = None) -> NotePage:
+        """
+        Get one page of search results
+        
+        Args:
+            query: Search query
+            limit: Maximum number of notes in the page
+            cursor: Cursor from the previous page, or None for the first page
+            
+        Returns:
+            NotePage with the matching notes and the next cursor
+        """
+        return self.db.search_notes_page(query, limit, cursor)
+    
+    def iter_search(self, query: str, batch_size: int = 200) -> Iterator[Dict]:
+        """
+        Lazily stream search results
+        
+        Args:
+            query: Search query
+            batch_size: Number of notes fetched per query
+            
+        Returns:
+            Iterator over matching note dictionaries
+        """
+        return self.db.iter_search_results(query, batch_size)
+    
+    def toggle_pin(self, note_id: int) -> Optional[Dict]:
         """
         Toggle pin status
         
@@ -119,9 +395,14 @@ class NoteRepository:
             note_id: ID of the note
             
         Returns:
-            True if toggled successfully
+            The note with its new pin status, or None if it does not exist
         """
-        return self.db.toggle_pin(note_id)
+        note = None
+        try:
+            note = self.db.toggle_pin(note_id)
+            return note
+        finally:
+            self._write_through(note_id, note)
     
     def get_by_category(self, category: str) -> List[Dict]:
         """
@@ -146,4 +427,59 @@ class NoteRepository:
             List of notes with the tag
         """
         return self.db.get_notes_by_tag(tag)
-
+    
+    def write_version(self) -> int:
+        """
+        Get the database write counter
+        
+        Returns:
+            Number that changes after every committed write
+        """
+        return self.db.write_version
+    
+    def search_narrows(self, previous: str, query: str) -> bool:
+        """
+        Check whether a query's results are a subset of an earlier query's
+        
+        Args:
+            previous: Earlier search query
+            query: New search query
+            
+        Returns:
+            True if `query` can only narrow the results of `previous`
+        """
+        return self.db.search_narrows(previous, query)
+    
+    def match_ids(self, query: str, candidate_ids: Optional[List[int]] = None) -> set:
+        """
+        Get the IDs of notes matching a search query
+        
+        Args:
+            query: Search query
+            candidate_ids: Optional notes to restrict the check to
+            
+        Returns:
+            Set of matching note IDs
+        """
+        return self.db.match_note_ids(query, candidate_ids)
+    
+    def get_tag_counts(self) -> Dict[str, int]:
+        """
+        Count notes per tag
+        
+        Returns:
+            Mapping of tag to note count
+        """
+        return self.db.get_tag_counts()
+    
+    def interruptible(self, should_stop: Callable[[], bool]):
+        """
+        Cancel queries on the calling thread once should_stop() is true
+        
+        Args:
+            should_stop: Polled while queries run
+            
+        Returns:
+            Context manager wrapping the cancellable queries
+        """
+        return self.db.interruptible(should_stop)
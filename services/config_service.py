@@ -3,16 +3,79 @@ WhiskerNotes - Configuration Service
 Manages application configuration and settings
 """
 
+import atexit
+import copy
 import json
 import os
-from typing import Dict, Any, Optional
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, Tuple
+from database import Database
+from utils.exceptions import ValidationError
 
 
 class ConfigService:
-    """Service for managing application configuration"""
+    """
+    Service for managing application configuration
+    
+    The config file is read once and kept in memory, so reading a setting
+    is a dict lookup. The file's mtime is checked at most every
+    STAT_INTERVAL seconds and the file is reloaded when it was edited
+    externally. Changes are coalesced: a burst of set_setting calls
+    results in one atomic write (temp file plus rename) WRITE_DELAY
+    seconds after the last one. Call flush() before exiting to write
+    pending changes immediately.
+    """
     
     CONFIG_FILE = "config.json"
     
+    # Setting -> (accepted types, default). Settings not listed are kept as-is.
+    SCHEMA: Dict[str, Tuple[tuple, Any]] = {
+        "theme": ((str,), "light"),
+        "accent_color": ((str,), "pink"),
+        "window_width": ((int,), 900),
+        "window_height": ((int,), 700),
+        "auto_save_delay": ((int,), 2000),
+        "auto_save_max_latency": ((int,), 10000),
+        "font_size": ((int,), 14),
+        "storage_profile": ((str,), "balanced"),
+        "storage_pragmas": ((dict,), {}),
+        "checkpoint_interval": ((int,), 1000),
+        "keep_revisions": ((bool,), True),
+        "revision_compression": ((bool,), True),
+        "revision_keep_recent": ((int,), 50),
+        "revision_max_age_days": ((int,), 90),
+        "content_compression": ((str,), "none"),
+        "compression_threshold": ((int,), 4096),
+    }
+    
+    # Settings whose values must also be accepted by Database, which would
+    # otherwise refuse to open and stop the app from starting
+    VALUE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+        "storage_profile": lambda value: value in Database.STORAGE_PROFILES,
+        "storage_pragmas": lambda value: all(Database.is_valid_pragma(name, pragma)
+                                             for name, pragma in value.items()),
+        "content_compression": lambda value: value in Database.CONTENT_CODECS,
+    }
+    
+    # Seconds between mtime checks for external edits
+    STAT_INTERVAL = 1.0
+    
+    # Seconds to wait after the last change before writing the file
+    WRITE_DELAY = 0.5
+    
+    _config: Optional[Dict[str, Any]] = None
+    _pending: Dict[str, Any] = {}      # changes not yet written to disk
+    _mtime: Optional[float] = None     # mtime of the file as last read or written
+    _checked_at = 0.0                  # time.monotonic() of the last mtime check
+    _write_timer: Optional[threading.Timer] = None
+    _lock = threading.RLock()
+    
+    # Counters for diagnostics and benchmarks
+    loads = 0
+    writes = 0
+    
     @classmethod
     def get_config_path(cls) -> str:
         """Get the path to the config file"""
@@ -20,48 +83,252 @@ class ConfigService:
         return os.path.join(base_path, cls.CONFIG_FILE)
     
     @classmethod
-    def load_config(cls) -> Dict[str, Any]:
-        """Load configuration from file or return defaults"""
-        config_path = cls.get_config_path()
+    def get_defaults(cls) -> Dict[str, Any]:
+        """Get the default configuration"""
+        return {key: copy.deepcopy(default) for key, (_, default) in cls.SCHEMA.items()}
+    
+    @classmethod
+    def validate(cls, config: Any) -> Dict[str, Any]:
+        """
+        Check a configuration against the schema
         
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError):
-                pass
+        Invalid values, including storage settings Database would reject,
+        fall back to their defaults, so a hand-edited file with a typo
+        cannot break startup.
         
-        # Return default configuration
-        return {
-            "theme": "light",
-            "accent_color": "pink",
-            "window_width": 900,
-            "window_height": 700,
-            "auto_save_delay": 2000,
-            "font_size": 14
-        }
+        Args:
+            config: Parsed configuration
+            
+        Returns:
+            Complete configuration with every schema setting present
+        """
+        validated = cls.get_defaults()
+        if not isinstance(config, dict):
+            return validated
+        for key, value in config.items():
+            if key not in cls.SCHEMA or cls._is_valid(key, value):
+                validated[key] = value
+        return validated
+    
+    @classmethod
+    def load_config(cls) -> Dict[str, Any]:
+        """Get a copy of the configuration, loading it on first use"""
+        with cls._lock:
+            return copy.deepcopy(cls._get_config())
+    
+    @classmethod
+    def reload(cls):
+        """Re-read the config file, keeping changes that are not yet written"""
+        with cls._lock:
+            cls._read_file()
     
     @classmethod
     def save_config(cls, config: Dict[str, Any]) -> bool:
-        """Save configuration to file"""
-        try:
-            config_path = cls.get_config_path()
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
-            return True
-        except IOError:
-            return False
+        """
+        Replace the whole configuration and write it immediately
+        
+        Args:
+            config: New configuration; invalid values fall back to defaults
+            
+        Returns:
+            True if the file was written
+        """
+        with cls._lock:
+            cls._config = cls.validate(config)
+            cls._pending = {}
+            return cls.flush(force=True)
     
     @classmethod
     def get_setting(cls, key: str, default: Any = None) -> Any:
         """Get a specific setting value"""
-        config = cls.load_config()
-        return config.get(key, default)
+        with cls._lock:
+            value = cls._get_config().get(key, default)
+        # Only containers need copying to protect the cache
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
     
     @classmethod
     def set_setting(cls, key: str, value: Any) -> bool:
-        """Set a specific setting value"""
-        config = cls.load_config()
-        config[key] = value
-        return cls.save_config(config)
+        """
+        Set a specific setting value
+        
+        The change is visible immediately and written to disk after
+        WRITE_DELAY seconds without further changes.
+        
+        Args:
+            key: Setting name
+            value: New value
+            
+        Returns:
+            True once the change is accepted
+            
+        Raises:
+            ValidationError: If the value has the wrong type or is not
+                accepted for the setting
+        """
+        if key in cls.SCHEMA and not cls._has_schema_type(key, value):
+            expected = " or ".join(t.__name__ for t in cls.SCHEMA[key][0])
+            raise ValidationError(f"Setting '{key}' must be {expected}")
+        if key in cls.VALUE_CHECKS and not cls.VALUE_CHECKS[key](value):
+            raise ValidationError(f"Setting '{key}' does not accept {value!r}")
+        
+        with cls._lock:
+            config = cls._get_config()
+            if key in config and config[key] == value:
+                return True
+            config[key] = copy.deepcopy(value)
+            cls._pending[key] = copy.deepcopy(value)
+            cls._schedule_write()
+        return True
+    
+    @classmethod
+    def get_int(cls, key: str, default: Optional[int] = None) -> Optional[int]:
+        """Get an integer setting, or default if it is missing or not an integer"""
+        value = cls.get_setting(key)
+        return value if isinstance(value, int) and not isinstance(value, bool) else default
+    
+    @classmethod
+    def get_str(cls, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a string setting, or default if it is missing or not a string"""
+        value = cls.get_setting(key)
+        return value if isinstance(value, str) else default
+    
+    @classmethod
+    def get_bool(cls, key: str, default: Optional[bool] = None) -> Optional[bool]:
+        """Get a boolean setting, or default if it is missing or not a boolean"""
+        value = cls.get_setting(key)
+        return value if isinstance(value, bool) else default
+    
+    @classmethod
+    def get_dict(cls, key: str, default: Optional[Dict] = None) -> Optional[Dict]:
+        """Get a copy of a dictionary setting, or default if it is missing or not a dictionary"""
+        value = cls.get_setting(key)
+        return value if isinstance(value, dict) else default
+    
+    @classmethod
+    def flush(cls, force: bool = False) -> bool:
+        """
+        Write pending changes now
+        
+        Args:
+            force: Write even if nothing changed
+            
+        Returns:
+            True if the file is up to date
+        """
+        with cls._lock:
+            if cls._write_timer is not None:
+                cls._write_timer.cancel()
+                cls._write_timer = None
+            if cls._config is None or not (cls._pending or force):
+                return True
+            if not cls._write_file(cls._config):
+                return False
+            cls._pending = {}
+            return True
+    
+    @classmethod
+    def get_storage_settings(cls) -> Dict[str, Any]:
+        """
+        Get the SQLite storage configuration
+        
+        Returns:
+            Keyword arguments for Database: storage_profile, pragmas,
+            checkpoint_interval, keep_revisions, revision_compression,
+            content_compression and compression_threshold
+        """
+        return {
+            "storage_profile": cls.get_str("storage_profile", "balanced"),
+            "pragmas": cls.get_dict("storage_pragmas", {}),
+            "checkpoint_interval": cls.get_int("checkpoint_interval", 1000),
+            "keep_revisions": cls.get_bool("keep_revisions", True),
+            "revision_compression": cls.get_bool("revision_compression", True),
+            "content_compression": cls.get_str("content_compression", "none"),
+            "compression_threshold": cls.get_int("compression_threshold", 4096),
+        }
+    
+    @classmethod
+    def _is_valid(cls, key: str, value: Any) -> bool:
+        """Check a value against the schema type of its setting and its VALUE_CHECKS entry"""
+        check = cls.VALUE_CHECKS.get(key)
+        return cls._has_schema_type(key, value) and (check is None or check(value))
+    
+    @classmethod
+    def _has_schema_type(cls, key: str, value: Any) -> bool:
+        """Check a value against the schema type of its setting"""
+        types = cls.SCHEMA[key][0]
+        # bool is an int subclass, but True is not a window width
+        if isinstance(value, bool) and bool not in types:
+            return False
+        return isinstance(value, types)
+    
+    @classmethod
+    def _get_config(cls) -> Dict[str, Any]:
+        """Get the cached configuration, reloading it if the file changed (lock held)"""
+        if cls._config is None:
+            cls._read_file()
+        elif time.monotonic() - cls._checked_at >= cls.STAT_INTERVAL:
+            if cls._file_mtime() != cls._mtime:
+                cls._read_file()
+        return cls._config
+    
+    @classmethod
+    def _file_mtime(cls) -> Optional[float]:
+        """Get the config file's mtime, or None if it does not exist"""
+        cls._checked_at = time.monotonic()
+        try:
+            return os.stat(cls.get_config_path()).st_mtime
+        except OSError:
+            return None
+    
+    @classmethod
+    def _read_file(cls):
+        """Load and validate the config file, then re-apply pending changes (lock held)"""
+        mtime = cls._file_mtime()
+        config = None
+        if mtime is not None:
+            try:
+                with open(cls.get_config_path(), 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+                
+        cls._config = cls.validate(config)
+        cls._config.update(copy.deepcopy(cls._pending))
+        cls._mtime = mtime
+        cls.loads += 1
+    
+    @classmethod
+    def _write_file(cls, config: Dict[str, Any]) -> bool:
+        """Atomically replace the config file (lock held)"""
+        config_path = cls.get_config_path()
+        fd, tmp_path = tempfile.mkstemp(prefix=".config-", suffix=".tmp",
+                                        dir=os.path.dirname(config_path))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, config_path)
+        except (IOError, OSError, TypeError, ValueError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+            
+        cls._mtime = cls._file_mtime()
+        cls.writes += 1
+        return True
+    
+    @classmethod
+    def _schedule_write(cls):
+        """Restart the debounce timer for the next write (lock held)"""
+        if cls._write_timer is not None:
+            cls._write_timer.cancel()
+        cls._write_timer = threading.Timer(cls.WRITE_DELAY, cls.flush)
+        cls._write_timer.daemon = True
+        cls._write_timer.start()
+
 
+# Don't lose a change made just before the interpreter exits
+atexit.register(ConfigService.flush)
@@ -3,10 +3,14 @@ WhiskerNotes - Note Service
 Business logic layer for note operations
 """
 
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Iterator, Iterable, TextIO, Union
+from database import NotePage, NoteSummary
 from repository.note_repository import NoteRepository
+from services.search_session import SearchSession
 from utils.validators import NoteValidator
+from utils.content_hash import note_hash
 from utils.exceptions import ValidationError, NoteNotFoundError
+from utils import note_io
 
 
 class NoteService:
@@ -21,8 +25,13 @@ class NoteService:
         """
         self.repository = repository
         self.validator = NoteValidator()
+        # Saves skipped because nothing changed, for diagnostics and benchmarks
+        self.skipped_writes = 0
+        # Refines the previous free-text search while a query is being typed
+        self.search_session = SearchSession(repository)
     
-    def create_note(self, title: str, content: str, tags: str = "", category: str = "Personal") -> int:
+    def create_note(self, title: str, content: str, tags: str = "", category: str = "Personal",
+                    word_count: Optional[int] = None) -> int:
         """
         Create a new note with validation
         
@@ -31,6 +40,8 @@ class NoteService:
             content: Note content
             tags: Comma-separated tags
             category: Note category
+            word_count: Words in content, e.g. from the editor's live count;
+                counted here when None
             
         Returns:
             ID of the created note
@@ -44,39 +55,126 @@ class NoteService:
         self.validator.validate_category(category)
         
         # Create note
-        return self.repository.create(title, content, tags, category)
+        return self.repository.create(title, content, tags, category, word_count)
     
-    def update_note(self, note_id: int, title: str, content: str, tags: str = "", category: str = "Personal") -> bool:
+    def import_notes(self, notes: Iterable[Dict], batch_size: int = 500) -> int:
+        """
+        Bulk-create notes from any iterable, e.g. note_io.read_jsonl()
+        
+        The input is consumed lazily and written in batches, one
+        transaction per batch. Each batch is validated before it is
+        written, so an invalid note stops the import with the notes of
+        earlier batches already saved.
+        
+        Args:
+            notes: Note dictionaries with title, content and optional
+                tags, category, is_pinned, created_at and updated_at
+            batch_size: Notes per transaction
+            
+        Returns:
+            Number of notes imported
+            
+        Raises:
+            ValidationError: If a note fails validation
+        """
+        self.validator.validate_page_size(batch_size)
+        
+        imported = 0
+        batch = []
+        for index, note in enumerate(notes, start=1):
+            batch.append(self._prepare_import(note, index))
+            if len(batch) >= batch_size:
+                imported += len(self.repository.create_many(batch))
+                batch = []
+        if batch:
+            imported += len(self.repository.create_many(batch))
+        return imported
+    
+    def _prepare_import(self, note: Dict, index: int) -> Dict:
+        """Fill defaults for an imported note and validate it"""
+        prepared = {
+            "title": note.get("title") or "Untitled Note",
+            "content": note.get("content") or "",
+            "tags": note.get("tags") or "",
+            "category": note.get("category") or "Personal",
+            "is_pinned": bool(note.get("is_pinned")),
+            "created_at": note.get("created_at"),
+            "updated_at": note.get("updated_at"),
+        }
+        try:
+            self.validator.validate_title(prepared["title"])
+            self.validator.validate_content(prepared["content"])
+            self.validator.validate_tags(prepared["tags"])
+            self.validator.validate_category(prepared["category"])
+        except ValidationError as e:
+            raise ValidationError(f"Note {index}: {e}")
+        return prepared
+    
+    def export_notes(self, target: Union[TextIO, str], fmt: str = "jsonl", batch_size: int = 500) -> int:
+        """
+        Stream every note out in ID order without loading them all at once
+        
+        Args:
+            target: Text stream for 'jsonl', or a directory path for 'markdown'
+            fmt: Export format - 'jsonl' or 'markdown'
+            batch_size: Notes fetched per query
+            
+        Returns:
+            Number of notes exported
+            
+        Raises:
+            ValidationError: If the format is unknown
+        """
+        notes = self.iter_notes(sort_by="created", batch_size=batch_size)
+        if fmt == "jsonl":
+            return note_io.write_jsonl(notes, target)
+        if fmt == "markdown":
+            return note_io.write_markdown_folder(notes, target)
+        raise ValidationError(f"Unknown export format: {fmt}")
+    
+    def update_note(self, note_id: int, title: str, content: str, tags: str = "",
+                    category: str = "Personal", word_count: Optional[int] = None) -> Dict:
         """
         Update an existing note
         
+        If title, content, tags and category hash the same as the stored
+        note, nothing is written and updated_at keeps its value.
+        
         Args:
             note_id: ID of the note
             title: New title
             content: New content
             tags: Comma-separated tags
             category: Note category
+            word_count: Words in content, e.g. from the editor's live count;
+                counted here when None
             
         Returns:
-            True if updated successfully
+            The updated (or unchanged) note
             
         Raises:
             ValidationError: If validation fails
             NoteNotFoundError: If note doesn't exist
         """
-        # Check if note exists
-        if not self.repository.exists(note_id):
-            raise NoteNotFoundError(f"Note with ID {note_id} not found")
-        
         # Validate inputs
         self.validator.validate_title(title)
         self.validator.validate_content(content)
         self.validator.validate_category(category)
         
-        # Update note
-        return self.repository.update(note_id, title, content, tags, category)
+        content_hash = note_hash(title, content, tags, category)
+        if self.repository.get_content_hash(note_id) == content_hash:
+            note = self.repository.get_by_id(note_id)
+            if note is not None:
+                self.skipped_writes += 1
+                return note
+        
+        # Update note; the write itself reports a missing note
+        note = self.repository.update(note_id, title, content, tags, category, content_hash, word_count)
+        if note is None:
+            raise NoteNotFoundError(f"Note with ID {note_id} not found")
+        return note
     
-    def delete_note(self, note_id: int) -> bool:
+    def delete_note(self, note_id: int) -> Dict:
         """
         Delete a note
         
@@ -84,15 +182,15 @@ class NoteService:
             note_id: ID of the note
             
         Returns:
-            True if deleted successfully
+            The deleted note
             
         Raises:
             NoteNotFoundError: If note doesn't exist
         """
-        if not self.repository.exists(note_id):
+        note = self.repository.delete(note_id)
+        if note is None:
             raise NoteNotFoundError(f"Note with ID {note_id} not found")
-        
-        return self.repository.delete(note_id)
+        return note
     
     def get_note(self, note_id: int) -> Optional[Dict]:
         """
@@ -106,6 +204,90 @@ class NoteService:
         """
         return self.repository.get_by_id(note_id)
     
+    def get_history(self, note_id: int) -> List[Dict]:
+        """
+        Get the revision history of a note
+        
+        Every save that changed the note recorded the version it replaced.
+        
+        Args:
+            note_id: ID of the note
+            
+        Returns:
+            Revision dictionaries without content, newest first
+            
+        Raises:
+            NoteNotFoundError: If note doesn't exist
+        """
+        if not self.repository.exists(note_id):
+            raise NoteNotFoundError(f"Note with ID {note_id} not found")
+        return self.repository.get_revisions(note_id)
+    
+    def get_revision(self, note_id: int, revision_id: int) -> Dict:
+        """
+        Get one revision of a note, including its content
+        
+        Args:
+            note_id: ID of the note
+            revision_id: ID of the revision, from get_history
+            
+        Returns:
+            Revision dictionary
+            
+        Raises:
+            NoteNotFoundError: If the note or the revision doesn't exist
+        """
+        revision = self.repository.get_revision(note_id, revision_id)
+        if revision is None:
+            raise NoteNotFoundError(f"Revision {revision_id} of note {note_id} not found")
+        return revision
+    
+    def restore_revision(self, note_id: int, revision_id: int) -> Dict:
+        """
+        Restore a note to one of its revisions
+        
+        The restore is a regular update, so the version it replaces is
+        recorded in the history and can be restored in turn.
+        
+        Args:
+            note_id: ID of the note
+            revision_id: ID of the revision, from get_history
+            
+        Returns:
+            The restored note
+            
+        Raises:
+            NoteNotFoundError: If the note or the revision doesn't exist
+        """
+        revision = self.get_revision(note_id, revision_id)
+        return self.update_note(note_id, revision["title"], revision["content"],
+                                revision["tags"], revision["category"])
+    
+    def compact_history(self, note_id: Optional[int] = None, keep_recent: int = 50,
+                        bucket_seconds: int = 3600, max_age_days: int = 90) -> Dict[str, int]:
+        """
+        Thin out old revisions to bound the size of the history
+        
+        The newest `keep_recent` revisions of each note are kept; older ones
+        are reduced to one per `bucket_seconds` and dropped after
+        `max_age_days`.
+        
+        Args:
+            note_id: Only compact this note, or all notes if None
+            keep_recent: Revisions per note that are never removed
+            bucket_seconds: Width of the time buckets for older revisions
+            max_age_days: Age after which older revisions are dropped (0 keeps all)
+            
+        Returns:
+            Counts: notes, removed, kept, bytes_before, bytes_after
+            
+        Raises:
+            ValidationError: If a limit is negative
+        """
+        if keep_recent < 0 or bucket_seconds < 1 or max_age_days < 0:
+            raise ValidationError("Revision retention limits must not be negative")
+        return self.repository.compact_revisions(note_id, keep_recent, bucket_seconds, max_age_days)
+    
     def get_all_notes(self, sort_by: str = "updated") -> List[Dict]:
         """
         Get all notes
@@ -118,10 +300,92 @@ class NoteService:
         """
         return self.repository.get_all(sort_by)
     
+    def get_note_summaries(self, sort_by: str = "updated", category: Optional[str] = None,
+                           tag: Optional[str] = None) -> List[NoteSummary]:
+        """
+        Get lightweight note summaries for list views
+        
+        Summaries carry a stored preview instead of the content body; load
+        the full note with get_note() when it is opened.
+        
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            List of NoteSummary records
+        """
+        return self.repository.get_summaries(sort_by, category, tag)
+    
+    def get_note_summaries_page(self, sort_by: str = "updated", limit: int = 20, cursor: Optional[tuple] = None,
+                                category: Optional[str] = None, tag: Optional[str] = None) -> NotePage:
+        """
+        Get one page of note summaries
+        
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            limit: Maximum number of notes in the page
+            cursor: next_cursor from the previous page, or None for the first page
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            NotePage of NoteSummary records and the cursor for the next page
+            
+        Raises:
+            ValidationError: If the page size is invalid
+        """
+        self.validator.validate_page_size(limit)
+        return self.repository.get_summaries_page(sort_by, limit, cursor, category, tag)
+    
+    def get_notes_page(self, sort_by: str = "updated", limit: int = 20, cursor: Optional[tuple] = None,
+                       category: Optional[str] = None, tag: Optional[str] = None) -> NotePage:
+        """
+        Get one page of notes
+        
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            limit: Maximum number of notes in the page
+            cursor: next_cursor from the previous page, or None for the first page
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            NotePage with the notes and the cursor for the next page
+            
+        Raises:
+            ValidationError: If the page size is invalid
+        """
+        self.validator.validate_page_size(limit)
+        return self.repository.get_page(sort_by, limit, cursor, category, tag)
+    
+    def iter_notes(self, sort_by: str = "updated", batch_size: int = 200,
+                   category: Optional[str] = None, tag: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Lazily stream notes without loading the whole table
+        
+        Args:
+            sort_by: Sort method - 'updated', 'alphabetical', or 'pinned'
+            batch_size: Number of notes fetched per query
+            category: Only include notes in this category
+            tag: Only include notes with this tag
+            
+        Returns:
+            Iterator over note dictionaries
+            
+        Raises:
+            ValidationError: If the batch size is invalid
+        """
+        self.validator.validate_page_size(batch_size)
+        return self.repository.iter_all(sort_by, batch_size, category, tag)
+    
     def search_notes(self, query: str) -> List[Dict]:
         """
         Search notes
         
+        A query of the form '#tag' is an exact tag lookup.
+        
         Args:
             query: Search query
             
@@ -131,9 +395,86 @@ class NoteService:
         if not query or not query.strip():
             return self.get_all_notes()
         
+        tag = self._parse_tag_query(query)
+        if tag:
+            return self.repository.get_by_tag(tag)
+        
         return self.repository.search(query.strip())
     
-    def toggle_pin(self, note_id: int) -> bool:
+    def search_note_summaries(self, query: str) -> List[NoteSummary]:
+        """
+        Search notes, returning lightweight summaries
+        
+        A query of the form '#tag' is an exact tag lookup. Free-text
+        queries go through the search session, so extending the previous
+        query narrows its results in memory.
+        
+        Args:
+            query: Search query
+            
+        Returns:
+            List of matching NoteSummary records
+        """
+        if not query or not query.strip():
+            self.search_session.reset()
+            return self.get_note_summaries()
+        
+        tag = self._parse_tag_query(query)
+        if tag:
+            return self.repository.get_summaries(tag=tag)
+        
+        return self.search_session.search(query.strip())
+    
+    @staticmethod
+    def _parse_tag_query(query: str) -> Optional[str]:
+        """Return the tag for a '#tag' query, or None for a free-text query"""
+        query = query.strip()
+        if query.startswith("#") and len(query) > 1 and "," not in query:
+            return query[1:].strip()
+        return None
+    
+    def search_notes_page(self, query: str, limit: int = 20, cursor: Optional[tuple] = None) -> NotePage:
+        """
+        Get one page of search results
+        
+        Args:
+            query: Search query
+            limit: Maximum number of notes in the page
+            cursor: next_cursor from the previous page, or None for the first page
+            
+        Returns:
+            NotePage with the matching notes and the cursor for the next page
+            
+        Raises:
+            ValidationError: If the page size is invalid
+        """
+        if not query or not query.strip():
+            return self.get_notes_page(limit=limit, cursor=cursor)
+        
+        self.validator.validate_page_size(limit)
+        return self.repository.search_page(query.strip(), limit, cursor)
+    
+    def iter_search_results(self, query: str, batch_size: int = 200) -> Iterator[Dict]:
+        """
+        Lazily stream search results
+        
+        Args:
+            query: Search query
+            batch_size: Number of notes fetched per query
+            
+        Returns:
+            Iterator over matching note dictionaries
+            
+        Raises:
+            ValidationError: If the batch size is invalid
+        """
+        if not query or not query.strip():
+            return self.iter_notes(batch_size=batch_size)
+        
+        self.validator.validate_page_size(batch_size)
+        return self.repository.iter_search(query.strip(), batch_size)
+    
+    def toggle_pin(self, note_id: int) -> Dict:
         """
         Toggle pin status of a note
         
@@ -141,15 +482,15 @@ class NoteService:
             note_id: ID of the note
             
         Returns:
-            True if toggled successfully
+            The note with its new pin status
             
         Raises:
             NoteNotFoundError: If note doesn't exist
         """
-        if not self.repository.exists(note_id):
+        note = self.repository.toggle_pin(note_id)
+        if note is None:
             raise NoteNotFoundError(f"Note with ID {note_id} not found")
-        
-        return self.repository.toggle_pin(note_id)
+        return note
     
     def get_notes_by_category(self, category: str) -> List[Dict]:
         """
@@ -174,4 +515,35 @@ class NoteService:
             List of notes with the tag
         """
         return self.repository.get_by_tag(tag)
-
+    
+    def get_tag_counts(self) -> Dict[str, int]:
+        """
+        Get the number of notes using each tag, e.g. for a tag cloud
+        
+        Returns:
+            Mapping of tag to note count, most used first
+        """
+        return self.repository.get_tag_counts()
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get note cache statistics
+        
+        Returns:
+            Dictionary with hits, misses, size and capacity of the repository's identity map
+        """
+        return self.repository.cache_stats()
+    
+    def interruptible(self, should_stop: Callable[[], bool]):
+        """
+        Cancel queries on the calling thread once should_stop() is true
+        
+        Queries aborted this way raise sqlite3.OperationalError.
+        
+        Args:
+            should_stop: Polled while queries run
+            
+        Returns:
+            Context manager wrapping the cancellable queries
+        """
+        return self.repository.interruptible(should_stop)
@@ -0,0 +1,78 @@
+"""
+WhiskerNotes - Search Session
+Narrows the previous search results in memory while a query is being typed
+"""
+
+import threading
+from typing import List, Optional
+from database import NoteSummary
+from repository.note_repository import NoteRepository
+
+
+class SearchSession:
+    """
+    Remembers the last search so extended queries can refine it
+
+    When a query only extends the previous one ("pro" -> "proj"), its
+    results must be a subset of the previous results. Instead of running
+    the ranked search again, the session asks the database for the bare
+    set of matching IDs (no ranking, snippets or row reads) and filters the
+    cached summaries in memory. Ranking order and snippets are carried over
+    from the query that last went to the database.
+
+    Broadened or unrelated queries, and any committed write since the
+    results were cached, fall back to a full database search.
+    """
+
+    def __init__(self, repository: NoteRepository):
+        """
+        Initialize an empty session
+
+        Args:
+            repository: Note repository instance
+        """
+        self.repository = repository
+        self._lock = threading.Lock()
+        self._query: Optional[str] = None
+        self._results: List[NoteSummary] = []
+        self._write_version = None
+
+        # How queries were answered, for benchmarks and diagnostics
+        self.narrowed_searches = 0
+        self.full_searches = 0
+
+    def search(self, query: str) -> List[NoteSummary]:
+        """
+        Search notes, refining the previous results when possible
+
+        Args:
+            query: Free-text search query
+
+        Returns:
+            List of matching NoteSummary records
+        """
+        with self._lock:
+            previous, results, write_version = self._query, self._results, self._write_version
+
+        # Read the counter before querying: a write that lands mid-query leaves
+        # the cached results tagged as stale
+        current_version = self.repository.write_version()
+
+        if (previous is not None and write_version == current_version
+                and self.repository.search_narrows(previous, query)):
+            if query != previous:
+                matching = self.repository.match_ids(query, [note.id for note in results])
+                results = [note for note in results if note.id in matching]
+            self.narrowed_searches += 1
+        else:
+            results = self.repository.search_summaries(query)
+            self.full_searches += 1
+
+        with self._lock:
+            self._query, self._results, self._write_version = query, results, current_version
+        return list(results)
+
+    def reset(self):
+        """Forget the cached results"""
+        with self._lock:
+            self._query, self._results, self._write_version = None, [], None
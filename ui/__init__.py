@@ -1,9 +1,20 @@
 """
 WhiskerNotes UI Package
 Contains home and editor screen components
-"""
 
-from .home import HomeScreen
-from .editor import EditorScreen
+Screens are imported on first access (PEP 562), so Tk-free helpers such as
+ui.recycler, ui.search_worker, ui.save_queue and ui.autosave can be
+used without a display or customtkinter installed.
+"""
 
 __all__ = ['HomeScreen', 'EditorScreen']
+
+
+def __getattr__(name):
+    if name == 'HomeScreen':
+        from .home import HomeScreen
+        return HomeScreen
+    if name == 'EditorScreen':
+        from .editor import EditorScreen
+        return EditorScreen
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,179 @@
+"""
+WhiskerNotes - Asset Cache
+Decodes each image asset once and shares sized CTkImages across screens
+"""
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+import customtkinter as ctk
+
+from themes import Theme
+
+if TYPE_CHECKING:
+    # Pillow is imported on first use so it stays off the startup path
+    from PIL import Image, ImageTk
+
+
+class AssetCache:
+    """
+    Process-wide cache for image assets
+
+    Decoded PIL images are kept for the lifetime of the app (the asset set
+    is small and fixed). CTkImage instances are cached per (asset, size)
+    in a bounded LRU, so every card showing the same icon shares one
+    image object. Assets that are missing or fail to decode are cached as
+    None, so callers fall back to their emoji once instead of retrying.
+    """
+
+    # Maximum number of sized CTkImage instances kept
+    MAX_IMAGES = 64
+
+    _decoded: Dict[str, Optional["Image.Image"]] = {}
+    _images = OrderedDict()  # (asset name, size) -> CTkImage, least recently used first
+    _photo_images: Dict[str, "ImageTk.PhotoImage"] = {}
+    _lock = threading.Lock()
+
+    # Counters for diagnostics and benchmarks
+    decodes = 0
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get_pil_image(cls, asset_name: str) -> Optional["Image.Image"]:
+        """
+        Get a decoded asset, opening the file only on first use
+
+        Safe to call from any thread.
+
+        Args:
+            asset_name: File name, resolved with Theme.get_asset_path
+
+        Returns:
+            Decoded PIL image, or None if the asset is missing or unreadable
+        """
+        with cls._lock:
+            if asset_name in cls._decoded:
+                return cls._decoded[asset_name]
+
+            from PIL import Image
+
+            image = None
+            path = Theme.get_asset_path(asset_name)
+            if path:
+                try:
+                    image = Image.open(path)
+                    image.load()  # decode now; Image.open is lazy and keeps the file open
+                    cls.decodes += 1
+                except (OSError, ValueError):
+                    image = None
+            cls._decoded[asset_name] = image
+            return image
+
+    @classmethod
+    def get_image(cls, asset_name: str, size: Tuple[int, int]) -> Optional[ctk.CTkImage]:
+        """
+        Get a shared CTkImage of an asset at a display size
+
+        Call from the Tk main thread.
+
+        Args:
+            asset_name: File name, resolved with Theme.get_asset_path
+            size: (width, height) in CustomTkinter scaling units
+
+        Returns:
+            Cached CTkImage, or None if the asset is missing or unreadable
+        """
+        key = (asset_name, tuple(size))
+        with cls._lock:
+            image = cls._images.get(key)
+            if image is not None:
+                cls._images.move_to_end(key)
+                cls.hits += 1
+                return image
+            cls.misses += 1
+
+        pil_image = cls.get_pil_image(asset_name)
+        if pil_image is None:
+            return None
+
+        image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=key[1])
+        with cls._lock:
+            cls._images[key] = image
+            while len(cls._images) > cls.MAX_IMAGES:
+                cls._images.popitem(last=False)
+        return image
+
+    @classmethod
+    def get_photo_image(cls, asset_name: str) -> Optional["ImageTk.PhotoImage"]:
+        """
+        Get a Tk PhotoImage of an asset, e.g. for the window icon
+
+        Call from the Tk main thread after the root window exists.
+
+        Args:
+            asset_name: File name, resolved with Theme.get_asset_path
+
+        Returns:
+            Cached PhotoImage, or None if the asset is missing or unreadable
+        """
+        if asset_name not in cls._photo_images:
+            pil_image = cls.get_pil_image(asset_name)
+            if pil_image is None:
+                return None
+            from PIL import ImageTk
+            cls._photo_images[asset_name] = ImageTk.PhotoImage(pil_image)
+        return cls._photo_images[asset_name]
+
+    @classmethod
+    def preload(cls, asset_names: Iterable[str], background: bool = True) -> Optional[threading.Thread]:
+        """
+        Decode assets ahead of first use
+
+        Only decoding happens here; CTkImages are still created on the main
+        thread when first requested.
+
+        Args:
+            asset_names: Assets to decode
+            background: Decode on a daemon thread instead of blocking
+
+        Returns:
+            The preload thread, or None when run in the foreground
+        """
+        asset_names = list(asset_names)
+
+        def decode_all():
+            for asset_name in asset_names:
+                cls.get_pil_image(asset_name)
+
+        if not background:
+            decode_all()
+            return None
+        thread = threading.Thread(target=decode_all, name="whiskernotes-assets", daemon=True)
+        thread.start()
+        return thread
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with decodes, hits, misses and cached image count
+        """
+        with cls._lock:
+            return {
+                "decodes": cls.decodes,
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "images": len(cls._images),
+            }
+
+    @classmethod
+    def clear(cls):
+        """Drop every cached image"""
+        with cls._lock:
+            cls._decoded.clear()
+            cls._images.clear()
+            cls._photo_images.clear()
@@ -0,0 +1,183 @@
+"""
+WhiskerNotes - Auto-Save Scheduler
+Decides when the editor saves: after an idle pause, or at the latest after a ceiling
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+from utils.content_hash import note_hash
+
+
+class AutoSaveScheduler:
+    """
+    Idle debounce with a maximum-latency bound
+
+    A save is due once no change has been made for `delay_ms`, or once
+    `max_latency_ms` have passed since the first unsaved change, whichever
+    comes first, so continuous typing still saves periodically. A change
+    only records its time; at most one timer is pending, and when it fires
+    early (typing went on) it is re-armed for the new due time. Keystrokes
+    therefore never cancel and reschedule timers.
+
+    When a save is due, the payload (title, content, tags, category) is
+    collected and hashed with note_hash, the hash stored in
+    notes.content_hash; if it matches the last saved payload the save is
+    skipped.
+
+    The scheduler knows nothing about Tk: timers are created through the
+    schedule/cancel callables, e.g. a widget's after and after_cancel.
+    """
+
+    def __init__(self, schedule: Callable[[int, Callable[[], None]], Any], cancel: Callable[[Any], None],
+                 collect: Callable[[], Optional[Sequence[str]]], save: Callable[[Sequence[str]], None],
+                 delay_ms: int = 2000, max_latency_ms: int = 10000,
+                 on_unchanged: Optional[Callable[[], None]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the scheduler
+
+        Args:
+            schedule: Runs a callback after a delay in milliseconds and
+                returns a handle, e.g. widget.after
+            cancel: Cancels a handle returned by schedule
+            collect: Returns the payload to save, or None if there is
+                nothing that can be saved yet
+            save: Saves a payload
+            delay_ms: Idle time after the last change before saving
+            max_latency_ms: Longest time a change may stay unsaved while
+                changes keep coming
+            on_unchanged: Called when a due save is skipped because the
+                payload matches the last save
+            clock: Monotonic clock in seconds
+        """
+        self.schedule = schedule
+        self.cancel_timer = cancel
+        self.collect = collect
+        self.save = save
+        self.delay_ms = delay_ms
+        self.max_latency_ms = max(max_latency_ms, delay_ms)
+        self.on_unchanged = on_unchanged
+        self.clock = clock
+
+        self._job = None
+        self._first_change: Optional[float] = None   # first unsaved change
+        self._last_change: Optional[float] = None
+        self._saved_hash: Optional[str] = None
+
+        # Counters for diagnostics and benchmarks
+        self.changes = 0
+        self.saves_issued = 0
+        self.saves_skipped = 0
+        self.timer_rearms = 0
+
+    @property
+    def pending(self) -> bool:
+        """Whether a change is waiting to be saved"""
+        return self._first_change is not None
+
+    @staticmethod
+    def fingerprint(payload: Sequence[str]) -> str:
+        """Hash a (title, content, tags, category) save payload"""
+        return note_hash(*payload)
+
+    def is_saved(self, payload: Sequence[str]) -> bool:
+        """Check whether a payload matches the last save or loaded baseline"""
+        return self.fingerprint(payload) == self._saved_hash
+
+    def touch(self):
+        """Record a change; call on every edit"""
+        now = self.clock()
+        self.changes += 1
+        self._last_change = now
+        if self._first_change is None:
+            self._first_change = now
+        if self._job is None:
+            self._arm(now)
+
+    def flush(self) -> bool:
+        """
+        Save a pending change now
+
+        Returns:
+            True if a save was issued
+        """
+        if not self.pending:
+            return False
+        self._stop_timer()
+        return self._save_due()
+
+    def reset(self, payload: Optional[Sequence[str]] = None):
+        """
+        Drop pending changes and start from a new baseline, e.g. after loading a note
+
+        Args:
+            payload: What is stored now, or None if nothing is
+        """
+        self._stop_timer()
+        self._first_change = self._last_change = None
+        self._saved_hash = self.fingerprint(payload) if payload is not None else None
+
+    def mark_saved(self, payload: Sequence[str]):
+        """Record a save made outside the scheduler, e.g. an explicit save"""
+        self.reset(payload)
+
+    def invalidate(self):
+        """Forget the last saved hash, e.g. after a save failed, so the next due save is issued"""
+        self._saved_hash = None
+
+    def stats(self) -> Dict[str, int]:
+        """Get the scheduler counters"""
+        return {
+            "changes": self.changes,
+            "saves_issued": self.saves_issued,
+            "saves_skipped": self.saves_skipped,
+            "timer_rearms": self.timer_rearms,
+        }
+
+    def _due_at(self) -> float:
+        """Clock time at which the pending change must be saved"""
+        return min(self._last_change + self.delay_ms / 1000,
+                   self._first_change + self.max_latency_ms / 1000)
+
+    def _arm(self, now: float):
+        """Start the timer for the current due time"""
+        delay = max(int(round((self._due_at() - now) * 1000)), 1)
+        self._job = self.schedule(delay, self._on_timer)
+
+    def _stop_timer(self):
+        """Cancel the pending timer, if any"""
+        if self._job is not None:
+            self.cancel_timer(self._job)
+            self._job = None
+
+    def _on_timer(self):
+        """Save if due, otherwise wait for the new due time"""
+        self._job = None
+        if not self.pending:
+            return
+        now = self.clock()
+        # Timers have millisecond resolution
+        if now + 0.0005 < self._due_at():
+            self.timer_rearms += 1
+            self._arm(now)
+            return
+        self._save_due()
+
+    def _save_due(self) -> bool:
+        """Save the collected payload unless it is unchanged"""
+        self._first_change = self._last_change = None
+        payload = self.collect()
+        if payload is None:
+            return False
+
+        payload_hash = self.fingerprint(payload)
+        if payload_hash == self._saved_hash:
+            self.saves_skipped += 1
+            if self.on_unchanged:
+                self.on_unchanged()
+            return False
+
+        self.save(payload)
+        self._saved_hash = payload_hash
+        self.saves_issued += 1
+        return True
@@ -6,23 +6,37 @@ Note editor with auto-save functionality and formatting toolbar
 import customtkinter as ctk
 from typing import Callable, Optional, Dict
 from themes import Theme, CAT_MESSAGES, RANDOM_CAT_MESSAGES
+from ui.autosave import AutoSaveScheduler
+from utils.text_stats import TextStats
 import random
-from PIL import Image
 import os
+import time
 import tkinter.messagebox as messagebox
 
 
 class EditorScreen(ctk.CTkFrame):
     """Note editor screen with rich formatting"""
     
-    def __init__(self, parent, on_save: Callable, on_back: Callable):
+    # Notes longer than this are inserted progressively by load_note
+    PROGRESSIVE_LOAD_CHARS = 20000
+    
+    # Characters inserted up front (about a screenful), then per idle callback
+    FIRST_CHUNK_CHARS = 4000
+    LOAD_CHUNK_CHARS = 16000
+    
+    def __init__(self, parent, on_save: Callable, on_back: Callable,
+                 auto_save_delay: int = 2000, auto_save_max_latency: int = 10000):
         """
         Initialize editor screen
         
         Args:
             parent: Parent widget
-            on_save: Callback for saving note (receives title, content, note_id, tags, category)
+            on_save: Callback for saving note (receives title, content, note_id, tags, category
+                and the word_count keyword); the save may complete in the background
             on_back: Callback for going back to home
+            auto_save_delay: Milliseconds without typing before auto-saving
+            auto_save_max_latency: Longest time in milliseconds an edit stays
+                unsaved while typing continues
         """
         super().__init__(parent)
         
@@ -31,8 +45,32 @@ class EditorScreen(ctk.CTkFrame):
         self.current_note_id = None
         self.current_tags = ""
         self.current_category = "Personal"
-        self.auto_save_job = None
-        self._is_dirty = False  # track unsaved changes
+        
+        # Decides when to auto-save and remembers the hash of the last save,
+        # which has_unsaved_changes() compares against; see ui/autosave.py
+        self.auto_saver = AutoSaveScheduler(
+            schedule=self.after,
+            cancel=self.after_cancel,
+            collect=self._collect_auto_save,
+            save=self._auto_save_payload,
+            delay_ms=auto_save_delay,
+            max_latency_ms=auto_save_max_latency
+        )
+        
+        # Live counts of the content box, updated by _on_text_command
+        self.text_stats = TextStats()
+        self._text_command = None
+        self._stats_label_job = None
+        
+        # Progressive loading of long notes; see _insert_content
+        self._loading = False
+        self._load_generation = 0
+        self._load_job = None
+        self._load_content = ""
+        self._load_offset = 0
+        self._load_started = 0.0
+        self._edited_while_loading = False
+        self.load_stats: Dict[str, float] = {}
 
         self.setup_ui()
     
@@ -166,6 +204,7 @@ class EditorScreen(ctk.CTkFrame):
             wrap="word"
         )
         self.content_text.grid(row=4, column=0, sticky="nsew", padx=spacing["lg"], pady=spacing["md"])
+        self._watch_content_edits()
         # Initialize placeholder text similar to search bar behavior
         self._set_content_placeholder()
         self.content_text.bind("<KeyRelease>", self.on_content_change)
@@ -289,6 +328,15 @@ class EditorScreen(ctk.CTkFrame):
         bottom_frame.grid(row=6, column=0, sticky="ew", padx=spacing["lg"], pady=(0, spacing["md"]))
         bottom_frame.grid_columnconfigure(0, weight=1)
         
+        # Live word and character count
+        self.stats_label = ctk.CTkLabel(
+            bottom_frame,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=colors["fg_secondary"]
+        )
+        self.stats_label.grid(row=0, column=0, sticky="w")
+        
         # Status label with enhanced styling
         self.status_label = ctk.CTkLabel(
             bottom_frame,
@@ -323,11 +371,181 @@ class EditorScreen(ctk.CTkFrame):
         """Change the font size of the content text"""
         self.content_text.configure(font=ctk.CTkFont(size=int(size)))
     
+    def _watch_content_edits(self):
+        """
+        Route the content box's Tcl widget command through _on_text_command
+        
+        Every insert and delete, whether typed, pasted or made by code,
+        then reports the lines it touched, so the counts are kept without
+        reading the whole text on each keystroke.
+        """
+        textbox = self.content_text._textbox
+        self._text_command = f"{textbox._w}_counted"
+        self.tk.call("rename", textbox._w, self._text_command)
+        self.tk.createcommand(textbox._w, self._on_text_command)
+        textbox.bind("<Destroy>", lambda event: self.tk.deletecommand(textbox._w), add="+")
+    
+    def _on_text_command(self, *args):
+        """Run a text widget command, recounting the lines an edit touched"""
+        call = lambda *command: self.tk.call(self._text_command, *command)
+        operation = args[0] if args else ""
+        if operation not in ("insert", "delete", "replace"):
+            result = call(*args)
+            if operation == "edit" and args[1:2] in (("undo",), ("redo",)):
+                self.text_stats.reset(call("get", "1.0", "end-1c"))
+                self._schedule_stats_label()
+            return result
+        
+        if operation == "insert":
+            indices = args[1:2]
+        elif operation == "delete" and len(args) == 2:
+            # A single index deletes one character, which may be a newline
+            indices = (args[1], f"{args[1]}+1c")
+        else:
+            indices = args[1:3] if operation == "replace" else args[1:]
+        lines = [int(str(call("index", index)).split(".")[0]) for index in indices]
+        # "end" is the line after the last one
+        first, last = min(lines), min(max(lines), self.text_stats.line_count)
+        first = min(first, last)
+        line_count = self.text_stats.line_count
+        
+        result = call(*args)
+        
+        new_line_count = int(str(call("index", "end-1c")).split(".")[0])
+        new_last = last + new_line_count - line_count
+        new_lines = str(call("get", f"{first}.0", f"{new_last}.end")).split("\n")
+        self.text_stats.replace_lines(first - 1, last - 1, new_lines)
+        self._schedule_stats_label()
+        return result
+    
+    def _schedule_stats_label(self):
+        """Refresh the count label once the current burst of edits is done"""
+        if self._stats_label_job is None:
+            self._stats_label_job = self.after_idle(self._update_stats_label)
+    
+    def _update_stats_label(self):
+        """Show the live word and character count"""
+        self._stats_label_job = None
+        if self._content_has_placeholder:
+            words = chars = 0
+        else:
+            words, chars = self.text_stats.words, self.text_stats.chars
+        self.stats_label.configure(text=f"{words:,} words · {chars:,} characters")
+    
+    def _content_word_count(self) -> int:
+        """Words in the content as a save would store it"""
+        return 0 if self._content_has_placeholder else self.text_stats.words
+    
+    @property
+    def is_loading(self) -> bool:
+        """Whether a long note is still being inserted into the content box"""
+        return self._loading
+    
+    def _insert_content(self, content: str):
+        """
+        Put a note's content into the empty content box
+        
+        Long contents are inserted a screenful first and the rest in chunks
+        from idle callbacks, so the editor paints and takes input before Tk
+        has laid out the whole text. Chunks are appended at the load_end
+        mark, after everything shown so far, so the cursor (left at the
+        start) and the scroll position do not move, and text typed in the
+        meantime stays where it was typed. Saving waits for the last chunk.
+        
+        Args:
+            content: Note content
+        """
+        self._load_started = time.perf_counter()
+        self.load_stats = {"chars": len(content), "chunks": 1, "first_chunk_ms": 0.0, "total_ms": 0.0}
+        if len(content) <= self.PROGRESSIVE_LOAD_CHARS:
+            self.content_text.insert("1.0", content)
+            self._finish_loading()
+            return
+        
+        end = self._chunk_end(content, 0, self.FIRST_CHUNK_CHARS)
+        self.content_text.insert("1.0", content[:end])
+        self.content_text.mark_set("insert", "1.0")
+        self.content_text.mark_set("load_end", "end-1c")
+        self.load_stats["first_chunk_ms"] = self._elapsed_ms()
+        
+        self._loading = True
+        self._edited_while_loading = False
+        self._load_content = content
+        self._load_offset = end
+        self._load_job = self.after_idle(self._load_next_chunk, self._load_generation)
+    
+    @staticmethod
+    def _chunk_end(content: str, start: int, size: int) -> int:
+        """End of the chunk starting at `start`, cut after a newline where there is one"""
+        end = start + size
+        if end >= len(content):
+            return len(content)
+        newline = content.rfind("\n", start, end)
+        return newline + 1 if newline > start else end
+    
+    def _load_next_chunk(self, generation: int):
+        """Insert the next chunk of a long note; ignores callbacks of an abandoned load"""
+        if generation != self._load_generation or not self._loading:
+            return
+        self._load_job = None
+        start = self._load_offset
+        end = self._chunk_end(self._load_content, start, self.LOAD_CHUNK_CHARS)
+        self.content_text.insert("load_end", self._load_content[start:end])
+        self._load_offset = end
+        self.load_stats["chunks"] += 1
+        
+        if end < len(self._load_content):
+            self._load_job = self.after_idle(self._load_next_chunk, generation)
+        else:
+            self._finish_loading()
+    
+    def _complete_loading(self):
+        """Insert whatever is left of a progressive load right away, e.g. before saving"""
+        if not self._loading:
+            return
+        if self._load_job is not None:
+            self.after_cancel(self._load_job)
+            self._load_job = None
+        self.content_text.insert("load_end", self._load_content[self._load_offset:])
+        self.load_stats["chunks"] += 1
+        self._finish_loading()
+    
+    def _finish_loading(self):
+        """Record the load time and let saves through again"""
+        if not self.load_stats["first_chunk_ms"]:
+            self.load_stats["first_chunk_ms"] = self._elapsed_ms()
+        self.load_stats["total_ms"] = self._elapsed_ms()
+        edited = self._loading and self._edited_while_loading
+        self._cancel_loading()
+        if edited:
+            # Auto-save skipped edits made while loading; schedule them now
+            self.auto_saver.touch()
+    
+    def _cancel_loading(self):
+        """Abandon a progressive load, e.g. when another note is opened"""
+        self._load_generation += 1
+        if self._load_job is not None:
+            self.after_cancel(self._load_job)
+            self._load_job = None
+        self._loading = False
+        self._edited_while_loading = False
+        self._load_content = ""
+        self._load_offset = 0
+    
+    def _elapsed_ms(self) -> float:
+        """Milliseconds since the current load started"""
+        return round((time.perf_counter() - self._load_started) * 1000, 2)
+    
+    def get_load_stats(self) -> Dict[str, float]:
+        """Get chars, chunks, first_chunk_ms and total_ms of the last note load"""
+        return dict(self.load_stats)
+    
     def on_content_change(self, event=None):
-        """Handle content change - mark dirty and schedule auto-save"""
+        """Handle a key release - schedule auto-save (which skips unchanged content)"""
+        if self._loading:
+            self._edited_while_loading = True
         # If the user started typing, clear the placeholder now
         self._clear_content_placeholder_if_needed()
-        self._is_dirty = True
         self.schedule_auto_save(event)
     
     def update_colors(self):
@@ -385,9 +603,9 @@ class EditorScreen(ctk.CTkFrame):
         Args:
             note: Note dictionary or None for new note
         """
+        self._cancel_loading()
         if note:
             self.current_note_id = note["id"]
-            self._is_dirty = False
             # Title: show real title, disable placeholder
             self.title_entry.delete(0, "end")
             self.title_entry.insert(0, note["title"])
@@ -397,7 +615,7 @@ class EditorScreen(ctk.CTkFrame):
             self._content_has_placeholder = False
             self.content_text.configure(text_color=Theme.get_colors()["fg"])  # normal text color
             self.content_text.delete("1.0", "end")
-            self.content_text.insert("1.0", note["content"])
+            self._insert_content(note["content"])
             
             # Load tags
             self.current_tags = note.get("tags", "")
@@ -443,7 +661,14 @@ class EditorScreen(ctk.CTkFrame):
             self.current_tags = ""
             self.current_category = "Personal"
             self.timestamp_label.configure(text="")
-            self._is_dirty = False
+        
+        # What was just loaded counts as saved; taken from the note rather
+        # than the content box, which may still be loading
+        baseline = None
+        if note and note["content"].strip():
+            title, _, tags, category = self._current_fields()
+            baseline = (title, note["content"].strip(), tags, category)
+        self.auto_saver.reset(baseline)
     
     def _update_timestamp_label(self, created_at: str, updated_at: str):
         """Update the human-friendly timestamp label"""
@@ -464,7 +689,8 @@ class EditorScreen(ctk.CTkFrame):
 
     def handle_back(self):
         """Handle back navigation with unsaved changes check"""
-        if not self._is_dirty:
+        self._complete_loading()
+        if not self.has_unsaved_changes():
             self.on_back()
             return
 
@@ -480,7 +706,7 @@ class EditorScreen(ctk.CTkFrame):
             self.on_back()
         elif result == "no":
             # Discard changes
-            self._is_dirty = False
+            self.auto_saver.reset()
             self.show_status("Notes has been discarded.")
             self.on_back()
         else:
@@ -495,6 +721,10 @@ class EditorScreen(ctk.CTkFrame):
         title = "" if getattr(self, "_title_placeholder_active", False) or raw_title == self._title_placeholder else raw_title
         tags = "" if getattr(self, "_tags_placeholder_active", False) or raw_tags == self._tags_placeholder else raw_tags
 
+        if self._loading:
+            self.show_status("Still loading the note, try again in a moment 🐾")
+            return
+        
         content = self._get_content_without_placeholder()
         category = self.category_var.get()
         
@@ -507,19 +737,15 @@ class EditorScreen(ctk.CTkFrame):
         
         self.current_tags = tags
         self.current_category = category
-        self.on_save(title, content, self.current_note_id, tags, category)
-        self._is_dirty = False
+        self.on_save(title, content, self.current_note_id, tags, category,
+                     word_count=self._content_word_count())
+        self.auto_saver.mark_saved((title, content, tags, category))
         # Show toast-style notification
         self.show_status("Notes has been saved.")
     
     def schedule_auto_save(self, event=None):
-        """Schedule auto-save after typing stops"""
-        # Cancel previous auto-save job
-        if self.auto_save_job:
-            self.after_cancel(self.auto_save_job)
-        
-        # Schedule new auto-save after 2 seconds of inactivity
-        self.auto_save_job = self.after(2000, self.auto_save)
+        """Record an edit; the scheduler saves after a pause, or periodically while typing goes on"""
+        self.auto_saver.touch()
 
     def _set_content_placeholder(self):
         """Show placeholder text in the content box with subtle color."""
@@ -527,7 +753,6 @@ class EditorScreen(ctk.CTkFrame):
         self.content_text.configure(text_color=colors["fg_secondary"])
         self.content_text.delete("1.0", "end")
         self.content_text.insert("1.0", self._content_placeholder)
-        self._is_dirty = False
         self._content_has_placeholder = True
 
     def _clear_content_placeholder_if_needed(self):
@@ -592,8 +817,8 @@ class EditorScreen(ctk.CTkFrame):
             return ""
         return content
 
-    def auto_save(self):
-        """Auto-save the note"""
+    def _current_fields(self) -> tuple:
+        """Get (title, content, tags, category) as a save would store them"""
         raw_title = self.title_entry.get().strip()
         raw_tags = self.tags_entry.get().strip()
         title = "" if getattr(self, "_title_placeholder_active", False) or raw_title == self._title_placeholder else raw_title
@@ -602,15 +827,64 @@ class EditorScreen(ctk.CTkFrame):
         content = self._get_content_without_placeholder()
         category = self.category_var.get()
         
+        return (title or "Untitled Note", content, tags, category)
+    
+    def _collect_auto_save(self) -> Optional[tuple]:
+        """
+        Get what auto-save would store
+        
+        Returns:
+            (title, content, tags, category), or None if the note has no
+            content, has not been created yet or is still loading
+        """
+        if self._loading:
+            # _finish_loading reschedules edits made while loading
+            return None
+        fields = self._current_fields()
         # Only auto-save if we have content and this is an existing note
-        if content and self.current_note_id:
-            if not title:
-                title = "Untitled Note"
-            self.current_tags = tags
-            self.current_category = category
-            self.on_save(title, content, self.current_note_id, tags, category)
-            self._is_dirty = False
-            self.show_status(CAT_MESSAGES["auto_saved"], duration=1500)
+        if not (fields[1] and self.current_note_id):
+            return None
+        return fields
+    
+    def has_unsaved_changes(self) -> bool:
+        """
+        Check whether the fields differ from the last save
+        
+        Compares content hashes instead of trusting key events, so cursor
+        keys, copying or an edit that was undone do not count as changes.
+        
+        Returns:
+            True if saving would write something new
+        """
+        if self._loading:
+            return self._edited_while_loading
+        fields = self._current_fields()
+        if self.current_note_id is None and not fields[1]:
+            # A new note with nothing typed
+            return False
+        return not self.auto_saver.is_saved(fields)
+    
+    def _auto_save_payload(self, payload: tuple):
+        """Save a payload collected by _collect_auto_save"""
+        title, content, tags, category = payload
+        self.current_tags = tags
+        self.current_category = category
+        self.on_save(title, content, self.current_note_id, tags, category,
+                     word_count=self._content_word_count())
+        self.show_status(CAT_MESSAGES["auto_saved"], duration=1500)
+    
+    def auto_save(self):
+        """Auto-save pending edits now instead of waiting, e.g. before the window closes"""
+        self._complete_loading()
+        self.auto_saver.flush()
+    
+    def get_auto_save_stats(self) -> Dict[str, int]:
+        """Get saves issued versus skipped by the auto-save scheduler"""
+        return self.auto_saver.stats()
+    
+    def mark_dirty(self):
+        """Flag the note as unsaved again, e.g. after a background save failed"""
+        self.auto_saver.invalidate()
     
     def show_status(self, message: str, duration: int = 3000):
         """
@@ -4,17 +4,24 @@ Dashboard displaying note cards with create, edit, delete functionality
 """
 
 import customtkinter as ctk
-from typing import Callable, List, Dict
+from typing import Callable, List, Optional
+from database import NoteSummary
 from themes import Theme, CAT_MESSAGES
-from PIL import Image
+from ui.note_list import VirtualNoteList
+from ui.search_worker import SearchWorker
+from ui.assets import AssetCache
 import os
 
 
 class HomeScreen(ctk.CTkFrame):
     """Home screen with note cards display"""
     
+    SEARCH_DEBOUNCE_MS = 200  # wait for a typing pause before querying
+    RESULT_POLL_MS = 30       # how often to collect background query results
+    
     def __init__(self, parent, on_create_note: Callable, on_edit_note: Callable, 
-                 on_delete_note: Callable, on_toggle_pin: Callable, note_service):
+                 on_delete_note: Callable, on_toggle_pin: Callable, note_service,
+                 on_first_display: Optional[Callable] = None):
         """
         Initialize home screen
         
@@ -25,6 +32,7 @@ class HomeScreen(ctk.CTkFrame):
             on_delete_note: Callback for deleting a note (receives note_id)
             on_toggle_pin: Callback for toggling pin (receives note_id)
             note_service: NoteService instance for operations
+            on_first_display: Called once, after the first note list is shown
         """
         super().__init__(parent)
         
@@ -33,6 +41,7 @@ class HomeScreen(ctk.CTkFrame):
         self.on_delete_note = on_delete_note
         self.on_toggle_pin = on_toggle_pin
         self.note_service = note_service
+        self.on_first_display = on_first_display
         
         self.notes = []
         self.filtered_notes = []
@@ -40,6 +49,12 @@ class HomeScreen(ctk.CTkFrame):
         self.current_sort = "updated"
         self.background_label = None
         
+        # List and search queries run on a worker thread; see _request_notes
+        self.search_worker = SearchWorker(interruptible=note_service.interruptible)
+        self._search_after_id = None
+        self._poll_after_id = None
+        self._keep_scroll = False
+        
         self.setup_ui()
     
     def setup_ui(self):
@@ -58,42 +73,19 @@ class HomeScreen(ctk.CTkFrame):
         header_frame.grid(row=0, column=0, sticky="ew", padx=spacing["lg"], pady=(spacing["lg"], spacing["md"]))
         header_frame.grid_columnconfigure(1, weight=1)
         
-        # App title with icon image
+        # App title; the emoji stands in until _load_images() swaps in the cat icon
         # Title text font (keep this size as-is)
         title_font = ctk.CTkFont(size=30, weight="bold")
 
-        # Icon size is independent so you can tweak only the cat size here
-        icon_size = 50  # change this value to make the cat bigger/smaller
-
-        icon_path = Theme.get_asset_path("app_icon.png")
-        self.app_icon_image = None
-        if icon_path and os.path.exists(icon_path):
-            try:
-                img = Image.open(icon_path)
-                self.app_icon_image = ctk.CTkImage(
-                    light_image=img,
-                    dark_image=img,
-                    size=(icon_size, icon_size)
-                )
-            except:
-                self.app_icon_image = None
-
-        title_text = "KittyNotes"
-        title_image = self.app_icon_image
-        if title_image is None:
-            # Fallback to emoji if icon not available
-            title_text = "🐱 KittyNotes"
-
-        title_label = ctk.CTkLabel(
+        self.title_label = ctk.CTkLabel(
             header_frame,
-            text=title_text,
-            image=title_image,
+            text="🐱 KittyNotes",
             compound="left",  # icon + text on the same line
             font=title_font,
             text_color=colors["fg"],
             anchor="center"  # center-align text with the cat icon
         )
-        title_label.grid(row=0, column=0, sticky="w", padx=(0, spacing["md"]))
+        self.title_label.grid(row=0, column=0, sticky="w", padx=(0, spacing["md"]))
         
         # Button container - blend with background
         button_frame = ctk.CTkFrame(header_frame, fg_color="#F5F0FF", corner_radius=0)
@@ -176,14 +168,26 @@ class HomeScreen(ctk.CTkFrame):
             btn.pack(side="left", padx=spacing["xs"])
             self.category_buttons[category] = btn
         
-        # Scrollable frame for notes - blend with background
-        self.scrollable_frame = ctk.CTkScrollableFrame(
+        # Virtualized note list - only visible rows get card widgets
+        self.note_list = VirtualNoteList(
             self,
+            on_edit_note=self.on_edit_note,
+            on_delete_note=self.delete_note_with_confirm,
+            on_toggle_pin=self.on_toggle_pin,
             fg_color="#F5F0FF",
             corner_radius=0
         )
-        self.scrollable_frame.grid(row=3, column=0, sticky="nsew", padx=spacing["lg"], pady=spacing["md"])
-        self.scrollable_frame.grid_columnconfigure(0, weight=1)
+        self.note_list.grid(row=3, column=0, sticky="nsew", padx=spacing["lg"], pady=spacing["md"])
+        
+        # Empty state, shown in place of the list; _load_images() adds the cat picture
+        self.empty_frame = ctk.CTkFrame(self, fg_color="#F5F0FF")
+        self.empty_label = ctk.CTkLabel(
+            self.empty_frame,
+            text=CAT_MESSAGES["no_notes"],
+            font=ctk.CTkFont(size=18),
+            text_color=colors["fg"]
+        )
+        self.empty_label.pack(pady=spacing["md"])
         
         # Status message - moved to row 4
         self.status_label = ctk.CTkLabel(
@@ -193,17 +197,83 @@ class HomeScreen(ctk.CTkFrame):
             text_color=colors["accent"]
         )
         self.status_label.grid(row=4, column=0, sticky="ew", padx=spacing["lg"], pady=(0, spacing["md"]))
+        
+        # Images need Pillow; load them once the window shell has painted
+        self.after_idle(self._load_images)
+    
+    def _load_images(self):
+        """Add the header icon and empty-state picture (deferred from setup_ui)"""
+        spacing = Theme.get_spacing()
+        
+        # Icon size is independent so you can tweak only the cat size here
+        icon_size = 50  # change this value to make the cat bigger/smaller
+        self.app_icon_image = AssetCache.get_image("app_icon.png", (icon_size, icon_size))
+        if self.app_icon_image is not None:
+            self.title_label.configure(text="KittyNotes", image=self.app_icon_image)
+        
+        cat_image = AssetCache.get_image("cat_reading.png", (150, 150))
+        if cat_image is not None:
+            image_label = ctk.CTkLabel(self.empty_frame, image=cat_image, text="")
+            image_label.pack(pady=spacing["md"], before=self.empty_label)
     
     def on_search(self, event=None):
-        """Handle search input"""
+        """Handle search input, debounced until typing pauses"""
+        if self._search_after_id:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(self.SEARCH_DEBOUNCE_MS, self._run_search)
+    
+    def _run_search(self):
+        """Query for the current search text, or the current listing if empty"""
+        self._search_after_id = None
         query = self.search_entry.get().strip()
         if query:
-            # Search using service
-            self.filtered_notes = self.note_service.search_notes(query)
-            self.display_notes(self.filtered_notes)
+            self._request_notes(lambda: self.note_service.search_note_summaries(query))
         else:
-            # Show all notes
-            self.display_notes(self.notes)
+            self._request_notes(self._fetch_listing())
+    
+    def _fetch_listing(self) -> Callable[[], List[NoteSummary]]:
+        """Build a query for the listing under the current sort and category"""
+        sort_by, category = self.current_sort, self.current_filter
+        return lambda: self.note_service.get_note_summaries(sort_by=sort_by, category=category)
+    
+    def refresh_notes(self):
+        """Re-run the current search or listing after an edit, keeping the scroll position"""
+        if self._search_after_id:
+            # A debounced search is about to run anyway
+            return
+        query = self.search_entry.get().strip()
+        if query:
+            self._request_notes(lambda: self.note_service.search_note_summaries(query), keep_scroll=True)
+        else:
+            self._request_notes(self._fetch_listing(), keep_scroll=True)
+    
+    def _request_notes(self, fetch: Callable[[], List[NoteSummary]], keep_scroll: bool = False):
+        """
+        Run a note query on the worker thread and display its result
+        
+        Any query still running is superseded, so only the newest result
+        is ever displayed.
+        
+        Args:
+            fetch: Query to run off the main thread
+            keep_scroll: Keep the list's scroll position when displaying the result
+        """
+        self._keep_scroll = keep_scroll
+        self.search_worker.submit(fetch)
+        if not self._poll_after_id:
+            self._poll_after_id = self.after(self.RESULT_POLL_MS, self._poll_results)
+    
+    def _poll_results(self):
+        """Display the newest background result once it arrives"""
+        self._poll_after_id = None
+        result = self.search_worker.poll()
+        if result:
+            if result.error:
+                self.show_status(f"😿 {result.error}")
+            else:
+                self.display_notes(result.notes, keep_scroll=self._keep_scroll)
+        if self.search_worker.busy:
+            self._poll_after_id = self.after(self.RESULT_POLL_MS, self._poll_results)
     
     def on_sort_change(self, choice):
         """Handle sort option change"""
@@ -215,8 +285,7 @@ class HomeScreen(ctk.CTkFrame):
         self.current_sort = sort_map.get(choice, "updated")
         
         # Re-fetch and display sorted notes
-        notes = self.note_service.get_all_notes(sort_by=self.current_sort)
-        self.display_notes(notes)
+        self._request_notes(self._fetch_listing())
     
     def filter_by_category(self, category):
         """Filter notes by category"""
@@ -229,16 +298,9 @@ class HomeScreen(ctk.CTkFrame):
             else:
                 btn.configure(fg_color=colors["card_bg"], text_color=colors["fg"])
         
-        # Filter notes
-        if category == "All":
-            self.current_filter = None
-            self.display_notes(self.notes)
-        else:
-            # Remove emoji from category name for service query
-            cat_name = category.split()[0]
-            self.current_filter = cat_name
-            filtered = self.note_service.get_notes_by_category(cat_name)
-            self.display_notes(filtered)
+        # Filter notes - remove emoji from category name for service query
+        self.current_filter = None if category == "All" else category.split()[0]
+        self._request_notes(self._fetch_listing())
     
     def update_colors(self):
         """Update colors when theme changes"""
@@ -248,7 +310,7 @@ class HomeScreen(ctk.CTkFrame):
         
         # Update frame colors to blend with background
         self.configure(fg_color="#F5F0FF")
-        self.scrollable_frame.configure(fg_color="#F5F0FF")
+        self.note_list.set_background("#F5F0FF")
         
         self.create_button.configure(
             fg_color=colors["accent"],
@@ -281,249 +343,42 @@ class HomeScreen(ctk.CTkFrame):
                 hover_color=colors["button_hover"] if "button_hover" in colors else colors["accent_light"]
             )
         
-        # Refresh notes display
-        self.display_notes(self.notes)
+        # Rebind the visible cards with the new colors
+        self.note_list.refresh_cards()
     
-    def display_notes(self, notes: List[Dict]):
+    def display_notes(self, notes: List[NoteSummary], keep_scroll: bool = False):
         """
         Display notes as cards
         
+        Only cards whose note was inserted or changed are rebound; see
+        VirtualNoteList.set_notes.
+        
         Args:
-            notes: List of note dictionaries
+            notes: List of note summaries
+            keep_scroll: Keep the scroll position instead of returning to the top
         """
         self.notes = notes
-        colors = Theme.get_colors()
-        
-        # Clear existing cards
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
         
         if not notes:
-            # Empty state with cat reading image
-            spacing = Theme.get_spacing()
-            empty_frame = ctk.CTkFrame(self.scrollable_frame, fg_color="#F5F0FF")
-            empty_frame.pack(pady=spacing["xxl"])
-            
-            # Try to load cat reading image
-            cat_image_path = Theme.get_asset_path("cat_reading.png")
-            if cat_image_path and os.path.exists(cat_image_path):
-                try:
-                    img = Image.open(cat_image_path)
-                    cat_image = ctk.CTkImage(light_image=img, dark_image=img, size=(150, 150))
-                    image_label = ctk.CTkLabel(empty_frame, image=cat_image, text="")
-                    image_label.pack(pady=spacing["md"])
-                except:
-                    pass
-            
-            empty_label = ctk.CTkLabel(
-                empty_frame,
-                text=CAT_MESSAGES["no_notes"],
-                font=ctk.CTkFont(size=18),
-                text_color=colors["fg"]
-            )
-            empty_label.pack(pady=spacing["md"])
-            return
-        
-        # Create note cards
-        for note in notes:
-            self.create_note_card(note)
-    
-    def create_note_card(self, note: Dict):
-        """
-        Create a note card widget with enhanced features and modern design
-        
-        Args:
-            note: Note dictionary
-        """
-        colors = Theme.get_colors()
-        spacing = Theme.get_spacing()
-        radius = Theme.get_radius()
-        is_pinned = note.get("is_pinned", 0)
-        
-        # Card frame with enhanced styling
-        card = ctk.CTkFrame(
-            self.scrollable_frame,
-            fg_color=colors["card_bg"],
-            corner_radius=radius["lg"],
-            border_width=2 if is_pinned else 1,
-            border_color=colors["pin_color"] if is_pinned else colors["border_light"]
-        )
-        card.pack(fill="x", pady=spacing["md"], padx=spacing["sm"])
-        card.grid_columnconfigure(0, weight=1)
-        
-        # Enhanced hover effect with smooth transition
-        original_bg = colors["card_bg"]
-        hover_bg = colors["card_hover"]
-        
-        def on_enter(e):
-            card.configure(fg_color=hover_bg, border_color=colors["accent_light"])
-            # Update child frames
-            for child in card.winfo_children():
-                if isinstance(child, ctk.CTkFrame):
-                    child.configure(fg_color=hover_bg)
-        
-        def on_leave(e):
-            card.configure(fg_color=original_bg, border_color=colors["pin_color"] if is_pinned else colors["border_light"])
-            # Update child frames
-            for child in card.winfo_children():
-                if isinstance(child, ctk.CTkFrame):
-                    child.configure(fg_color=original_bg)
-        
-        card.bind("<Enter>", on_enter)
-        card.bind("<Leave>", on_leave)
-        
-        # Title row with pin indicator - enhanced spacing
-        title_frame = ctk.CTkFrame(card, fg_color=colors["card_bg"], corner_radius=0)
-        title_frame.grid(row=0, column=0, sticky="ew", padx=spacing["lg"], pady=(spacing["lg"], spacing["sm"]))
-        title_frame.grid_columnconfigure(1, weight=1)
-        
-        # Pin indicator
-        if is_pinned:
-            pin_icon_path = Theme.get_asset_path("paw_star_icon.png")
-            if pin_icon_path and os.path.exists(pin_icon_path):
-                try:
-                    pin_img = Image.open(pin_icon_path)
-                    pin_image = ctk.CTkImage(light_image=pin_img, dark_image=pin_img, size=(20, 20))
-                    pin_label = ctk.CTkLabel(title_frame, image=pin_image, text="")
-                    pin_label.grid(row=0, column=0, padx=(0, 5))
-                except:
-                    # Fallback to emoji
-                    pin_label = ctk.CTkLabel(title_frame, text="📌", font=ctk.CTkFont(size=14))
-                    pin_label.grid(row=0, column=0, padx=(0, 5))
-            else:
-                pin_label = ctk.CTkLabel(title_frame, text="📌", font=ctk.CTkFont(size=14))
-                pin_label.grid(row=0, column=0, padx=(0, 5))
-        
-        # Title with refined typography
-        title = note.get("title", "Untitled")
-        title_label = ctk.CTkLabel(
-            title_frame,
-            text=title if len(title) <= 50 else title[:50] + "...",
-            font=ctk.CTkFont(size=17, weight="bold"),
-            text_color=colors["fg"],
-            anchor="w"
-        )
-        title_label.grid(row=0, column=1, sticky="w", padx=(spacing["sm"], 0))
-        
-        # Content preview with refined typography
-        content = note.get("content", "")
-        preview = content[:150] + "..." if len(content) > 150 else content
-        content_label = ctk.CTkLabel(
-            card,
-            text=preview or "No content...",
-            font=ctk.CTkFont(size=13),
-            text_color=colors["fg_secondary"],
-            anchor="w",
-            justify="left",
-            wraplength=550
-        )
-        content_label.grid(row=1, column=0, sticky="w", padx=spacing["lg"], pady=(0, spacing["sm"]))
-        
-        # Tags display with refined styling
-        tags = note.get("tags", "")
-        if tags:
-            tags_frame = ctk.CTkFrame(card, fg_color=colors["card_bg"], corner_radius=0)
-            tags_frame.grid(row=2, column=0, sticky="w", padx=spacing["lg"], pady=(0, spacing["xs"]))
-            
-            for tag in tags.split(","):
-                tag = tag.strip()
-                if tag:
-                    tag_label = ctk.CTkLabel(
-                        tags_frame,
-                        text=f"#{tag}",
-                        font=ctk.CTkFont(size=11, weight="normal"),
-                        # Soft theme-matching pink/lavender background
-                        fg_color="#FCE4EC",
-                        # Dark text for elegant contrast
-                        text_color=colors["fg"],
-                        corner_radius=radius["md"],
-                        padx=spacing["sm"],
-                        pady=3
-                    )
-                    tag_label.pack(side="left", padx=3)
-        
-        # Category and timestamp row with refined styling
-        info_frame = ctk.CTkFrame(card, fg_color=colors["card_bg"], corner_radius=0)
-        info_frame.grid(row=3, column=0, sticky="ew", padx=spacing["lg"], pady=(spacing["xs"], spacing["md"]))
-        info_frame.grid_columnconfigure(0, weight=1)
-        
-        # Category with better styling
-        category = note.get("category", "Personal")
-        category_label = ctk.CTkLabel(
-            info_frame,
-            text=f"📁 {category}",
-            font=ctk.CTkFont(size=11),
-            text_color=colors["fg_secondary"]
-        )
-        category_label.grid(row=0, column=0, sticky="w")
-        
-        # Updated time
-        updated_at = note.get("updated_at", "")
-        if updated_at:
-            # Use raw stored timestamp; formatting will be handled in editor view when needed
-            time_display = updated_at
-            time_label = ctk.CTkLabel(
-                info_frame,
-                text=f"🐾 {time_display}",
-                font=ctk.CTkFont(size=11),
-                text_color="#702A44"
-            )
-            time_label.grid(row=0, column=1, sticky="e")
-        
-        # Button frame (top right of card) with refined positioning
-        button_frame = ctk.CTkFrame(card, fg_color=colors["card_bg"], corner_radius=0)
-        button_frame.grid(row=0, column=1, rowspan=4, padx=spacing["sm"], pady=spacing["md"], sticky="ne")
-        
-        # Standardized button dimensions
-        button_width = 100
-        button_height = 36
-        
-        # Pin/Unpin button with refined styling
+            self.note_list.grid_remove()
+            self.empty_frame.grid(row=3, column=0, pady=Theme.get_spacing()["xxl"])
+        else:
+            self.empty_frame.grid_remove()
+            self.note_list.grid()
         
-        pin_fg = colors["accent"] if not is_pinned else colors["pin_color"]
-        pin_btn = ctk.CTkButton(
-            button_frame,
-            text="📌      Pin",
-            width=button_width,
-            height=button_height,
-            corner_radius=radius["md"],
-            fg_color=pin_fg,
-            text_color=colors["button_fg"],
-            hover_color=colors["button_hover"] if "button_hover" in colors else colors["accent_dark"],
-            font=ctk.CTkFont(size=13),
-            command=lambda: self.on_toggle_pin(note["id"])
-        )
-        pin_btn.pack(pady=spacing["xs"])
+        self.note_list.set_notes(notes, keep_scroll=keep_scroll)
         
-        # Edit button with refined styling
-        edit_btn = ctk.CTkButton(
-            button_frame,
-            text="✏️ Edit",
-            width=button_width,
-            height=button_height,
-            corner_radius=radius["md"],
-            fg_color=colors["accent"],
-            text_color=colors["button_fg"],
-            hover_color=colors["button_hover"] if "button_hover" in colors else colors["accent_dark"],
-            font=ctk.CTkFont(size=13),
-            command=lambda: self.on_edit_note(note["id"])
-        )
-        edit_btn.pack(pady=spacing["xs"])
-        
-        # Delete button with refined styling
-        delete_btn = ctk.CTkButton(
-            button_frame,
-            text="🗑️ Delete",
-            width=button_width,
-            height=button_height,
-            corner_radius=radius["md"],
-            fg_color=colors["accent"],
-            text_color=colors["button_fg"],
-            hover_color=colors["error"],  # red on hover
-            font=ctk.CTkFont(size=13),
-            command=lambda: self.delete_note_with_confirm(note["id"])
-        )
-        delete_btn.pack(pady=spacing["xs"])
+        if self.on_first_display:
+            callback, self.on_first_display = self.on_first_display, None
+            callback()
+    
+    def destroy(self):
+        """Stop the search worker and pending callbacks before destroying"""
+        for after_id in (self._search_after_id, self._poll_after_id):
+            if after_id:
+                self.after_cancel(after_id)
+        self.search_worker.close()
+        super().destroy()
     
     def delete_note_with_confirm(self, note_id: int):
         """
@@ -537,13 +392,11 @@ class HomeScreen(ctk.CTkFrame):
     def _setup_background(self):
         """Setup background image for the home screen"""
         try:
-            from PIL import Image
             bg_path = Theme.get_background_image()
             if bg_path and os.path.exists(bg_path):
-                bg_image = Image.open(bg_path)
                 # Create a label with the background image
                 # Place it at the back of the frame
-                self.bg_image_obj = ctk.CTkImage(light_image=bg_image, dark_image=bg_image, size=(1000, 800))
+                self.bg_image_obj = AssetCache.get_image(os.path.basename(bg_path), (1000, 800))
                 # Note: We'll use the parent window's background instead
                 # as CTkFrame doesn't directly support background images
         except:
@@ -0,0 +1,448 @@
+"""
+WhiskerNotes - Virtual Note List
+Scrollable note card list that only builds cards for the visible rows
+"""
+
+import tkinter as tk
+import customtkinter as ctk
+from typing import Callable, List
+from database import Database, NoteSummary
+from themes import Theme
+from ui.recycler import CardRecycler
+from ui.assets import AssetCache
+
+
+class NoteCard(ctk.CTkFrame):
+    """Note card whose widgets are built once and rebound to different notes"""
+
+    # Fixed card height so the list can compute row positions without measuring
+    HEIGHT = 210
+
+    def __init__(self, parent, on_edit_note: Callable, on_delete_note: Callable, on_toggle_pin: Callable):
+        """
+        Initialize note card
+
+        Args:
+            parent: Parent widget
+            on_edit_note: Callback for editing a note (receives note_id)
+            on_delete_note: Callback for deleting a note (receives note_id)
+            on_toggle_pin: Callback for toggling pin (receives note_id)
+        """
+        colors = Theme.get_colors()
+        radius = Theme.get_radius()
+        super().__init__(
+            parent,
+            height=self.HEIGHT,
+            fg_color=colors["card_bg"],
+            corner_radius=radius["lg"],
+            border_width=1,
+            border_color=colors["border_light"]
+        )
+
+        self.on_edit_note = on_edit_note
+        self.on_delete_note = on_delete_note
+        self.on_toggle_pin = on_toggle_pin
+        self.note_id = None
+        self.is_pinned = False
+        self.window_id = None  # canvas item id, set by VirtualNoteList
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Build the card widgets once; bind_note() fills them in"""
+        colors = Theme.get_colors()
+        spacing = Theme.get_spacing()
+        radius = Theme.get_radius()
+
+        # Keep a constant height regardless of content
+        self.grid_propagate(False)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.bind("<Enter>", self._on_enter)
+        self.bind("<Leave>", self._on_leave)
+
+        # Title row with pin indicator - enhanced spacing
+        self.title_frame = ctk.CTkFrame(self, fg_color=colors["card_bg"], corner_radius=0)
+        self.title_frame.grid(row=0, column=0, sticky="ew", padx=spacing["lg"], pady=(spacing["lg"], spacing["sm"]))
+        self.title_frame.grid_columnconfigure(1, weight=1)
+
+        # Pin indicator (shown only for pinned notes); every card shares one image
+        pin_image = AssetCache.get_image("paw_star_icon.png", (20, 20))
+        if pin_image is not None:
+            self.pin_label = ctk.CTkLabel(self.title_frame, image=pin_image, text="")
+        else:
+            # Fallback to emoji
+            self.pin_label = ctk.CTkLabel(self.title_frame, text="📌", font=ctk.CTkFont(size=14))
+        self.pin_label.grid(row=0, column=0, padx=(0, 5))
+        self.pin_label.grid_remove()
+
+        # Title with refined typography
+        self.title_label = ctk.CTkLabel(
+            self.title_frame,
+            text="",
+            font=ctk.CTkFont(size=17, weight="bold"),
+            text_color=colors["fg"],
+            anchor="w"
+        )
+        self.title_label.grid(row=0, column=1, sticky="w", padx=(spacing["sm"], 0))
+
+        # Content preview with refined typography
+        self.content_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=ctk.CTkFont(size=13),
+            text_color=colors["fg_secondary"],
+            anchor="w",
+            justify="left",
+            wraplength=550
+        )
+        self.content_label.grid(row=1, column=0, sticky="w", padx=spacing["lg"], pady=(0, spacing["sm"]))
+
+        # Tags row - tag labels are created on demand and reused across notes
+        self.tags_frame = ctk.CTkFrame(self, fg_color=colors["card_bg"], corner_radius=0)
+        self.tags_frame.grid(row=2, column=0, sticky="w", padx=spacing["lg"], pady=(0, spacing["xs"]))
+        self.tag_labels: List[ctk.CTkLabel] = []
+
+        # Category and timestamp row with refined styling
+        info_frame = ctk.CTkFrame(self, fg_color=colors["card_bg"], corner_radius=0)
+        info_frame.grid(row=3, column=0, sticky="ew", padx=spacing["lg"], pady=(spacing["xs"], spacing["md"]))
+        info_frame.grid_columnconfigure(0, weight=1)
+
+        self.category_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=colors["fg_secondary"]
+        )
+        self.category_label.grid(row=0, column=0, sticky="w")
+
+        self.time_label = ctk.CTkLabel(
+            info_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#702A44"
+        )
+        self.time_label.grid(row=0, column=1, sticky="e")
+
+        # Button frame (top right of card) with refined positioning
+        button_frame = ctk.CTkFrame(self, fg_color=colors["card_bg"], corner_radius=0)
+        button_frame.grid(row=0, column=1, rowspan=4, padx=spacing["sm"], pady=spacing["md"], sticky="ne")
+
+        # Standardized button dimensions
+        button_width = 100
+        button_height = 36
+
+        self.pin_button = ctk.CTkButton(
+            button_frame,
+            text="📌      Pin",
+            width=button_width,
+            height=button_height,
+            corner_radius=radius["md"],
+            fg_color=colors["accent"],
+            text_color=colors["button_fg"],
+            hover_color=colors["button_hover"] if "button_hover" in colors else colors["accent_dark"],
+            font=ctk.CTkFont(size=13),
+            command=lambda: self.on_toggle_pin(self.note_id)
+        )
+        self.pin_button.pack(pady=spacing["xs"])
+
+        edit_btn = ctk.CTkButton(
+            button_frame,
+            text="✏️ Edit",
+            width=button_width,
+            height=button_height,
+            corner_radius=radius["md"],
+            fg_color=colors["accent"],
+            text_color=colors["button_fg"],
+            hover_color=colors["button_hover"] if "button_hover" in colors else colors["accent_dark"],
+            font=ctk.CTkFont(size=13),
+            command=lambda: self.on_edit_note(self.note_id)
+        )
+        edit_btn.pack(pady=spacing["xs"])
+
+        delete_btn = ctk.CTkButton(
+            button_frame,
+            text="🗑️ Delete",
+            width=button_width,
+            height=button_height,
+            corner_radius=radius["md"],
+            fg_color=colors["accent"],
+            text_color=colors["button_fg"],
+            hover_color=colors["error"],  # red on hover
+            font=ctk.CTkFont(size=13),
+            command=lambda: self.on_delete_note(self.note_id)
+        )
+        delete_btn.pack(pady=spacing["xs"])
+
+    def bind_note(self, note: NoteSummary):
+        """
+        Show a note on this card, reconfiguring the existing widgets
+        
+        Args:
+            note: Note summary
+        """
+        colors = Theme.get_colors()
+        spacing = Theme.get_spacing()
+        radius = Theme.get_radius()
+
+        self.note_id = note.id
+        self.is_pinned = bool(note.is_pinned)
+
+        self.configure(
+            fg_color=colors["card_bg"],
+            border_width=2 if self.is_pinned else 1,
+            border_color=colors["pin_color"] if self.is_pinned else colors["border_light"]
+        )
+        self._set_child_frames_color(colors["card_bg"])
+
+        if self.is_pinned:
+            self.pin_label.grid()
+        else:
+            self.pin_label.grid_remove()
+
+        title = note.title or "Untitled"
+        self.title_label.configure(text=title if len(title) <= 50 else title[:50] + "...")
+
+        # Search results show the matched snippet instead of the stored preview
+        snippet = self._plain_snippet(note.snippet) if note.snippet else None
+        self.content_label.configure(text=snippet or note.preview or "No content...")
+
+        tags = [tag.strip() for tag in (note.tags or "").split(",") if tag.strip()]
+        while len(self.tag_labels) < len(tags):
+            self.tag_labels.append(ctk.CTkLabel(
+                self.tags_frame,
+                text="",
+                font=ctk.CTkFont(size=11, weight="normal"),
+                # Soft theme-matching pink/lavender background
+                fg_color="#FCE4EC",
+                # Dark text for elegant contrast
+                text_color=colors["fg"],
+                corner_radius=radius["md"],
+                padx=spacing["sm"],
+                pady=3
+            ))
+        for i, tag_label in enumerate(self.tag_labels):
+            if i < len(tags):
+                tag_label.configure(text=f"#{tags[i]}")
+                tag_label.pack(side="left", padx=3)
+            else:
+                tag_label.pack_forget()
+
+        self.category_label.configure(text=f"📁 {note.category or 'Personal'}")
+
+        # Use raw stored timestamp; formatting will be handled in editor view when needed
+        self.time_label.configure(text=f"🐾 {note.updated_at}" if note.updated_at else "")
+
+        self.pin_button.configure(fg_color=colors["pin_color"] if self.is_pinned else colors["accent"])
+
+    @staticmethod
+    def _plain_snippet(snippet: str) -> str:
+        """Remove the match markers from a search snippet; the label cannot style them"""
+        for marker in set(Database.SNIPPET_MARKERS):
+            snippet = snippet.replace(marker, "")
+        return snippet
+
+    def _set_child_frames_color(self, color: str):
+        """Match direct child frames to the card background"""
+        for child in self.winfo_children():
+            if isinstance(child, ctk.CTkFrame):
+                child.configure(fg_color=color)
+
+    def _on_enter(self, event=None):
+        """Soft hover highlight"""
+        colors = Theme.get_colors()
+        self.configure(fg_color=colors["card_hover"], border_color=colors["accent_light"])
+        self._set_child_frames_color(colors["card_hover"])
+
+    def _on_leave(self, event=None):
+        """Restore the card colors after hover"""
+        colors = Theme.get_colors()
+        self.configure(
+            fg_color=colors["card_bg"],
+            border_color=colors["pin_color"] if self.is_pinned else colors["border_light"]
+        )
+        self._set_child_frames_color(colors["card_bg"])
+
+
+class VirtualNoteList(ctk.CTkFrame):
+    """Scrollable list of note cards backed by a CardRecycler"""
+
+    # Vertical space between cards
+    ROW_SPACING = 16
+
+    # Off-screen y coordinate for pooled cards
+    HIDDEN_Y = -10000
+
+    def __init__(self, parent, on_edit_note: Callable, on_delete_note: Callable,
+                 on_toggle_pin: Callable, **kwargs):
+        """
+        Initialize the virtual list
+
+        Args:
+            parent: Parent widget
+            on_edit_note: Callback for editing a note (receives note_id)
+            on_delete_note: Callback for deleting a note (receives note_id)
+            on_toggle_pin: Callback for toggling pin (receives note_id)
+        """
+        super().__init__(parent, **kwargs)
+
+        self.on_edit_note = on_edit_note
+        self.on_delete_note = on_delete_note
+        self.on_toggle_pin = on_toggle_pin
+
+        self.recycler = CardRecycler(
+            create_card=self._create_card,
+            bind_card=self._bind_card,
+            hide_card=self._hide_card,
+            row_height=NoteCard.HEIGHT + self.ROW_SPACING,
+            key=lambda note: note.id,
+            move_card=self._move_card
+        )
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Create the canvas viewport and scrollbar"""
+        colors = Theme.get_colors()
+        spacing = Theme.get_spacing()
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(
+            self,
+            bg="#F5F0FF",  # blend with the home screen background
+            highlightthickness=0,
+            borderwidth=0,
+            yscrollincrement=40
+        )
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = ctk.CTkScrollbar(
+            self,
+            command=self.canvas.yview,
+            button_color=colors["scrollbar"],
+            button_hover_color=colors["accent_dark"]
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns", padx=(spacing["xs"], 0))
+
+        self.canvas.configure(yscrollcommand=self._on_canvas_scroll)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+
+        # Wheel events are routed globally and filtered to widgets inside this list
+        self.bind_all("<MouseWheel>", self._on_mousewheel, add="+")
+        self.bind_all("<Button-4>", self._on_mousewheel, add="+")
+        self.bind_all("<Button-5>", self._on_mousewheel, add="+")
+
+    def set_notes(self, notes: List[NoteSummary], keep_scroll: bool = False):
+        """
+        Show a new list of notes
+
+        Cards are matched to notes by id, so only inserted or changed
+        notes are rebound and shifted ones are just moved.
+
+        Args:
+            notes: List of note summaries in display order
+            keep_scroll: Keep the scroll position (for refreshes after an
+                edit) instead of returning to the top (for new results)
+        """
+        self.recycler.set_items(notes)
+        self._update_scrollregion()
+        if not keep_scroll:
+            self.canvas.yview_moveto(0)
+        self._refresh_viewport()
+
+    def refresh_cards(self):
+        """Rebind every visible card, e.g. after a theme change"""
+        self.recycler.invalidate()
+        self._refresh_viewport()
+
+    def set_background(self, color: str):
+        """Match the canvas background to the list frame"""
+        self.configure(fg_color=color)
+        self.canvas.configure(bg=color)
+
+    def _update_scrollregion(self):
+        """Size the scrollable area to the full (virtual) list height"""
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, max(self.recycler.content_height, 1)))
+
+    def _refresh_viewport(self):
+        """Bind cards to whatever rows are currently in view"""
+        top = self.canvas.canvasy(0)
+        height = self.canvas.winfo_height()
+        self.recycler.layout(top, height)
+
+    def _create_card(self) -> NoteCard:
+        """Build a pooled card and its canvas window"""
+        card = NoteCard(
+            self.canvas,
+            on_edit_note=self.on_edit_note,
+            on_delete_note=self.on_delete_note,
+            on_toggle_pin=self.on_toggle_pin
+        )
+        card.window_id = self.canvas.create_window(
+            0, self.HIDDEN_Y,
+            window=card,
+            anchor="nw",
+            width=self._card_width(),
+            height=NoteCard.HEIGHT
+        )
+        return card
+
+    def _bind_card(self, card: NoteCard, note: NoteSummary, index: int):
+        """Rebind a card to a note and move it to the row's position"""
+        card.bind_note(note)
+        self._move_card(card, index)
+
+    def _move_card(self, card: NoteCard, index: int):
+        """Position a card at a row without touching its contents"""
+        spacing = Theme.get_spacing()
+        y = index * self.recycler.row_height + self.ROW_SPACING // 2
+        self.canvas.coords(card.window_id, spacing["sm"], y)
+
+    def _hide_card(self, card: NoteCard):
+        """Park a pooled card off-screen"""
+        self.canvas.coords(card.window_id, 0, self.HIDDEN_Y)
+
+    def _card_width(self) -> int:
+        """Width available to a card inside the canvas"""
+        spacing = Theme.get_spacing()
+        return max(self.canvas.winfo_width() - 2 * spacing["sm"], 1)
+
+    def _on_canvas_configure(self, event=None):
+        """Resize cards to the viewport width and fill any newly exposed rows"""
+        width = self._card_width()
+        for card in self.recycler.all_cards():
+            self.canvas.itemconfigure(card.window_id, width=width)
+        self._update_scrollregion()
+        self._refresh_viewport()
+
+    def _on_canvas_scroll(self, first, last):
+        """Keep the scrollbar in sync and rebind cards as the view moves"""
+        self.scrollbar.set(first, last)
+        self._refresh_viewport()
+
+    def _on_mousewheel(self, event):
+        """Scroll when the wheel is used over this list"""
+        if not self._is_descendant(event.widget):
+            return
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        elif abs(event.delta) >= 120:
+            steps = -int(event.delta / 120)
+        else:
+            # macOS reports small deltas
+            steps = -event.delta
+        if steps:
+            self.canvas.yview_scroll(steps, "units")
+
+    def _is_descendant(self, widget) -> bool:
+        """Check whether a widget lives inside this list"""
+        while widget is not None:
+            if widget is self.canvas or widget is self:
+                return True
+            widget = getattr(widget, "master", None)
+        return False
@@ -0,0 +1,191 @@
+"""
+WhiskerNotes - Card Recycler
+Maps the visible window of a long list onto a small pool of reusable cards
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class CardRecycler:
+    """
+    Virtualization logic for fixed-height list rows
+
+    Only rows inside the viewport (plus a small buffer) own a card. Cards
+    that scroll out of view go back to a pool and are rebound to new rows
+    instead of being destroyed, so the number of widgets depends on the
+    viewport height and never on the number of items.
+
+    Cards are tracked by item key (the note id), so replacing the item
+    list applies a keyed diff: a card whose item is unchanged stays as it
+    is or is only moved, and only inserted or changed items are rebound.
+
+    The recycler knows nothing about Tk: widget work is delegated to the
+    create/bind/move/hide callbacks.
+    """
+
+    def __init__(self, create_card: Callable[[], Any], bind_card: Callable[[Any, Any, int], None],
+                 hide_card: Callable[[Any], None], row_height: int, buffer_rows: int = 3,
+                 key: Callable[[Any], Any] = lambda item: item,
+                 move_card: Optional[Callable[[Any, int], None]] = None):
+        """
+        Initialize the recycler
+
+        Args:
+            create_card: Builds a new, unbound card
+            bind_card: Binds a card to (item, row index) and positions it
+            hide_card: Moves a card out of view
+            row_height: Height of one row in pixels, including spacing
+            buffer_rows: Extra rows kept bound above and below the viewport
+            key: Returns the identity of an item, e.g. its note id
+            move_card: Moves a bound card to a new row index without
+                rebinding it (defaults to bind_card)
+        """
+        self.create_card = create_card
+        self.bind_card = bind_card
+        self.hide_card = hide_card
+        self.row_height = row_height
+        self.buffer_rows = buffer_rows
+        self.key = key
+        self.move_card = move_card
+
+        self.items: List[Any] = []
+        self._index: Dict[Any, int] = {}   # item key -> row index in items
+
+        # Widget work counters, for benchmarks and the list harness
+        self.cards_created = 0
+        self.binds = 0
+        self.moves = 0
+        self.hides = 0
+
+        self._active: Dict[Any, Any] = {}             # item key -> bound card
+        self._bound: Dict[Any, Tuple[Any, int]] = {}  # item key -> (item, row index) the card shows
+        self._pool: List[Any] = []                    # hidden cards ready for reuse
+        self._stale: List[Any] = []                   # still-visible cards whose item was removed
+
+    @property
+    def content_height(self) -> int:
+        """Total scrollable height of all rows"""
+        return len(self.items) * self.row_height
+
+    def set_items(self, items: Sequence[Any]):
+        """
+        Replace the list contents
+
+        Cards of items that are still present keep their binding; the next
+        layout() moves or rebinds them only if needed. Cards of removed
+        items are not hidden here but reused for inserted rows where
+        possible, which avoids a hide/show flicker.
+
+        Args:
+            items: New row items in display order
+        """
+        self.items = list(items)
+        self._index = {self.key(item): i for i, item in enumerate(self.items)}
+        for key in [key for key in self._active if key not in self._index]:
+            self._stale.append(self._active.pop(key))
+            del self._bound[key]
+
+    def invalidate(self):
+        """Force every bound card to be rebound on the next layout(), e.g. after a theme change"""
+        self._bound = {key: (None, -1) for key in self._bound}
+
+    def visible_range(self, top: float, height: float) -> Tuple[int, int]:
+        """
+        Get the half-open range of row indexes that need a card
+
+        Args:
+            top: Scroll offset of the viewport top in pixels
+            height: Viewport height in pixels
+
+        Returns:
+            (first, last) row indexes, buffer included
+        """
+        if not self.items:
+            return 0, 0
+        first = int(top // self.row_height) - self.buffer_rows
+        last = int((top + height) // self.row_height) + 1 + self.buffer_rows
+        return max(first, 0), min(last, len(self.items))
+
+    def layout(self, top: float, height: float):
+        """
+        Bind cards to the rows in view and recycle the rest
+
+        Args:
+            top: Scroll offset of the viewport top in pixels
+            height: Viewport height in pixels
+        """
+        first, last = self.visible_range(top, height)
+
+        # Release rows that scrolled out of view
+        for key in [key for key in self._active if not first <= self._index[key] < last]:
+            self._release(self._active.pop(key))
+            del self._bound[key]
+
+        for index in range(first, last):
+            item = self.items[index]
+            key = self.key(item)
+            card = self._active.get(key)
+            if card is None:
+                # Row scrolled into view or was inserted
+                card = self._acquire()
+                self._active[key] = card
+                self._bind(card, item, index)
+                continue
+
+            bound_item, bound_index = self._bound[key]
+            if bound_item != item:
+                self._bind(card, item, index)
+            elif bound_index != index:
+                self._move(card, item, index)
+
+        # Anything left over from removed items is no longer needed
+        for card in self._stale:
+            self._release(card)
+        self._stale = []
+
+    def active_cards(self) -> List[Any]:
+        """Get the cards currently bound to rows"""
+        return list(self._active.values())
+
+    def all_cards(self) -> List[Any]:
+        """Get every card the recycler owns, bound or pooled"""
+        return list(self._active.values()) + self._stale + self._pool
+
+    def stats(self) -> Dict[str, int]:
+        """Get the widget work counters"""
+        return {
+            "cards_created": self.cards_created,
+            "binds": self.binds,
+            "moves": self.moves,
+            "hides": self.hides,
+        }
+
+    def _bind(self, card: Any, item: Any, index: int):
+        """Bind a card to an item and row"""
+        self.bind_card(card, item, index)
+        self._bound[self.key(item)] = (item, index)
+        self.binds += 1
+
+    def _move(self, card: Any, item: Any, index: int):
+        """Move a card whose item is unchanged to a new row"""
+        if self.move_card:
+            self.move_card(card, index)
+        else:
+            self.bind_card(card, item, index)
+        self._bound[self.key(item)] = (item, index)
+        self.moves += 1
+
+    def _release(self, card: Any):
+        """Hide a card and return it to the pool"""
+        self.hide_card(card)
+        self._pool.append(card)
+        self.hides += 1
+
+    def _acquire(self) -> Any:
+        """Take a card from the stale list or pool, creating one only if both are empty"""
+        if self._stale:
+            return self._stale.pop()
+        if self._pool:
+            return self._pool.pop()
+        self.cards_created += 1
+        return self.create_card()
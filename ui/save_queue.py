@@ -0,0 +1,180 @@
+"""
+WhiskerNotes - Background Save Queue
+Writes editor saves on a worker thread, keeping only the latest save per note
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+
+class SaveResult(NamedTuple):
+    """Outcome of one background save"""
+    key: Hashable
+    value: Any
+    error: Optional[Exception] = None
+
+
+class SaveQueue:
+    """
+    Write-behind queue for note saves
+
+    Saves are queued per key (the note id). A save submitted while an
+    earlier save of the same note is still waiting replaces it, so a
+    burst of auto-saves results in a single write of the latest version.
+    Saves run one at a time on a single thread, in the order their keys
+    were first queued, so two saves of the same note never overlap.
+
+    Like SearchWorker, the queue knows nothing about Tk: the UI collects
+    finished saves with poll() from an after() callback. Call close()
+    before exiting to wait for every pending save.
+    """
+
+    def __init__(self):
+        """Initialize and start the worker thread"""
+        self._pending: "OrderedDict[Hashable, Callable[[], Any]]" = OrderedDict()
+        self._running: Optional[Hashable] = None
+        self._results: List[SaveResult] = []
+        self._closed = False
+        self._condition = threading.Condition()
+
+        # Counters for diagnostics and benchmarks
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(target=self._run, name="whiskernotes-saves", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        """Whether saves are waiting, running or not yet polled"""
+        with self._condition:
+            return bool(self._pending or self._running is not None or self._results)
+
+    def submit(self, key: Hashable, save: Callable[[], Any]):
+        """
+        Queue a save, replacing a waiting save with the same key
+
+        Args:
+            key: Identity of the saved item, e.g. the note id
+            save: Performs the write on the worker thread; its return
+                value is reported through poll()
+
+        Raises:
+            RuntimeError: If the queue has been closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Save queue is closed")
+            self.submitted += 1
+            if key in self._pending:
+                self.coalesced += 1
+            # Keep the original queue position so a busy note cannot starve others
+            self._pending[key] = save
+            self._condition.notify_all()
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Drop a save that is waiting; a running save is not stopped
+
+        Args:
+            key: Identity of the saved item
+
+        Returns:
+            True if a waiting save was removed
+        """
+        with self._condition:
+            if key not in self._pending:
+                return False
+            del self._pending[key]
+            self._condition.notify_all()
+            return True
+
+    def is_pending(self, key: Hashable) -> bool:
+        """Check whether a save for `key` is waiting or running"""
+        with self._condition:
+            return key in self._pending or self._running == key
+
+    def poll(self) -> List[SaveResult]:
+        """
+        Collect finished saves
+
+        Call from the UI thread.
+
+        Returns:
+            Results in completion order, possibly empty
+        """
+        with self._condition:
+            results, self._results = self._results, []
+        return results
+
+    def flush(self, key: Optional[Hashable] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until pending saves have been written
+
+        Args:
+            key: Only wait for saves with this key
+            timeout: Seconds to wait at most, or None to wait indefinitely
+
+        Returns:
+            True if the saves finished in time
+        """
+        if key is None:
+            done = lambda: not self._pending and self._running is None
+        else:
+            done = lambda: key not in self._pending and self._running != key
+        with self._condition:
+            return self._condition.wait_for(done, timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Write every pending save, then stop the worker
+
+        Args:
+            timeout: Seconds to wait for pending saves
+
+        Returns:
+            True if every save was written in time
+        """
+        flushed = self.flush(timeout=timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        return flushed
+
+    def stats(self) -> Dict[str, int]:
+        """Get the save counters"""
+        with self._condition:
+            return {
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+    def _run(self):
+        """Worker loop: write the oldest pending save until closed"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                key, save = self._pending.popitem(last=False)
+                self._running = key
+
+            try:
+                result = SaveResult(key, save())
+            except Exception as e:
+                result = SaveResult(key, None, e)
+
+            with self._condition:
+                self._running = None
+                self._results.append(result)
+                if result.error is None:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self._condition.notify_all()
@@ -0,0 +1,137 @@
+"""
+WhiskerNotes - Background Search Worker
+Runs note queries off the Tk main thread and keeps only the newest result
+"""
+
+import queue
+import threading
+from contextlib import nullcontext
+from typing import Any, Callable, NamedTuple, Optional
+
+
+class SearchResult(NamedTuple):
+    """Outcome of one background query"""
+    generation: int
+    notes: Any
+    error: Optional[Exception] = None
+
+
+class SearchWorker:
+    """
+    Single background thread for list and search queries
+
+    Every submit() bumps a generation counter. The worker skips queued
+    requests that have already been superseded, aborts a running query as
+    soon as it becomes stale (through the optional interruptible hook),
+    and drops stale results, so the UI only ever sees the newest one.
+
+    Tk is not thread safe, so results are never delivered from the worker
+    thread: the UI collects them with poll() from an after() callback.
+    The worker knows nothing about Tk.
+    """
+
+    def __init__(self, interruptible: Optional[Callable[[Callable[[], bool]], Any]] = None):
+        """
+        Initialize and start the worker thread
+
+        Args:
+            interruptible: Factory for a context manager that cancels the
+                worker's queries once the given callable returns True,
+                e.g. NoteService.interruptible
+        """
+        self.interruptible = interruptible
+        self._generation = 0
+        self._delivered = 0
+        self._lock = threading.Lock()
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="whiskernotes-search", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        """Whether the newest request has not been delivered yet"""
+        return self._delivered != self._generation
+
+    def submit(self, fetch: Callable[[], Any]) -> int:
+        """
+        Queue a query, superseding every earlier one
+
+        Args:
+            fetch: Runs the query on the worker thread and returns its result
+
+        Returns:
+            Generation number of this request
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._requests.put((generation, fetch))
+        return generation
+
+    def is_stale(self, generation: int) -> bool:
+        """Check whether a newer request has been submitted since `generation`"""
+        return generation != self._generation
+
+    def poll(self) -> Optional[SearchResult]:
+        """
+        Collect the newest finished result, if any
+
+        Call from the UI thread.
+
+        Returns:
+            The result of the newest request, or None if it is still running
+        """
+        latest = None
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if not self.is_stale(result.generation):
+                latest = result
+        if latest:
+            self._delivered = latest.generation
+        return latest
+
+    def close(self, timeout: float = 1.0):
+        """
+        Stop the worker; the running query is interrupted and pending ones dropped
+
+        Args:
+            timeout: Seconds to wait for the worker thread to exit
+        """
+        with self._lock:
+            self._generation += 1
+        self._requests.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        """Worker loop: run the newest request, skipping superseded ones"""
+        while True:
+            request = self._requests.get()
+            # Drain the queue so only the newest request runs
+            while request is not None:
+                try:
+                    newer = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                request = newer
+            if request is None:
+                return
+
+            generation, fetch = request
+            if self.is_stale(generation):
+                continue
+
+            should_stop = lambda: self.is_stale(generation)
+            guard = self.interruptible(should_stop) if self.interruptible else nullcontext()
+            try:
+                with guard:
+                    result = SearchResult(generation, fetch())
+            except Exception as e:
+                result = SearchResult(generation, None, e)
+
+            # Results of superseded (possibly interrupted) queries are dropped
+            if not self.is_stale(generation):
+                self._results.put(result)
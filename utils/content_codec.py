@@ -0,0 +1,97 @@
+"""
+WhiskerNotes - Content Compression
+Transparent compression of large note bodies in the notes table
+"""
+
+import lzma
+import sqlite3
+import zlib
+from typing import Optional, Union
+
+
+# A compressed body is stored as a BLOB: a 4-byte marker naming the codec
+# and format version, then the compressed UTF-8 text. Plain bodies stay TEXT.
+MARKERS = {
+    "zlib": b"WNz1",
+    "lzma": b"WNx1",
+}
+
+_CODECS_BY_MARKER = {marker: codec for codec, marker in MARKERS.items()}
+
+# Compressing must save at least this fraction of the size to be kept
+MIN_SAVING = 0.1
+
+
+def compress_content(text: str, codec: Optional[str], threshold: int) -> Union[str, bytes]:
+    """
+    Encode a note body for storage
+
+    Args:
+        text: Note content
+        codec: "zlib", "lzma", or None to store text as-is
+        threshold: Bodies shorter than this many characters stay plain
+
+    Returns:
+        The text itself, or marker + compressed bytes when that is smaller
+
+    Raises:
+        ValueError: If the codec is unknown
+    """
+    if codec is None or len(text) < threshold:
+        return text
+    if codec not in MARKERS:
+        raise ValueError(f"Unknown content compression: {codec}")
+
+    data = text.encode("utf-8")
+    if codec == "zlib":
+        packed = zlib.compress(data, 6)
+    else:
+        packed = lzma.compress(data, preset=6)
+    if len(packed) + len(MARKERS[codec]) > len(data) * (1 - MIN_SAVING):
+        return text
+    return MARKERS[codec] + packed
+
+
+def decompress_content(value: Union[str, bytes, None]) -> Optional[str]:
+    """
+    Decode a stored note body; plain text is returned unchanged
+
+    Registered on connections as the SQL function wn_decompress (see
+    register_sqlite_functions).
+
+    Args:
+        value: The notes.content value
+
+    Returns:
+        The note content
+
+    Raises:
+        ValueError: If a BLOB does not start with a known marker
+    """
+    if value is None or isinstance(value, str):
+        return value
+
+    data = bytes(value)
+    codec = _CODECS_BY_MARKER.get(data[:4])
+    if codec == "zlib":
+        data = zlib.decompress(data[4:])
+    elif codec == "lzma":
+        data = lzma.decompress(data[4:])
+    else:
+        raise ValueError("Note content is not in a known compressed format")
+    return data.decode("utf-8")
+
+
+def register_sqlite_functions(conn: sqlite3.Connection):
+    """
+    Register wn_decompress on a connection to a WhiskerNotes database
+
+    While content compression is on, or compressed bodies are still
+    stored, the full-text view and triggers on notes call wn_decompress.
+    Scripts that open the database with their own connection must call
+    this before writing to notes or searching it.
+
+    Args:
+        conn: Open SQLite connection
+    """
+    conn.create_function("wn_decompress", 1, decompress_content, deterministic=True)
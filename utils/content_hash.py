@@ -0,0 +1,46 @@
+"""
+WhiskerNotes - Content Hashing
+Fingerprints of the user-editable fields of a note
+"""
+
+import hashlib
+
+
+# Separates the fields so ("ab", "c") and ("a", "bc") hash differently
+_FIELD_SEPARATOR = "\x1f"
+
+
+def note_hash(title: str, content: str, tags: str = "", category: str = "Personal") -> str:
+    """
+    Hash the fields a save writes
+
+    Stored in the notes.content_hash column and compared before writing,
+    so saving a note without changes can be skipped.
+
+    Args:
+        title: Note title
+        content: Note content
+        tags: Comma-separated tags
+        category: Note category
+
+    Returns:
+        32-character hex digest
+    """
+    fields = _FIELD_SEPARATOR.join((title, content, tags or "", category or ""))
+    return hashlib.blake2b(fields.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_digest(content: str) -> str:
+    """
+    Hash a note body alone
+
+    Stored with each revision delta as the digest of the text it applies
+    to, so a delta is never applied to a different text.
+
+    Args:
+        content: Note content
+
+    Returns:
+        32-character hex digest
+    """
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
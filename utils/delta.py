@@ -0,0 +1,99 @@
+"""
+WhiskerNotes - Text Deltas
+Compact line-based diffs used to store note revisions
+"""
+
+import difflib
+import json
+import zlib
+from typing import Optional, Tuple
+
+
+# Stored payloads shorter than this are not worth compressing
+MIN_COMPRESS_SIZE = 64
+
+
+def make_delta(base: str, target: str) -> str:
+    """
+    Describe `target` as edits to `base`
+
+    The delta is a JSON list in which [start, end] copies lines
+    base[start:end] and a string is inserted literally, so text shared with
+    the base costs a few bytes however long it is.
+
+    Args:
+        base: Text the delta will be applied to
+        target: Text the delta reproduces
+
+    Returns:
+        Delta as a JSON string
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j1 != j2:
+            ops.append("".join(target_lines[j1:j2]))
+    return json.dumps(ops, ensure_ascii=False, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    """
+    Rebuild the target text of a delta
+
+    Args:
+        base: The text the delta was made against
+        delta: Output of make_delta
+
+    Returns:
+        The target text
+    """
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(delta):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def encode(text: str, compress: bool = True) -> Tuple[bytes, Optional[str]]:
+    """
+    Encode a payload for storage, compressing it when that saves space
+
+    Args:
+        text: Snapshot or delta text
+        compress: Allow zlib compression
+
+    Returns:
+        (stored bytes, compression name or None)
+    """
+    data = text.encode("utf-8")
+    if compress and len(data) >= MIN_COMPRESS_SIZE:
+        packed = zlib.compress(data, 6)
+        if len(packed) < len(data):
+            return packed, "zlib"
+    return data, None
+
+
+def decode(data: bytes, compression: Optional[str]) -> str:
+    """
+    Decode a stored payload
+
+    Args:
+        data: Stored bytes
+        compression: Compression name returned by encode, or None
+
+    Returns:
+        The original text
+    """
+    if compression == "zlib":
+        data = zlib.decompress(data)
+    elif compression is not None:
+        raise ValueError(f"Unknown compression: {compression}")
+    return bytes(data).decode("utf-8")
@@ -0,0 +1,149 @@
+"""
+WhiskerNotes - Note Import/Export Formats
+Streaming readers and writers for JSONL files and Markdown folders
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, Iterator, TextIO
+
+from utils.exceptions import ValidationError
+
+
+# Fields written to exports, in order
+EXPORT_FIELDS = ("id", "title", "content", "tags", "category", "is_pinned", "created_at", "updated_at")
+
+# Front-matter keys for Markdown exports (content is the file body)
+MARKDOWN_FIELDS = ("title", "tags", "category", "is_pinned", "created_at", "updated_at")
+
+
+def write_jsonl(notes: Iterable[Dict], stream: TextIO) -> int:
+    """
+    Write notes as JSON Lines, one note per line
+
+    Args:
+        notes: Note dictionaries (consumed lazily)
+        stream: Text stream to write to
+
+    Returns:
+        Number of notes written
+    """
+    count = 0
+    for note in notes:
+        record = {field: note.get(field) for field in EXPORT_FIELDS}
+        stream.write(json.dumps(record, ensure_ascii=False))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def read_jsonl(stream: TextIO) -> Iterator[Dict]:
+    """
+    Read notes from JSON Lines
+
+    Args:
+        stream: Text stream to read from
+
+    Yields:
+        Note dictionaries
+
+    Raises:
+        ValidationError: If a line is not a JSON object
+    """
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValidationError(f"Line {line_number}: invalid JSON ({e.msg})")
+        if not isinstance(record, dict):
+            raise ValidationError(f"Line {line_number}: expected a JSON object")
+        yield record
+
+
+def write_markdown_folder(notes: Iterable[Dict], folder: str) -> int:
+    """
+    Write each note to its own Markdown file with a front-matter header
+
+    Front-matter values are JSON-encoded, which keeps titles with colons
+    or quotes intact and is also valid YAML.
+
+    Args:
+        notes: Note dictionaries (consumed lazily)
+        folder: Directory to write into (created if missing)
+
+    Returns:
+        Number of notes written
+    """
+    os.makedirs(folder, exist_ok=True)
+    count = 0
+    for note in notes:
+        filename = f"{note['id']:06d}-{_slugify(note.get('title', ''))}.md"
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as f:
+            f.write("---\n")
+            for field in MARKDOWN_FIELDS:
+                f.write(f"{field}: {json.dumps(note.get(field), ensure_ascii=False)}\n")
+            f.write("---\n")
+            f.write(note.get("content", ""))
+        count += 1
+    return count
+
+
+def read_markdown_folder(folder: str) -> Iterator[Dict]:
+    """
+    Read notes from a folder of Markdown files
+
+    Files without front matter are imported with the file name as title.
+
+    Args:
+        folder: Directory containing .md files
+
+    Yields:
+        Note dictionaries, in file name order
+
+    Raises:
+        ValidationError: If a front-matter value cannot be parsed
+    """
+    for filename in sorted(os.listdir(folder)):
+        if not filename.lower().endswith(".md"):
+            continue
+        with open(os.path.join(folder, filename), "r", encoding="utf-8") as f:
+            text = f.read()
+        yield _parse_markdown_note(text, filename)
+
+
+def _parse_markdown_note(text: str, filename: str) -> Dict:
+    """Split a Markdown file into front-matter fields and content"""
+    fallback_title = os.path.splitext(filename)[0]
+    if not text.startswith("---\n"):
+        return {"title": fallback_title, "content": text}
+
+    header_end = text.find("\n---\n", 4)
+    if header_end == -1:
+        return {"title": fallback_title, "content": text}
+
+    note = {}
+    for line in text[4:header_end].splitlines():
+        if not line.strip():
+            continue
+        key, _, value = line.partition(":")
+        key = key.strip()
+        if key not in MARKDOWN_FIELDS:
+            continue
+        try:
+            note[key] = json.loads(value.strip())
+        except json.JSONDecodeError:
+            raise ValidationError(f"{filename}: invalid front-matter value for '{key}'")
+
+    note.setdefault("title", fallback_title)
+    note["content"] = text[header_end + len("\n---\n"):]
+    return note
+
+
+def _slugify(title: str) -> str:
+    """Make a short, file-system safe name from a title"""
+    slug = re.sub(r"[^\w-]+", "-", title.lower()).strip("-")
+    return slug[:40] or "untitled"
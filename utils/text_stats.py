@@ -0,0 +1,83 @@
+"""
+WhiskerNotes - Text Statistics
+Word and character counts kept up to date line by line while a note is edited
+"""
+
+from typing import List, Sequence
+
+
+def count_words(text: str) -> int:
+    """
+    Count the words of a text the way notes.word_count does
+
+    Args:
+        text: Any text
+
+    Returns:
+        Number of whitespace-separated words
+    """
+    return len(text.split())
+
+
+class TextStats:
+    """
+    Word, character and line counts of a text, updated per edited line
+
+    The counts of every line are kept, so an edit only recounts the lines
+    it touched: replace_lines takes the line range an edit covered before
+    it and the text of those lines after it. Newlines separate words, so
+    the word count is the sum of the per-line counts and always equals
+    count_words() of the whole text.
+    """
+
+    def __init__(self, text: str = ""):
+        """
+        Initialize the counts
+
+        Args:
+            text: Text to count
+        """
+        self._line_words: List[int] = []
+        self._line_chars: List[int] = []
+        self.words = 0
+        self.chars = 0
+        self.reset(text)
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines; an empty text has one empty line"""
+        return len(self._line_words)
+
+    def reset(self, text: str):
+        """Count a whole text from scratch"""
+        lines = text.split("\n")
+        self._line_words = [len(line.split()) for line in lines]
+        self._line_chars = [len(line) for line in lines]
+        self.words = sum(self._line_words)
+        self.chars = sum(self._line_chars) + len(lines) - 1
+
+    def replace_lines(self, first: int, last: int, new_lines: Sequence[str]):
+        """
+        Apply an edit that replaced lines first..last with new_lines
+
+        Args:
+            first: Index of the first line the edit touched (0-based)
+            last: Index of the last line the edit touched, before the edit
+            new_lines: The text of those lines after the edit, without
+                newlines; at least one line
+
+        Raises:
+            ValueError: If the range is outside the text or no lines are given
+        """
+        if not 0 <= first <= last < self.line_count or not new_lines:
+            raise ValueError(f"Cannot replace lines {first}-{last} of {self.line_count}")
+
+        old_words = self._line_words[first:last + 1]
+        old_chars = self._line_chars[first:last + 1]
+        new_words = [len(line.split()) for line in new_lines]
+        new_chars = [len(line) for line in new_lines]
+        self._line_words[first:last + 1] = new_words
+        self._line_chars[first:last + 1] = new_chars
+
+        self.words += sum(new_words) - sum(old_words)
+        self.chars += sum(new_chars) - sum(old_chars) + len(new_lines) - len(old_words)
@@ -12,6 +12,7 @@ class NoteValidator:
     MAX_TITLE_LENGTH = 200
     MAX_CONTENT_LENGTH = 100000
     VALID_CATEGORIES = ["Personal", "Study", "Ideas", "Work", "Other"]
+    MAX_PAGE_SIZE = 1000
     
     def validate_title(self, title: str) -> None:
         """
@@ -89,3 +90,19 @@ class NoteValidator:
                 if len(tag) > 30:
                     raise ValidationError("Each tag must be less than 30 characters")
 
+    
+    def validate_page_size(self, limit: int) -> None:
+        """
+        Validate a pagination page size
+        
+        Args:
+            limit: Requested number of notes per page
+            
+        Raises:
+            ValidationError: If validation fails
+        """
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            raise ValidationError("Page size must be an integer")
+        
+        if limit < 1 or limit > self.MAX_PAGE_SIZE:
+            raise ValidationError(f"Page size must be between 1 and {self.MAX_PAGE_SIZE}")